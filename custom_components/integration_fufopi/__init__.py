@@ -5,40 +5,92 @@ For more details about this integration, please refer to
 https://github.com/custom-components/integration_blueprint
 """
 import asyncio
+import dataclasses
 from datetime import timedelta
+import glob
 import logging
+import os
 from operator import xor
-from typing import Dict, List, Literal
-import serial
+from typing import Dict, List, Optional, Tuple
 import struct
+import time
+from types import MappingProxyType
 
 import random
 from pigpio import pi
-from smbus2 import SMBus
+import RPi.GPIO as GPIO
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import Config, HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from .acs712_calibration import ACS712Calibration
+from .adc_filter import FILTER_BOXCAR, ChannelFilter, filter_samples
+from .adc_sampler import ADS1115Sampler
+from .battery_monitor import BatteryMonitor
+from .battery_soc import ELEKSOL_GEL_100AH, BatteryState, SoCEngine
+from .compass_calibration import CompassCalibration
+from .energy_accounting import EnergyAccounting
+from .i2c_bus import I2CBusWorker
+from .register_cache import RegisterCache
+from .orientation import Orientation, orientation
+from .power_figures import PowerFigures, power_figures
 from .relay_board import RelayBoardPigPio
-from .smart_solar_MPPT import (
-    CS_VALUE_LIST,
-    MPPT_VALUE_LIST,
-    OR_VALUE_LIST,
-    ERR_VALUE_LIST,
-    PID_VALUE_LIST,
+from .smart_solar_MPPT import async_migrate_legacy_ids
+from .snapshot import ADXL345Reading, FufoPiSnapshot, HMC5883Reading, changed_keys
+from .ve_direct import (
+    REG_BATTERY_CURRENT,
+    REG_BATTERY_VOLTAGE,
+    REG_HISTORY_DAY_0,
+    VEDirectHexError,
+    VEDirectReader,
+    decode_block,
 )
-
-
+from .vibration import ADXL345FifoStream, vibration_spectrum
 from .const import (
+    BATTERY_TEMPERATURE_ADC_CHANNEL,
+    BATTERY_TEMPERATURE_MV_PER_DEGREE,
     DOMAIN,
+    ENERGY_CHANNELS,
+    VIBRATION_BANDS,
     STARTUP_MESSAGE,
+    CS_VALUE_LIST,
+    MPPT_VALUE_LIST,
+    OR_VALUE_LIST,
+    ERR_VALUE_LIST,
 )
 
 import custom_components.integration_fufopi.sensor as sensor
 
 SCAN_INTERVAL = timedelta(seconds=30)
 
+VE_DIRECT_PORT_PATTERNS = ["/dev/serial/by-id/*", "/dev/ttyUSB*"]
+# a text block is sent every second, give some margin to identify the device
+VE_DIRECT_DISCOVERY_TIMEOUT = 3
+
+ADS1115_SAMPLE_RATE = 860
+# samples kept per channel, 64 samples of 4 channels at 860 SPS cover ~0.3 s
+ADS1115_BUFFER_SIZE = 64
+# BOARD pin wired to ALERT/RDY, None to wait one conversion period instead
+ADS1115_RDY_PIN = None
+# filters of the buffered samples by channel
+ADS1115_CHANNEL_FILTERS = {
+    0: ChannelFilter(FILTER_BOXCAR, oversampling=4),
+    1: ChannelFilter(FILTER_BOXCAR, oversampling=4),
+    2: ChannelFilter(FILTER_BOXCAR, oversampling=4),
+    3: ChannelFilter(FILTER_BOXCAR, oversampling=4),
+}
+# BOARD pin wired to the HMC5883L DRDY, None to poll the status register
+HMC5883_DRDY_PIN = None
+# ADXL345 FIFO streaming for the vibration sensors, False to poll one sample
+ADXL345_STREAM = True
+# FFT block of the vibration spectrum, 256 samples at 400 Hz is 1.6 Hz per bin
+VIBRATION_FFT_BLOCK_SIZE = 256
+# relay board index switching the load measured by each ACS712 channel
+ACS712_CHANNEL_RELAYS = {3: 0, 2: 1, 1: 2, 0: 3}
+# battery the state of charge is computed for
+BATTERY_PROFILE = ELEKSOL_GEL_100AH
+
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
 
@@ -68,6 +120,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    await coordinator.async_start()
+    await async_migrate_legacy_ids(hass, entry, coordinator.smart_solar.charger_id)
+
     hass.async_add_job(hass.config_entries.async_forward_entry_setup(entry, "sensor"))
     hass.async_add_job(hass.config_entries.async_forward_entry_setup(entry, "switch"))
     hass.async_add_job(hass.config_entries.async_forward_entry_setup(entry, "fan"))
@@ -98,6 +153,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
     if unloaded:
+        await coordinator.async_stop()
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unloaded
@@ -109,6 +165,17 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await async_setup_entry(hass, entry)
 
 
+def discover_ve_direct_ports() -> List[str]:
+    """Return the serial ports that may have a VE Direct device attached,
+    stable by-id names are preferred over ttyUSB ones"""
+    _ports = {}
+    for _pattern in VE_DIRECT_PORT_PATTERNS:
+        for _port in sorted(glob.glob(_pattern)):
+            _ports.setdefault(os.path.realpath(_port), _port)
+
+    return list(_ports.values())
+
+
 class FufoPiCoordinator(DataUpdateCoordinator):
     """FufoPi coordinator"""
 
@@ -121,10 +188,15 @@ class FufoPiCoordinator(DataUpdateCoordinator):
     ) -> None:
         super().__init__(hass, logger, name=name, update_interval=update_interval)
 
-        self.smart_solar = smart_solar_MPPT(logger=logger)
+        # VE Direct chargers by serial number, filled in by async_start
+        self.chargers: Dict[str, smart_solar_MPPT] = {}
+        self._candidates = [
+            smart_solar_MPPT(logger=logger, port=_port)
+            for _port in discover_ve_direct_ports()
+        ]
 
         # self.pigpio = pi("172.30.33.0")
-        self.relay_board = RelayBoardPigPio()
+        self.relay_board = RelayBoardPigPio(logger)
 
         # select the correct i2c bus for this revision of Raspberry Pi
         revision = (
@@ -135,26 +207,255 @@ class FufoPiCoordinator(DataUpdateCoordinator):
             ]
             + ["0000"]
         )[0]
-        self.i2c_bus = SMBus(1 if int(revision, 16) >= 4 else 0)
+        self.i2c_bus = I2CBusWorker(1 if int(revision, 16) >= 4 else 0)
 
-        # self.i2c_adxl345 = ADXL345(i2c_bus=self.i2c_bus)
-        # self.i2c_hcm5883 = HCM5883(i2c_bus=self.i2c_bus)
+        # optional sensors, kept only if they answer in async_start
+        self.i2c_adxl345 = ADXL345(i2c_bus=self.i2c_bus)
+        self.i2c_hcm5883 = HCM5883(i2c_bus=self.i2c_bus, drdy_pin=HMC5883_DRDY_PIN)
         self.ads1115 = ADS1115weno(i2c=self.i2c_bus)
+        self.adc_sampler = ADS1115Sampler(
+            self.ads1115,
+            logger,
+            sps=ADS1115_SAMPLE_RATE,
+            buffer_size=ADS1115_BUFFER_SIZE,
+            rdy_pin=ADS1115_RDY_PIN,
+        )
+        self.acs712_calibration = ACS712Calibration(hass, logger, ACS712_CHANNEL_RELAYS)
+        self.compass_calibration = CompassCalibration(hass, logger)
+        self.soc_engine = SoCEngine(BATTERY_PROFILE)
+        self.battery_monitor = BatteryMonitor(hass, logger, BATTERY_PROFILE)
+        self.energy_accounting = EnergyAccounting(hass, logger, ENERGY_CHANNELS)
+        self.vibration_stream = None
+
+    @property
+    def smart_solar(self):
+        """return the main charger, the one the battery is measured with"""
+        return next(iter(self.chargers.values()))
+
+    async def async_start(self) -> None:
+        """Start one reader per port and keep the ones sending VE Direct data"""
+        for _charger in self._candidates:
+            _charger.start(self.hass.loop)
+
+        _found = await asyncio.gather(
+            *[
+                _charger.async_wait_frame(VE_DIRECT_DISCOVERY_TIMEOUT)
+                for _charger in self._candidates
+            ]
+        )
+
+        for _charger, _is_ve_direct in zip(self._candidates, _found):
+            if _is_ve_direct:
+                if _charger.serial_number is None:
+                    self.logger.warning(
+                        f"No serial number from the VE Direct device on {_charger.port}"
+                    )
+                self.chargers[_charger.charger_id] = _charger
+            else:
+                self.logger.info(f"No VE Direct device found on {_charger.port}")
+                _charger.stop()
+
+        if not self.chargers:
+            _charger = smart_solar_MPPT(logger=self.logger)
+            self.chargers[_charger.charger_id] = _charger
+
+        await self.acs712_calibration.async_load()
+        await self.compass_calibration.async_load()
+        await self.battery_monitor.async_load()
+        await self.energy_accounting.async_load()
+
+        self.adc_sampler.start(self.hass.loop)
+        if not await self.adc_sampler.async_wait_round(VE_DIRECT_DISCOVERY_TIMEOUT):
+            self.logger.warning("No ADS1115 samples received")
+
+        try:
+            await self.i2c_adxl345.async_setup()
+        except OSError:
+            self.logger.info("No ADXL345 found on the I2C bus")
+            self.i2c_adxl345 = None
+        else:
+            if ADXL345_STREAM:
+                self.vibration_stream = ADXL345FifoStream(
+                    self.i2c_adxl345,
+                    self.logger,
+                    rate=ADXL345.BANDWIDTH_RATE_400HZ,
+                )
+                self.vibration_stream.start(self.hass.loop)
+
+        try:
+            await self.i2c_hcm5883.async_setup()
+        except OSError:
+            self.logger.info("No HMC5883L found on the I2C bus")
+            self.i2c_hcm5883 = None
+
+    async def async_stop(self) -> None:
+        """Stop background readers and save the state kept across restarts"""
+        for _charger in self.chargers.values():
+            _charger.stop()
+
+        self.adc_sampler.stop()
+        if self.vibration_stream is not None:
+            self.vibration_stream.stop()
+        if self.i2c_hcm5883 is not None:
+            self.i2c_hcm5883.stop()
+        self.compass_calibration.stop_sweep()
+        self.i2c_bus.close()
+
+        # the delayed saves would lag behind, or land over the reloaded data
+        await self.energy_accounting.async_save()
+        await self.battery_monitor.async_save()
+        await self.acs712_calibration.async_save()
+
+    async def _async_read_i2c_sensor(self, sensor, *args):
+        """return the readings of an optional sensor, None if it is missing"""
+        if sensor is None:
+            return None
+
+        try:
+            return await sensor.async_read(*args)
+        except OSError as err:
+            self.logger.warning(f"I2C read of {type(sensor).__name__} failed: {err}")
+            return None
+
+    async def _async_read_adxl345(self):
+        """return the ADXL345 readings with the spectrum of the streamed samples"""
+        _reading = await self._async_read_i2c_sensor(
+            self.i2c_adxl345, self.vibration_stream
+        )
+        if _reading is None or self.vibration_stream is None:
+            return _reading
+
+        # copied in the loop, the stream keeps appending while the FFT runs
+        _spectrum = await self.hass.async_add_executor_job(
+            vibration_spectrum,
+            *self.vibration_stream.window(),
+            self.vibration_stream.rate_hz,
+            VIBRATION_FFT_BLOCK_SIZE,
+            VIBRATION_BANDS,
+        )
+        return dataclasses.replace(_reading, spectrum=_spectrum)
+
+    def _orientation(self, adxl345, hmc5883) -> Optional[Orientation]:
+        """return the orientation from the cached readings of this refresh"""
+        if adxl345 is None:
+            return None
+
+        return orientation(
+            (adxl345.accel_x, adxl345.accel_y, adxl345.accel_z),
+            None if hmc5883 is None else (hmc5883.mag_x, hmc5883.mag_y, hmc5883.mag_z),
+            self.compass_calibration.calibration,
+        )
+
+    def _battery_state(self, record, adc, timestamp) -> Optional[BatteryState]:
+        """return the state of the battery measured by the main charger"""
+        _temperature = None
+        if (
+            BATTERY_TEMPERATURE_ADC_CHANNEL is not None
+            and adc[BATTERY_TEMPERATURE_ADC_CHANNEL] is not None
+        ):
+            _temperature = (
+                adc[BATTERY_TEMPERATURE_ADC_CHANNEL].value
+                / BATTERY_TEMPERATURE_MV_PER_DEGREE
+            )
+
+        return self.battery_monitor.async_update(
+            self.soc_engine.state(
+                record.battery_voltage, record.battery_current, _temperature
+            ),
+            record.battery_current,
+            record.state_of_operation,
+            timestamp,
+        )
+
+    def _energy_powers(
+        self, record, power: PowerFigures, adc, relays
+    ) -> Dict[str, Optional[float]]:
+        """return the powers in W integrated by the energy channels"""
+        _powers = {
+            "battery_in": power.battery_in_power,
+            "battery_out": power.battery_out_power,
+            "load": power.load_power,
+            "rpi": power.rpi_power,
+            "fridge": power.fridge_power,
+        }
+
+        # the lanes are fed from the battery
+        for _channel, _relay in ACS712_CHANNEL_RELAYS.items():
+            if not relays[_relay]:
+                _powers[f"lane_{_relay}"] = 0.0
+            elif record.battery_voltage is None or adc[_channel] is None:
+                _powers[f"lane_{_relay}"] = None
+            else:
+                _powers[f"lane_{_relay}"] = (
+                    self.acs712_calibration.current(_channel, adc[_channel].value)
+                    * record.battery_voltage
+                    / 1000
+                )
+
+        return _powers
 
     async def _async_update_data(self):
-        """Update data via serial com"""
-        self._data = await self.smart_solar._async_update_data()
-        self._data["ads1115_ch0"] = await self.ads1115.read_channel(0)
-        self._data["ads1115_ch1"] = await self.ads1115.read_channel(1)
-        self._data["ads1115_ch2"] = await self.ads1115.read_channel(2)
-        self._data["ads1115_ch3"] = await self.ads1115.read_channel(3)
-        return self._data
+        """Build the snapshot of this refresh"""
+        _records = {
+            _serial: _charger.record for _serial, _charger in self.chargers.items()
+        }
+        _main_record = next(iter(_records.values()))
+
+        _adc = tuple(
+            filter_samples(self.adc_sampler.buffers[_channel].values(), _filter)
+            for _channel, _filter in ADS1115_CHANNEL_FILTERS.items()
+        )
+
+        _adxl345 = await self._async_read_adxl345()
+        _hmc5883 = await self._async_read_i2c_sensor(self.i2c_hcm5883)
+
+        # from the shadow of the outputs, read back from the pins once a minute
+        _relays = self.relay_board.states()
+
+        _timestamp = time.monotonic()
+        self.acs712_calibration.async_update(_adc, _relays, _timestamp)
+
+        _power = power_figures(_main_record, _relays)
+
+        # aggregated once per cycle for all the chargers
+        _totals = {
+            "total_panel_power": sum(
+                _record.panel_power or 0 for _record in _records.values()
+            ),
+            "total_yield_today": sum(
+                _record.yield_today or 0 for _record in _records.values()
+            ),
+            "total_yield_total": sum(
+                _record.yield_total or 0 for _record in _records.values()
+            ),
+        }
+
+        return FufoPiSnapshot(
+            timestamp=_timestamp,
+            chargers=MappingProxyType(_records),
+            adc=_adc,
+            relays=_relays,
+            adxl345=_adxl345,
+            hmc5883=_hmc5883,
+            orientation=self._orientation(_adxl345, _hmc5883),
+            # the current is counted when it was measured, a stale record is
+            # not counted again at every refresh
+            battery=self._battery_state(
+                _main_record, _adc, self.smart_solar.record_timestamp
+            ),
+            power=_power,
+            energy=self.energy_accounting.async_update(
+                self._energy_powers(_main_record, _power, _adc, _relays), _timestamp
+            ),
+            changed_keys=changed_keys(self.data, _records, _adc, _relays, _totals),
+            **_totals,
+        )
 
 
 class smart_solar_MPPT:
     """Smart solar VE Direct comm"""
 
-    def __init__(self, logger: logging.Logger) -> None:
+    def __init__(self, logger: logging.Logger, port: str = None) -> None:
         self._data = {
             "PID": "0xA060",
             "FW": "156",
@@ -178,156 +479,196 @@ class smart_solar_MPPT:
             "H23": "0",
         }
 
-        self.logger = logger
+        # decoded once per block, properties read from it
+        self.record = decode_block(self._data)
+        # time.monotonic() of the block the record was decoded from
+        self.record_timestamp = time.monotonic()
 
-        try:
-            self._serial = serial.Serial("/dev/ttyUSB0", baudrate=19200, timeout=1)
-            self.simulation = False
-        except:
-            self.simulation = True
+        self.logger = logger
+        self.port = port
+        self._frame_received = asyncio.Event()
+
+        self.simulation = True
+        if port is not None:
+            try:
+                self._reader = VEDirectReader(
+                    port, on_frame=self._handle_frame, logger=logger
+                )
+                self.simulation = False
+            except:
+                self.logger.warning(f"Unable to open {port}")
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start streaming frames from the serial port"""
+        if self.simulation is False:
+            self._reader.start(loop)
+
+    def stop(self) -> None:
+        """Stop streaming frames"""
+        if self.simulation is False:
+            self._reader.stop()
 
     @property
     def product_id(self):
         """return product ID"""
-        _raw = self._data["PID"]
-        if _raw in list(PID_VALUE_LIST.keys()):
-            return PID_VALUE_LIST[_raw]
-
-        return None
+        return self.record.product_id
 
     @property
     def firmware(self):
         """return firmware version"""
-        return self._data["FW"]
+        return self.record.firmware
 
     @property
     def serial_number(self):
         """return serial number"""
-        return self._data["SER#"]
+        return self.record.serial_number
+
+    @property
+    def charger_id(self):
+        """return the serial number, the port for devices sending no SER#"""
+        return self.serial_number or self.port
 
     @property
     def state_of_operation(self):
         """return state of operation"""
-        _raw = self._data["CS"]
-        if _raw in list(CS_VALUE_LIST.keys()):
-            return CS_VALUE_LIST[_raw]
-
-        return None
+        return self.record.state_of_operation
 
     @property
     def tracker_operation_mode(self):
         """return tracker operation mode"""
-        _raw = self._data["MPPT"]
-        if _raw in list(MPPT_VALUE_LIST.keys()):
-            return MPPT_VALUE_LIST[_raw]
-
-        return None
+        return self.record.tracker_operation_mode
 
     @property
     def off_reason(self):
         """return off reason"""
-        _raw = self._data["OR"]
-        if _raw in list(OR_VALUE_LIST.keys()):
-            return OR_VALUE_LIST[_raw]
+        return self.record.off_reason
 
-        return None
+    @property
+    def off_reason_flags(self):
+        """return the labels of every off reason bit set"""
+        return self.record.off_reason_flags
 
     @property
     def day_seq_number(self):
         """return day sequence number"""
-        return self._data["HSDS"]
+        return self.record.day_seq_number
 
     @property
     def checksum(self):
         """return checksum"""
-        return self._data["Checksum"]
+        return self.record.checksum
 
     @property
     def load_current(self):
         """return load current in mA"""
-        return self._data["IL"]
+        return self.record.load_current
 
     @property
     def error_reason(self):
         """return the error reason"""
-        _raw = self._data["ERR"]
-        if _raw in list(ERR_VALUE_LIST.keys()):
-            return ERR_VALUE_LIST[_raw]
-
-        return None
+        return self.record.error_reason
 
     @property
     def load_state(self):
-        """return the load state"""
-        return self._data["LOAD"]
+        """return True if the load output is on"""
+        return self.record.load_state
 
     @property
     def battery_voltage(self):
         """return the battery voltage in mV"""
-        return self._data["V"]
+        return self.record.battery_voltage
 
     @property
     def panel_voltage(self):
         """return the panel voltage in mV"""
-        return self._data["VPV"]
+        return self.record.panel_voltage
 
     @property
     def panel_power(self):
         """return the panel power in W"""
-        return self._data["PPV"]
+        return self.record.panel_power
 
     @property
     def battery_current(self):
         """return the battery current in mA"""
-        return self._data["I"]
+        return self.record.battery_current
 
     @property
     def yield_total(self):
         """return the yield total in 0.01kWh"""
-        return self._data["H19"]
+        return self.record.yield_total
 
     @property
     def yield_today(self):
         """return the yield today in 0.01kWh"""
-        return self._data["H20"]
+        return self.record.yield_today
 
     @property
     def max_power_today(self):
         """return the max power today in W"""
-        return self._data["H21"]
+        return self.record.max_power_today
 
     @property
     def yield_yesterday(self):
         """return the yield yesterday in 0.01kWh"""
-        return self._data["H22"]
+        return self.record.yield_yesterday
 
     @property
     def max_power_yesterday(self):
         """return the max power yesterday in W"""
-        return self._data["H23"]
+        return self.record.max_power_yesterday
 
-    async def _async_update_data(self):
-        """Update data via serial com"""
+    async def async_get_register(self, register: int) -> bytes:
+        """Read a register through the HEX protocol"""
         if self.simulation is True:
-            return self._data
-
-        _buffer = self._serial.read_all().decode("ascii", "ignore").split("\r\n")
-        # remove last item, may be corrupt
-        _buffer.pop(-1)
-
-        for _line in _buffer:
-            _field = _line.split("\t")
-            if len(_field) > 1:
-                _key = _field[0]
-                _value = _field[1]
-                if _key in list(self._data.keys()):
-                    self._data[_key] = _value
-                else:
-                    self.logger.warning(f"Key not defined {_field}")
-            else:
-                self.logger.warning(f"Field structure not valid: {_field}")
+            raise VEDirectHexError("HEX protocol not available in simulation")
+
+        return await self._reader.hex.async_get(register)
+
+    async def async_set_register(self, register: int, value: bytes) -> bytes:
+        """Write a register through the HEX protocol"""
+        if self.simulation is True:
+            raise VEDirectHexError("HEX protocol not available in simulation")
+
+        return await self._reader.hex.async_set(register, value)
+
+    async def async_read_battery(self):
+        """Read battery voltage (mV) and current (mA) without waiting
+        for the next text block"""
+        _voltage, _current = await asyncio.gather(
+            self.async_get_register(REG_BATTERY_VOLTAGE),
+            self.async_get_register(REG_BATTERY_CURRENT),
+        )
+        return (
+            int.from_bytes(_voltage, "little") * 10,
+            int.from_bytes(_current, "little", signed=True) * 100,
+        )
+
+    async def async_read_history_day(self, day: int) -> bytes:
+        """Read the raw history record of a day, 0 is today"""
+        if day < 0 or day > 30:
+            raise ValueError(f"Invalid history day requested [0-30]:{day}")
+
+        return await self.async_get_register(REG_HISTORY_DAY_0 + day)
+
+    def _handle_frame(self, frame: Dict[str, str]) -> None:
+        """Store a checksum validated frame published by the reader"""
+        self._data.update(frame)
+        self.record = decode_block(self._data)
+        self.record_timestamp = time.monotonic()
+        self._frame_received.set()
+
+    async def async_wait_frame(self, timeout: float) -> bool:
+        """Wait for the first valid frame, return False on timeout"""
+        if self.simulation is True:
+            return False
 
-        return self._data
+        try:
+            await asyncio.wait_for(self._frame_received.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
 
 
 class ADXL345:
@@ -367,110 +708,163 @@ class ADXL345:
     DATAZ0 = 0x36
     DATAZ1 = 0x37
 
-    def __init__(self, i2c_bus: SMBus, address=0x53):
+    FIFO_CTL = 0x38
+    FIFO_STATUS = 0x39
+
+    FIFO_MODE_BYPASS = 0x00
+    FIFO_MODE_FIFO = 0x40
+    FIFO_MODE_STREAM = 0x80
+    FIFO_MODE_TRIGGER = 0xC0
+    FIFO_SAMPLES_MASK = 0x1F
+    FIFO_ENTRIES_MASK = 0x3F
+    FIFO_SIZE = 32
+
+    # output data rate in Hz of the bandwidth rate codes
+    BANDWIDTH_RATE_HZ = {
+        BANDWIDTH_RATE_1600HZ: 1600,
+        BANDWIDTH_RATE_800HZ: 800,
+        BANDWIDTH_RATE_400HZ: 400,
+        BANDWIDTH_RATE_200HZ: 200,
+        BANDWIDTH_RATE_100HZ: 100,
+        BANDWIDTH_RATE_50HZ: 50,
+        BANDWIDTH_RATE_25HZ: 25,
+    }
+
+    def __init__(self, i2c_bus: I2CBusWorker, address=0x53):
         self.address = address
         self.bus = i2c_bus
-        self.bandwidth_rate = self.BANDWIDTH_RATE_100HZ
-        self.range = self.RANGE_2G
-        self.enable_measurement()
-
-    @property
-    def is_enabled(self):
+        # configuration registers, the data and FIFO status are read directly
+        self.registers = RegisterCache(i2c_bus, address)
+        # last burst read, in m/s², and its time.monotonic()
+        self.axes = None
+        self.axes_timestamp = None
+
+    async def async_setup(self):
+        """Configure the default rate and range and start measuring."""
+        await self.async_set_bandwidth_rate(self.BANDWIDTH_RATE_100HZ)
+        await self.async_set_range(self.RANGE_2G)
+        await self.async_enable_measurement()
+
+    async def async_is_enabled(self):
         """Reads POWER_CTL.
         Returns the read value.
         """
-        if self.bus.read_byte_data(self.address, self.POWER_CTL) == 0x00:
+        if await self.registers.async_read(self.POWER_CTL) == 0x00:
             return False
 
         return True
 
-    @property
-    def bandwidth_rate(self):
+    async def async_bandwidth_rate(self):
         """Reads BANDWIDTH_RATE_REG.
         Returns the read value.
         """
-        raw_bandwidth_rate = self.bus.read_byte_data(
-            self.address, self.BANDWIDTH_RATE_REG
-        )
-        return raw_bandwidth_rate
+        return await self.registers.async_read(self.BANDWIDTH_RATE_REG)
 
-    @bandwidth_rate.setter
-    def bandwidth_rate(self, new_rate):
+    async def async_set_bandwidth_rate(self, new_rate):
         """Changes the bandwidth rate by writing rate to BANDWIDTH_RATE_REG.
         rate -- the bandwidth rate the ADXL345 will be set to. Using a
         pre-defined rate is advised.
         """
-        self.bus.write_byte_data(self.address, self.BANDWIDTH_RATE_REG, new_rate)
+        await self.registers.async_write(self.BANDWIDTH_RATE_REG, new_rate)
 
-    @property
-    def range(self):
+    async def async_range(self):
         """Reads the range the ADXL345 is currently set to.
         return a hexadecimal value.
         """
-        return self.bus.read_byte_data(self.address, self.DATA_FORMAT)
+        return await self.registers.async_read(self.DATA_FORMAT)
 
-    @range.setter
-    def range(self, new_range):
+    async def async_set_range(self, new_range):
         """Changes the range of the ADXL345.
         range -- the range to set the accelerometer to. Using a pre-defined
         range is advised.
         """
         value = None
 
-        value = self.bus.read_byte_data(self.address, self.DATA_FORMAT)
+        value = await self.registers.async_read(self.DATA_FORMAT)
 
         value &= ~0x0F
         value |= new_range
         value |= 0x08
 
-        self.bus.write_byte_data(self.address, self.DATA_FORMAT, value)
+        await self.registers.async_write(self.DATA_FORMAT, value)
 
-    @property
-    def accel_x(self):
-        """Reads accel x and returns it."""
-        bytes = self.bus.read_i2c_block_data(self.address, self.DATAX0, 2)
-
-        val = bytes[0] | (bytes[1] << 8)
-        if val & (1 << 16 - 1):
-            val = val - (1 << 16)
-
-        val = val * self.SCALE_MULTIPLIER * self.EARTH_GRAVITY_MS2
-
-        return round(val, 4)
-
-    @property
-    def accel_y(self):
-        """Reads accel y and returns it."""
-        bytes = self.bus.read_i2c_block_data(self.address, self.DATAY0, 2)
-
-        val = bytes[0] | (bytes[1] << 8)
-        if val & (1 << 16 - 1):
-            val = val - (1 << 16)
+    async def async_read_axes(self) -> Tuple[float, float, float]:
+        """Reads the three axes in a single burst so they come from the same
+        sample, returns them in m/s² and keeps them in axes.
+        """
+        _data = await self.bus.read_block(self.address, self.AXES_DATA, 6)
 
-        val = val * self.SCALE_MULTIPLIER * self.EARTH_GRAVITY_MS2
+        self.axes = tuple(
+            round(_val * self.SCALE_MULTIPLIER * self.EARTH_GRAVITY_MS2, 4)
+            for _val in struct.unpack("<hhh", bytes(_data))
+        )
+        self.axes_timestamp = time.monotonic()
 
-        return round(val, 4)
+        return self.axes
 
-    @property
-    def accel_z(self):
-        """Reads accel z and returns it."""
-        bytes = self.bus.read_i2c_block_data(self.address, self.DATAZ0, 2)
+    async def async_set_fifo_mode(self, mode, samples=0):
+        """Changes the FIFO mode by writing FIFO_CTL.
+        samples -- the watermark level in stream and FIFO modes.
+        """
+        await self.registers.async_write(
+            self.FIFO_CTL, mode | (samples & self.FIFO_SAMPLES_MASK)
+        )
 
-        val = bytes[0] | (bytes[1] << 8)
-        if val & (1 << 16 - 1):
-            val = val - (1 << 16)
+    async def async_fifo_entries(self):
+        """Reads FIFO_STATUS.
+        Returns the number of samples stored in the FIFO.
+        """
+        _status = await self.bus.read_byte(self.address, self.FIFO_STATUS)
+        return _status & self.FIFO_ENTRIES_MASK
 
-        val = val * self.SCALE_MULTIPLIER * self.EARTH_GRAVITY_MS2
+    async def async_read_fifo(self, count) -> List[Tuple[float, float, float]]:
+        """Pops count samples out of the FIFO, oldest first, in m/s².
+        Every 6-byte read of the data registers pops one sample, the reads
+        are queued together so the bus worker runs them in one batch.
+        """
+        _bursts = await asyncio.gather(
+            *[
+                self.bus.read_block(self.address, self.AXES_DATA, 6)
+                for _ in range(count)
+            ]
+        )
+        _scale = self.SCALE_MULTIPLIER * self.EARTH_GRAVITY_MS2
 
-        return val
+        return [
+            tuple(_val * _scale for _val in struct.unpack("<hhh", bytes(_data)))
+            for _data in _bursts
+        ]
 
-    def enable_measurement(self):
+    async def async_enable_measurement(self):
         """Enables measurement by writing 0x08 to POWER_CTL."""
-        self.bus.write_byte_data(self.address, self.POWER_CTL, 0x08)
+        await self.registers.async_write(self.POWER_CTL, 0x08)
 
-    def disable_measurement(self):
+    async def async_disable_measurement(self):
         """Disables measurement by writing 0x00 to POWER_CTL."""
-        self.bus.write_byte_data(self.address, self.POWER_CTL, 0x00)
+        await self.registers.async_write(self.POWER_CTL, 0x00)
+
+    async def async_read(self, stream=None) -> ADXL345Reading:
+        """return the readings of this refresh
+
+        While a FIFO stream is running the data registers must not be read
+        outside of it, the axes are then its last sample.
+        """
+        if stream is not None and stream.count:
+            _accel_x, _accel_y, _accel_z = stream.latest
+            _vibration = stream.stats()
+        else:
+            _accel_x, _accel_y, _accel_z = await self.async_read_axes()
+            _vibration = None
+
+        return ADXL345Reading(
+            enabled=await self.async_is_enabled(),
+            range=await self.async_range(),
+            bandwidth_rate=await self.async_bandwidth_rate(),
+            accel_x=_accel_x,
+            accel_y=_accel_y,
+            accel_z=_accel_z,
+            vibration=_vibration,
+        )
 
 
 class HCM5883:
@@ -481,8 +875,10 @@ class HCM5883:
     MODE_ADDR = 0x02  # Address of mode register
 
     X_AXIS_ADDR = 0x03  # Address of X-axis MSB data register
-    Y_AXIS_ADDR = 0x05  # Address of Y-axis MSB data register
-    Z_AXIS_ADDR = 0x07  # Address of Y-axis MSB data register
+    Z_AXIS_ADDR = 0x05  # Address of Z-axis MSB data register
+    Y_AXIS_ADDR = 0x07  # Address of Y-axis MSB data register
+    # value of an axis when its ADC over/underflows
+    AXIS_OVERFLOW = -4096
 
     STATUS_ADDR = 0x09  ## Address of status register
     ID_ADDR = 0x10  ## Start addres of identification register
@@ -546,94 +942,111 @@ class HCM5883:
     STATUS_LOCKED_MASK = 0x02
     STATUS_READY_MASK = 0x01
 
-    def __init__(self, i2c_bus: SMBus, address=0x1E):
+    def __init__(self, i2c_bus: I2CBusWorker, address=0x1E, drdy_pin=None):
         self.address = address
         self.bus = i2c_bus
-
-        self.bus.write_i2c_block_data(self.address, self.MODE_ADDR, [0x00])
-
-    @property
-    def sample_no(self):
+        # configuration and mode registers, the data and status are read directly
+        self.registers = RegisterCache(i2c_bus, address)
+        # BOARD pin wired to DRDY, None to poll the RDY bit of the status register
+        self.drdy_pin = drdy_pin
+        # last burst read (x, y, z) in Gauss, and its time.monotonic()
+        self.vector = None
+        self.vector_timestamp = None
+        self._loop = None
+        self._ready = asyncio.Event()
+
+    async def async_setup(self):
+        """Start the continuous measurement mode."""
+        await self.registers.async_write(self.MODE_ADDR, 0x00)
+
+        if self.drdy_pin is not None:
+            self._loop = asyncio.get_running_loop()
+            GPIO.setmode(GPIO.BOARD)
+            GPIO.setup(self.drdy_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(
+                self.drdy_pin, GPIO.FALLING, callback=self._on_ready_edge
+            )
+
+    def stop(self):
+        """Release the DRDY pin."""
+        if self._loop is not None:
+            GPIO.remove_event_detect(self.drdy_pin)
+            self._loop = None
+
+    async def async_sample_no(self):
         """number of samples averaged (1 to 8) per measurement output.
         00 = 1(Default); 01 = 2; 10 = 4; 11 = 8"""
-        _confi_a = self.bus.read_i2c_block_data(self.address, self.CONFIG_A_ADDR, 1)
+        _confi_a = await self.registers.async_read(self.CONFIG_A_ADDR)
 
-        val = _confi_a[0] & self.SAMPLE_NO_MASK
+        val = _confi_a & self.SAMPLE_NO_MASK
         val = val >> 5
 
         return self.SAMPLE_NO_LIST[val]
 
-    @property
-    def output_rate(self):
+    async def async_output_rate(self):
         """Data Output Rate Bits.
         b000 -> 0.75, b001 -> 1.5, b010 -> 3, b011 -> 7.5, b100 -> 15 (Default), b101 -> 30, b110 -> 75, b111 -> Reserved"""
-        _confi_a = self.bus.read_i2c_block_data(self.address, self.CONFIG_A_ADDR, 1)
+        _confi_a = await self.registers.async_read(self.CONFIG_A_ADDR)
 
-        val = _confi_a[0] & self.OUTPUT_RATE_MASK
+        val = _confi_a & self.OUTPUT_RATE_MASK
         val = val >> 2
 
         return self.OUTPUT_RATE_LIST[val]
 
-    @property
-    def measurement_mode(self):
+    async def async_measurement_mode(self):
         """Measurement Configuration Bits. These bits define the
         measurement flow of the device, specifically whether or not
         to incorporate an applied bias into the measurement."""
-        _confi_a = self.bus.read_i2c_block_data(self.address, self.CONFIG_A_ADDR, 1)
+        _confi_a = await self.registers.async_read(self.CONFIG_A_ADDR)
 
-        val = _confi_a[0] & self.MEAS_CONFIG_MASK
+        val = _confi_a & self.MEAS_CONFIG_MASK
 
         return val
 
-    @property
-    def gain(self):
+    async def async_gain(self):
         """Gain Configuration Bits. These bits configure the gain for
         the device. The gain configuration is common for all
         channels
         return Gain (LSb/Gauss)"""
-        _confi_b = self.bus.read_i2c_block_data(self.address, self.CONFIG_B_ADDR, 1)
+        _confi_b = await self.registers.async_read(self.CONFIG_B_ADDR)
 
-        val = _confi_b[0] & self.GAIN_CONFIG_MASK
+        val = _confi_b & self.GAIN_CONFIG_MASK
         val = val >> 5
 
         return self.GAIN_LIST[val]
 
-    @property
-    def sensor_range(self):
+    async def async_sensor_range(self):
         """
         return Recommended Sensor Field Range (Gauss)"""
-        _confi_b = self.bus.read_i2c_block_data(self.address, self.CONFIG_B_ADDR, 1)
+        _confi_b = await self.registers.async_read(self.CONFIG_B_ADDR)
 
-        val = _confi_b[0] & self.GAIN_CONFIG_MASK
+        val = _confi_b & self.GAIN_CONFIG_MASK
         val = val >> 5
 
         return self.SENSOR_RANGE_LIST[val]
 
-    @property
-    def resolution(self):
+    async def async_resolution(self):
         """
         return Digital Resolution (mG/LSb)"""
-        _confi_b = self.bus.read_i2c_block_data(self.address, self.CONFIG_B_ADDR, 1)
+        _confi_b = await self.registers.async_read(self.CONFIG_B_ADDR)
 
-        val = _confi_b[0] & self.GAIN_CONFIG_MASK
+        val = _confi_b & self.GAIN_CONFIG_MASK
         val = val >> 5
 
         return self.RESOLUTION_LIST[val]
 
-    @property
-    def i2c_high_speed(self):
+    async def async_i2c_high_speed(self):
         """Set this pin to enable High Speed I2C, 3400kHz"""
-        _mode = self.bus.read_i2c_block_data(self.address, self.MODE_ADDR, 1)
+        _mode = await self.registers.async_read(self.MODE_ADDR)
 
-        val = _mode[0] & self.I2C_HIGH_SPEED_MASK
+        val = _mode & self.I2C_HIGH_SPEED_MASK
 
         if val > 0:
             return True
 
         return False
 
-    @property
-    def operating_mode(self):
+    async def async_operating_mode(self):
         """Mode Select Bits. These bits select the operation mode of this device.
         0 -> Continuous-Measurement Mode. In continuous-measurement mode,
         the device continuously performs measurements and places the
@@ -651,67 +1064,60 @@ class HCM5883:
         measurement is performed.
         2 -> Idle Mode. Device is placed in idle mode.
         3 -> Idle Mode. Device is placed in idle mode."""
-        _mode = self.bus.read_i2c_block_data(self.address, self.MODE_ADDR, 1)
+        _mode = await self.registers.async_read(self.MODE_ADDR)
 
-        val = _mode[0] & self.OPERATING_MODE_MASK
+        val = _mode & self.OPERATING_MODE_MASK
 
         return val
 
-    @operating_mode.setter
-    def operating_mode(self, new_mode):
+    async def async_set_operating_mode(self, new_mode):
+        """select the operation mode, see async_operating_mode"""
         if new_mode < 0 or new_mode > 3:
             raise ValueError(f"Invalid mode requested [0-3]:{new_mode}")
-        else:
-            _old_mode = self.bus.read_i2c_block_data(self.address, self.MODE_ADDR, 1)
-            self.bus.write_i2c_block_data(self.address, self.MODE_ADDR, [new_mode])
 
-    @property
-    def mag_x(self):
-        """return the meassurament in X axis"""
-        _bytes = self.bus.read_i2c_block_data(self.address, self.X_AXIS_ADDR, 2)
-
-        val = _bytes[0] | (_bytes[1] << 8)
-        if val & (1 << 16 - 1):
-            val = val - (1 << 16)
-
-        val = self._scale(val, (0x07FF, 2047), (0xF800, -2048))
+        await self.registers.async_write(self.MODE_ADDR, new_mode)
+        if new_mode == 1:
+            # the device goes back to idle by itself after the measurement
+            self.registers.invalidate(self.MODE_ADDR)
 
-        val = val / self.gain
-
-        return round(val, 4)
+    async def async_mag_x(self):
+        """return the meassurament in X axis"""
+        return (await self.async_read_vector())[0]
 
-    @property
-    def mag_y(self):
+    async def async_mag_y(self):
         """return the meassurament in Y axis"""
-        _bytes = self.bus.read_i2c_block_data(self.address, self.Y_AXIS_ADDR, 2)
+        return (await self.async_read_vector())[1]
 
-        val = _bytes[0] | (_bytes[1] << 8)
-        if val & (1 << 16 - 1):
-            val = val - (1 << 16)
-
-        val = self._scale(val, (0x07FF, 2047), (0xF800, -2048))
-
-        val = val / self.gain
-
-        return round(val, 4)
-
-    @property
-    def mag_z(self):
+    async def async_mag_z(self):
         """return the meassurament in Z axis"""
-        _bytes = self.bus.read_i2c_block_data(self.address, self.Z_AXIS_ADDR, 2)
+        return (await self.async_read_vector())[2]
+
+    async def async_read_vector(self) -> Tuple[float, float, float]:
+        """Waits for RDY and reads the six data registers in one burst, so
+        the axes come from the same measurement and the registers are
+        unlocked. Returns (x, y, z) in Gauss, None for an overflowed axis,
+        and keeps them in vector.
+        """
+        await self._async_wait_ready()
 
-        val = _bytes[0] | (_bytes[1] << 8)
-        if val & (1 << 16 - 1):
-            val = val - (1 << 16)
+        _data = await self.bus.read_block(self.address, self.X_AXIS_ADDR, 6)
+        # the registers are ordered X, Z, Y, most significant byte first
+        _x, _z, _y = struct.unpack(">hhh", bytes(_data))
+        _gain = await self.async_gain()
 
-        val = self._scale(val, (0x07FF, 2047), (0xF800, -2048))
+        self.vector = tuple(
+            None if _val == self.AXIS_OVERFLOW else round(_val / _gain, 4)
+            for _val in (_x, _y, _z)
+        )
+        self.vector_timestamp = time.monotonic()
 
-        val = val / self.gain
+        return self.vector
 
-        return round(val, 4)
+    async def async_status(self):
+        """Reads the status register."""
+        return await self.bus.read_byte(self.address, self.STATUS_ADDR)
 
-    @property
-    def is_locked(self):
+    async def async_is_locked(self):
         """Data output register lock. This bit is set when:
         1.some but not all for of the six data output registers have been read,
         2. Mode register has been read.
@@ -722,17 +1128,14 @@ class HCM5883:
             3. the measurement configuration (CRA) is changed,
             4. power is reset"""
 
-        _status = self.bus.read_i2c_block_data(self.address, self.MODE_ADDR, 1)
-
-        val = _status[0] & self.STATUS_LOCKED_MASK
+        val = await self.async_status() & self.STATUS_LOCKED_MASK
 
         if val > 0:
             return True
 
         return False
 
-    @property
-    def is_ready(self):
+    async def async_is_ready(self):
         """Ready Bit. Set when data is written to all six data registers.
         Cleared when device initiates a write to the data output
         registers and after one or more of the data output registers
@@ -741,279 +1144,65 @@ class HCM5883:
         the status register for monitoring the device for
         measurement data."""
 
-        _status = self.bus.read_i2c_block_data(self.address, self.MODE_ADDR, 1)
-
-        val = _status[0] & self.STATUS_READY_MASK
+        val = await self.async_status() & self.STATUS_READY_MASK
 
         if val > 0:
             return True
 
         return False
 
-    def _scale(self, x, upper, lower):
-        _x1, _y1 = lower
-        _x2, _y2 = upper
-        _m = (_y2 - _y1) / (_x2 - _x1)
-        _n = _m * _x1 - _y1
-        return x * _m - _n
-
-
-class Mode:
-    """An enum-like class representing possible ADC operating modes."""
-
-    # See datasheet "Operating Modes" section
-    # values here are masks for setting MODE bit in Config Register
-    # pylint: disable=too-few-public-methods
-    CONTINUOUS = 0x0000
-    """Continuous Mode"""
-    SINGLE = 0x0100
-    """Single-Shot Mode"""
-
-
-class ADS1x15:
-    """Base functionality for ADS1x15 analog to digital converters.
-    :param ~busio.I2C i2c: The I2C bus the device is connected to.
-    :param float gain: The ADC gain.
-    :param int data_rate: The data rate for ADC conversion in samples per second.
-                          Default value depends on the device.
-    :param Mode mode: The conversion mode, defaults to `Mode.SINGLE`.
-    :param int address: The I2C address of the device.
-    """
-
-    _ADS1X15_DEFAULT_ADDRESS = 0x48
-    _ADS1X15_POINTER_CONVERSION = 0x00
-    _ADS1X15_POINTER_CONFIG = 0x01
-    _ADS1X15_CONFIG_OS_SINGLE = 0x8000
-    _ADS1X15_CONFIG_MUX_OFFSET = 12
-    _ADS1X15_CONFIG_COMP_QUE_DISABLE = 0x0003
-    _ADS1X15_CONFIG_GAIN = {
-        2 / 3: 0x0000,
-        1: 0x0200,
-        2: 0x0400,
-        4: 0x0600,
-        8: 0x0800,
-        16: 0x0A00,
-    }
-
-    def __init__(
-        self,
-        i2c_bus: SMBus,
-        gain: float = 1,
-        data_rate: int = None,
-        mode: int = Mode.SINGLE,
-        address: int = _ADS1X15_DEFAULT_ADDRESS,
-    ):
-        # pylint: disable=too-many-arguments
-        self._last_pin_read = None
-        self.buf = bytearray(3)
-        self.gain = gain
-        self.data_rate = self._data_rate_default() if data_rate is None else data_rate
-        self.mode = mode
-        self.bus = i2c_bus
-        self.address = address
-
-    @property
-    def bits(self) -> int:
-        """The ADC bit resolution."""
-        raise NotImplementedError("Subclass must implement bits property.")
-
-    @property
-    def data_rate(self) -> int:
-        """The data rate for ADC conversion in samples per second."""
-        return self._data_rate
-
-    @data_rate.setter
-    def data_rate(self, rate: int) -> None:
-        possible_rates = self.rates
-        if rate not in possible_rates:
-            raise ValueError("Data rate must be one of: {}".format(possible_rates))
-        self._data_rate = rate
-
-    @property
-    def rates(self) -> List[int]:
-        """Possible data rate settings."""
-        raise NotImplementedError("Subclass must implement rates property.")
-
-    @property
-    def rate_config(self) -> Dict[int, int]:
-        """Rate configuration masks."""
-        raise NotImplementedError("Subclass must implement rate_config property.")
-
-    @property
-    def gain(self) -> float:
-        """The ADC gain."""
-        return self._gain
-
-    @gain.setter
-    def gain(self, gain: float) -> None:
-        possible_gains = self.gains
-        if gain not in possible_gains:
-            raise ValueError("Gain must be one of: {}".format(possible_gains))
-        self._gain = gain
-
-    @property
-    def gains(self) -> List[float]:
-        """Possible gain settings."""
-        g = list(self._ADS1X15_CONFIG_GAIN.keys())
-        g.sort()
-        return g
+    async def async_read(self) -> HMC5883Reading:
+        """return the readings of this refresh"""
+        # status first, the burst read clears RDY
+        _is_locked = await self.async_is_locked()
+        _is_ready = await self.async_is_ready()
+        _mag_x, _mag_y, _mag_z = await self.async_read_vector()
+
+        return HMC5883Reading(
+            sample_no=await self.async_sample_no(),
+            output_rate=await self.async_output_rate(),
+            measurement_mode=await self.async_measurement_mode(),
+            gain=await self.async_gain(),
+            sensor_range=await self.async_sensor_range(),
+            resolution=await self.async_resolution(),
+            i2c_high_speed=await self.async_i2c_high_speed(),
+            operating_mode=await self.async_operating_mode(),
+            is_locked=_is_locked,
+            is_ready=_is_ready,
+            mag_x=_mag_x,
+            mag_y=_mag_y,
+            mag_z=_mag_z,
+        )
 
-    @property
-    def mode(self) -> int:
-        """The ADC conversion mode."""
-        return self._mode
-
-    @mode.setter
-    def mode(self, mode: int) -> None:
-        if mode not in (Mode.CONTINUOUS, Mode.SINGLE):
-            raise ValueError("Unsupported mode.")
-        self._mode = mode
-
-    def read(self, pin, is_differential: bool = False) -> int:
-        """I2C Interface for ADS1x15-based ADCs reads.
-        :param ~microcontroller.Pin pin: individual or differential pin.
-        :param bool is_differential: single-ended or differential read.
-        """
-        pin = pin if is_differential else pin + 0x04
-        return self._read(pin)
+    def _on_ready_edge(self, channel):  # pylint: disable=unused-argument
+        """called from the RPi.GPIO thread"""
+        self._loop.call_soon_threadsafe(self._ready.set)
 
-    def _data_rate_default(self) -> int:
-        """Retrieve the default data rate for this ADC (in samples per second).
-        Should be implemented by subclasses.
-        """
-        raise NotImplementedError("Subclasses must implement _data_rate_default!")
+    async def _async_wait_ready(self):
+        """wait for a new measurement, at most two output periods
 
-    def _conversion_value(self, raw_adc: int) -> int:
-        """Subclasses should override this function that takes the 16 raw ADC
-        values of a conversion result and returns a signed integer value.
+        Nothing comes while idle, the registers then keep the last measurement.
         """
-        raise NotImplementedError("Subclass must implement _conversion_value function!")
-
-    async def _read(self, pin) -> int:
-        """Perform an ADC read. Returns the signed integer result of the read."""
-        # Immediately return conversion register result if in CONTINUOUS mode
-        # and pin has not changed
-        if self.mode == Mode.CONTINUOUS and self._last_pin_read == pin:
-            return self._conversion_value(self.get_last_result(True))
-
-        # Assign last pin read if in SINGLE mode or first sample in CONTINUOUS mode on this pin
-        self._last_pin_read = pin
-
-        # Configure ADC every time before a conversion in SINGLE mode
-        # or changing channels in CONTINUOUS mode
-        if self.mode == Mode.SINGLE:
-            config = self._ADS1X15_CONFIG_OS_SINGLE
-        else:
-            config = 0
-        config |= (pin & 0x07) << self._ADS1X15_CONFIG_MUX_OFFSET
-        config |= self._ADS1X15_CONFIG_GAIN[self.gain]
-        config |= self.mode
-        config |= self.rate_config[self.data_rate]
-        config |= self._ADS1X15_CONFIG_COMP_QUE_DISABLE
-        self.bus.write_i2c_block_data(
-            self.address, self._ADS1X15_POINTER_CONFIG, [config]
-        )
-
-        # Wait for conversion to complete
-        # ADS1x1x devices settle within a single conversion cycle
-        if self.mode == Mode.SINGLE:
-            # Continuously poll conversion complete status bit
-            while not self._conversion_complete():
+        if await self.async_operating_mode() > 1:
+            return
+
+        _timeout = 2.0 / await self.async_output_rate() + 0.01
+
+        if self.drdy_pin is not None and self._loop is not None:
+            if await self.async_status() & self.STATUS_READY_MASK:
+                return
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), _timeout)
+            except asyncio.TimeoutError:
                 pass
-        else:
-            # Can't poll registers in CONTINUOUS mode
-            # Wait expected time for two conversions to complete
-            await asyncio.sleep(2 / self.data_rate)
-            # time.sleep(2 / self.data_rate)
-
-        return self._conversion_value(self.get_last_result(False))
-
-    def _conversion_complete(self) -> int:
-        """Return status of ADC conversion."""
-        # OS is bit 15
-        # OS = 0: Device is currently performing a conversion
-        # OS = 1: Device is not currently performing a conversion
-        return self._read_register(self._ADS1X15_POINTER_CONFIG) & 0x8000
-
-    def get_last_result(self, fast: bool = False) -> int:
-        """Read the last conversion result when in continuous conversion mode.
-        Will return a signed integer value. If fast is True, the register
-        pointer is not updated as part of the read. This reduces I2C traffic
-        and increases possible read rate.
-        """
-        return self._read_register(self._ADS1X15_POINTER_CONVERSION, fast)
-
-    def _write_register(self, reg: int, value: int):
-        """Write 16 bit value to register."""
-        self.buf[0] = reg
-        self.buf[1] = (value >> 8) & 0xFF
-        self.buf[2] = value & 0xFF
-        self.bus.write_i2c_block_data(self.address, reg, value)
-        # with self.i2c_device as i2c:
-        #    i2c.write(self.buf)
-
-    def _read_register(self, reg: int, fast: bool = False) -> int:
-        """Read 16 bit register value. If fast is True, the pointer register
-        is not updated.
-        """
-        self.bus.read_block_data(self.address, reg, self.buf)
-        return self.buf[0] << 8 | self.buf[1]
-        # with self.i2c_device as i2c:
-        #    if fast:
-        #        i2c.readinto(self.buf, end=2)
-        #    else:
-        #        i2c.write_then_readinto(bytearray([reg]), self.buf, in_end=2)
-        # return self.buf[0] << 8 | self.buf[1]
-
-
-class ADS1115(ADS1x15):
-    """Class for the ADS1115 16 bit ADC."""
-
-    # Pins
-    P0 = 0
-    """Analog Pin 0"""
-    P1 = 1
-    """Analog Pin 1"""
-    P2 = 2
-    """Analog Pin 2"""
-    P3 = 3
-    """Analog Pin 3"""
-
-    # Data sample rates
-    _ADS1115_CONFIG_DR = {
-        8: 0x0000,
-        16: 0x0020,
-        32: 0x0040,
-        64: 0x0060,
-        128: 0x0080,
-        250: 0x00A0,
-        475: 0x00C0,
-        860: 0x00E0,
-    }
-
-    @property
-    def bits(self) -> Literal[16]:
-        """The ADC bit resolution."""
-        return 16
+            return
 
-    @property
-    def rates(self) -> List[int]:
-        """Possible data rate settings."""
-        r = list(self._ADS1115_CONFIG_DR.keys())
-        r.sort()
-        return r
-
-    @property
-    def rate_config(self) -> Dict[int, int]:
-        """Rate configuration masks."""
-        return self._ADS1115_CONFIG_DR
-
-    def _data_rate_default(self) -> Literal[128]:
-        return 128
-
-    def _conversion_value(self, raw_adc: int) -> int:
-        value = struct.unpack(">h", raw_adc.to_bytes(2, "big"))[0]
-        return value
+        _deadline = time.monotonic() + _timeout
+        while not await self.async_status() & self.STATUS_READY_MASK:
+            if time.monotonic() > _deadline:
+                return
+            await asyncio.sleep(0.005)
 
 
 class ADS1115weno:
@@ -1122,6 +1311,14 @@ class ADS1115weno:
         256: __ADS1015_REG_CONFIG_PGA_0_256V,
     }
 
+    # Dictionary with the single-ended inputs
+    muxADS1x15 = {
+        0: __ADS1015_REG_CONFIG_MUX_SINGLE_0,
+        1: __ADS1015_REG_CONFIG_MUX_SINGLE_1,
+        2: __ADS1015_REG_CONFIG_MUX_SINGLE_2,
+        3: __ADS1015_REG_CONFIG_MUX_SINGLE_3,
+    }
+
     # Constructor
     def __init__(self, address=0x48, ic=__IC_ADS1115, debug=False, i2c=None):
         self.i2c = i2c
@@ -1180,7 +1377,7 @@ class ADS1115weno:
 
         # Write config register to the ADC
         bytes = [(config >> 8) & 0xFF, config & 0xFF]
-        self.i2c.write_i2c_block_data(
+        await self.i2c.write_block(
             self.address, self.__ADS1015_REG_POINTER_CONFIG, bytes
         )
 
@@ -1191,7 +1388,7 @@ class ADS1115weno:
         await asyncio.sleep(delay)
 
         # Read the conversion results
-        result = self.i2c.read_i2c_block_data(
+        result = await self.i2c.read_block(
             self.address, self.__ADS1015_REG_POINTER_CONVERT, 2
         )
         # Return a mV value for the ADS1115
@@ -1201,3 +1398,79 @@ class ADS1115weno:
             return (val - 0xFFFF) * pga / 32768.0
         else:
             return ((result[0] << 8) | (result[1])) * pga / 32768.0
+
+    def single_shot_config(self, channel=0, pga=6144, sps=860, ready_pin=False):
+        """
+        Returns the config register starting a single-shot conversion of a
+        single-ended channel.
+        With ready_pin the ALERT/RDY pin goes low at the end of the conversion,
+        enable_ready_pin must have been called once before.
+        """
+        if ready_pin:
+            config = self.__ADS1015_REG_CONFIG_CQUE_1CONV
+        else:
+            config = self.__ADS1015_REG_CONFIG_CQUE_NONE
+
+        config |= (
+            self.__ADS1015_REG_CONFIG_CLAT_NONLAT
+            | self.__ADS1015_REG_CONFIG_CPOL_ACTVLOW
+            | self.__ADS1015_REG_CONFIG_CMODE_TRAD
+            | self.__ADS1015_REG_CONFIG_MODE_SINGLE
+            | self.__ADS1015_REG_CONFIG_OS_SINGLE
+        )
+        config |= self.spsADS1115.setdefault(sps, self.__ADS1115_REG_CONFIG_DR_860SPS)
+        config |= self.pgaADS1x15.setdefault(pga, self.__ADS1015_REG_CONFIG_PGA_6_144V)
+        config |= self.muxADS1x15[channel]
+        return config
+
+    async def enable_ready_pin(self):
+        """
+        Sets the MSB of the high threshold register and clears the one of the
+        low threshold register so ALERT/RDY works as conversion ready pin,
+        see datasheet page 19.
+        """
+        await self.i2c.write_block(
+            self.address, self.__ADS1015_REG_POINTER_LOWTHRESH, [0x00, 0x00]
+        )
+        await self.i2c.write_block(
+            self.address, self.__ADS1015_REG_POINTER_HITHRESH, [0x80, 0x00]
+        )
+
+    def convert(self, bus, channel, pga, sps, timeout, wait_ready=None):
+        """
+        Runs a single-shot conversion of a single-ended channel on a raw SMBus,
+        in the I2C worker thread, and returns the result in mV.
+        wait_ready(timeout) may wait for the ALERT/RDY pin, the OS bit of the
+        config register is polled until the conversion is done otherwise or if
+        the pin did not come. Raises OSError if it never completes.
+        """
+        config = self.single_shot_config(channel, pga, sps, wait_ready is not None)
+        bus.write_i2c_block_data(
+            self.address,
+            self.__ADS1015_REG_POINTER_CONFIG,
+            [(config >> 8) & 0xFF, config & 0xFF],
+        )
+
+        deadline = time.monotonic() + timeout
+        if wait_ready is None:
+            # the data rate is within ±10 %, do not poll before the fastest end
+            time.sleep(0.9 / sps)
+        if wait_ready is None or not wait_ready(timeout):
+            while not self._conversion_done(bus):
+                if time.monotonic() > deadline:
+                    raise OSError("ADS1115 conversion not completed")
+
+        result = bus.read_i2c_block_data(
+            self.address, self.__ADS1015_REG_POINTER_CONVERT, 2
+        )
+        val = (result[0] << 8) | (result[1])
+        if val > 0x7FFF:
+            return (val - 0xFFFF) * pga / 32768.0
+        else:
+            return val * pga / 32768.0
+
+    def _conversion_done(self, bus):
+        config = bus.read_i2c_block_data(
+            self.address, self.__ADS1015_REG_POINTER_CONFIG, 2
+        )
+        return (config[0] << 8) & self.__ADS1015_REG_CONFIG_OS_NOTBUSY
@@ -0,0 +1,142 @@
+""" ACS712 zero offset calibration """
+import logging
+from typing import Dict, Mapping, Optional, Sequence
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .adc_filter import ChannelStats
+from .const import DOMAIN
+
+STORAGE_KEY = f"{DOMAIN}.acs712_calibration"
+STORAGE_VERSION = 1
+# coalesce the writes of a drifting zero
+STORAGE_SAVE_DELAY = 600
+
+# nominal output at 0 A and sensitivity of the ACS712-05B on a 5 V supply
+ACS712_ZERO_MV = 2400.0
+ACS712_SENSITIVITY = 185.0
+
+
+class ACS712Calibration:
+    """Zero offset of the ACS712 channels, learned while their relay is off.
+
+    With the relay off the channel carries no current, so the mean of the
+    sampler window is the zero offset. It is tracked with an EMA to follow the
+    drift over temperature and time, and saved to the HA storage. The
+    sensitivity is only read from the storage, to be adjusted by hand.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        channel_relays: Mapping[int, int],
+        settle_time: float = 5.0,
+        alpha: float = 0.1,
+        max_noise: float = 15.0,
+        max_deviation: float = 250.0,
+    ) -> None:
+        self.logger = logger
+        # relay index switching the load of each ADC channel
+        self.channel_relays = dict(channel_relays)
+        # seconds the relay has to be off before learning
+        self.settle_time = settle_time
+        self.alpha = alpha
+        # windows noisier than this (mV RMS) still carry some current
+        self.max_noise = max_noise
+        # zeros further than this (mV) from nominal are a wiring fault
+        self.max_deviation = max_deviation
+        self._zero: Dict[int, float] = {
+            _channel: ACS712_ZERO_MV for _channel in self.channel_relays
+        }
+        self._sensitivity: Dict[int, float] = {
+            _channel: ACS712_SENSITIVITY for _channel in self.channel_relays
+        }
+        self._off_since: Dict[int, float] = {}
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._save_pending = False
+
+    def zero(self, channel: int) -> float:
+        """return the output of the channel at 0 A, in mV"""
+        return self._zero.get(channel, ACS712_ZERO_MV)
+
+    def sensitivity(self, channel: int) -> float:
+        """return the sensitivity of the channel, in mV/A"""
+        return self._sensitivity.get(channel, ACS712_SENSITIVITY)
+
+    def current(self, channel: int, value: float) -> float:
+        """return the current in A of a channel output in mV"""
+        return (value - self.zero(channel)) / self.sensitivity(channel)
+
+    def rms_current(self, channel: int, stats: ChannelStats) -> float:
+        """return the RMS current in A over the sampler window"""
+        return stats.rms(self.zero(channel)) / self.sensitivity(channel)
+
+    async def async_load(self) -> None:
+        """restore the coefficients saved by a previous run"""
+        _data = await self._store.async_load()
+        if not _data:
+            return
+
+        for _key, _coefficients in _data.get("channels", {}).items():
+            _channel = int(_key)
+            if _channel not in self.channel_relays:
+                continue
+            self._zero[_channel] = _coefficients.get("zero", ACS712_ZERO_MV)
+            self._sensitivity[_channel] = _coefficients.get(
+                "sensitivity", ACS712_SENSITIVITY
+            )
+
+    @callback
+    def async_update(
+        self,
+        adc: Sequence[Optional[ChannelStats]],
+        relays: Sequence[bool],
+        timestamp: float,
+    ) -> None:
+        """learn the zero of the channels whose relay is settled off"""
+        _learned = False
+
+        for _channel, _relay in self.channel_relays.items():
+            if relays[_relay]:
+                self._off_since.pop(_channel, None)
+                continue
+
+            _off_since = self._off_since.setdefault(_channel, timestamp)
+            if timestamp - _off_since < self.settle_time:
+                continue
+
+            _stats = adc[_channel]
+            if _stats is None or _stats.ac_rms > self.max_noise:
+                continue
+            if abs(_stats.mean - ACS712_ZERO_MV) > self.max_deviation:
+                self.logger.debug(
+                    f"ACS712 channel {_channel} zero {_stats.mean} mV out of range"
+                )
+                continue
+
+            self._zero[_channel] += self.alpha * (_stats.mean - self._zero[_channel])
+            _learned = True
+
+        # a delayed save is postponed by every new call, schedule it once
+        if _learned and not self._save_pending:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+            self._save_pending = True
+
+    async def async_save(self) -> None:
+        """write the coefficients now, the reloaded entry resumes from them"""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_pending = False
+        return {
+            "channels": {
+                str(_channel): {
+                    "zero": round(self._zero[_channel], 2),
+                    "sensitivity": self._sensitivity[_channel],
+                }
+                for _channel in self.channel_relays
+            }
+        }
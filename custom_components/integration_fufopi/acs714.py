@@ -1,6 +1,5 @@
 """ ACS714 """
 from decimal import Decimal
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -12,6 +11,8 @@ from homeassistant.const import (
 from homeassistant.components.sensor import SensorEntity
 
 from .const import DOMAIN
+from .entity import FufoPiEntity
+from .snapshot import adc_key
 
 
 def add_acs712_sensors(coordinator, config_entry):
@@ -24,7 +25,7 @@ def add_acs712_sensors(coordinator, config_entry):
     return sensors
 
 
-class ACS712Entity(CoordinatorEntity):
+class ACS712Entity(FufoPiEntity):
     """ACS712 base entity"""
 
     def __init__(self, coordinator, config_entry, sensor_no):
@@ -32,8 +33,16 @@ class ACS712Entity(CoordinatorEntity):
         self.config_entry = config_entry
         self._attr_assumed_state = True
         self._sensor_no = sensor_no
+        self.data_keys = frozenset({adc_key(self._sensor_no)})
         # self._attr_entity_picture =
 
+    @property
+    def available(self):
+        """Return True once the channel has samples."""
+        return (
+            super().available and self.coordinator.data.adc[self._sensor_no] is not None
+        )
+
     @property
     def unique_id(self):
         """Return a unique ID to use for this entity."""
@@ -51,7 +60,12 @@ class ACS712Entity(CoordinatorEntity):
     @property
     def sensibility(self):
         """Return sensor sensibiliti in mV/A"""
-        return 185
+        return self.coordinator.acs712_calibration.sensitivity(self._sensor_no)
+
+    @property
+    def zero_offset(self):
+        """Return the learned sensor output at 0 A in mV"""
+        return self.coordinator.acs712_calibration.zero(self._sensor_no)
 
 
 class ACS712Sensor(ACS712Entity, SensorEntity):
@@ -68,14 +82,22 @@ class ACS712Sensor(ACS712Entity, SensorEntity):
     #    return self._attr_extra_state_attributes
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _sensor_value = self.coordinator.data[f"ads1115_ch{self._sensor_no}"]
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _stats = self.coordinator.data.adc[self._sensor_no]
+        _sensor_value = _stats.value
 
-        _raw_value = (_sensor_value - 2400) / self.sensibility
+        _raw_value = (_sensor_value - self.zero_offset) / self.sensibility
 
         self._attr_native_value = Decimal(_raw_value).quantize(Decimal("0.01"))
 
+        self._attr_extra_state_attributes = {
+            "rms": Decimal(_stats.rms(self.zero_offset) / self.sensibility).quantize(
+                Decimal("0.01")
+            ),
+            "zero_offset": round(self.zero_offset, 1),
+        }
+
         # self._attr_extra_state_attributes = {
         #    "integration": DOMAIN,
         #    "adschannel": f"ch{self._sensor_no}",
@@ -84,4 +106,3 @@ class ACS712Sensor(ACS712Entity, SensorEntity):
         #    "sensibility": f"{self.sensibility} mV/A",
         #    "raw value": _raw_value,
         # }
-        self.async_write_ha_state()
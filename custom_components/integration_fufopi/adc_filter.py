@@ -0,0 +1,80 @@
+""" ADC sample filtering """
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+FILTER_BOXCAR = "boxcar"
+FILTER_EMA = "ema"
+FILTER_MEDIAN = "median"
+
+
+@dataclass(frozen=True)
+class ChannelFilter:
+    """Filter applied to the buffered samples of one ADC channel"""
+
+    method: str = FILTER_BOXCAR
+    # samples averaged into one decimated sample
+    oversampling: int = 4
+    # weight of the newest decimated sample with the EMA method
+    ema_alpha: float = 0.2
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelStats:
+    """Filtered values of one ADC channel over the buffered window, in mV"""
+
+    value: float
+    mean: float
+    # RMS of the signal around its mean, the AC component
+    ac_rms: float
+
+    def rms(self, offset: float) -> float:
+        """return the RMS of the signal around offset"""
+        return float(np.hypot(self.mean - offset, self.ac_rms))
+
+
+def decimate(samples: np.ndarray, oversampling: int) -> np.ndarray:
+    """return the means of consecutive groups of oversampling samples
+
+    The oldest samples not filling a complete group are dropped.
+    """
+    if oversampling <= 1 or len(samples) < oversampling:
+        return samples
+
+    _groups = len(samples) // oversampling
+    _complete = samples[len(samples) - _groups * oversampling :]
+    return _complete.reshape(_groups, oversampling).mean(axis=1)
+
+
+def ema(samples: np.ndarray, alpha: float) -> float:
+    """return the exponential moving average of the samples, oldest first"""
+    _weights = (1.0 - alpha) ** np.arange(len(samples) - 1, -1, -1)
+    return float(np.dot(_weights, samples) / _weights.sum())
+
+
+def filter_samples(samples, channel_filter: ChannelFilter) -> Optional[ChannelStats]:
+    """return the filtered value and window statistics of the samples
+
+    None without samples, a channel never converted has no value, not 0 mV.
+    """
+    _samples = np.asarray(samples, dtype=np.float64)
+    if len(_samples) == 0:
+        return None
+
+    _decimated = decimate(_samples, channel_filter.oversampling)
+
+    if channel_filter.method == FILTER_MEDIAN:
+        _value = float(np.median(_decimated))
+    elif channel_filter.method == FILTER_EMA:
+        _value = ema(_decimated, channel_filter.ema_alpha)
+    elif channel_filter.method == FILTER_BOXCAR:
+        _value = float(_decimated.mean())
+    else:
+        raise ValueError(f"Unknown ADC filter: {channel_filter.method}")
+
+    return ChannelStats(
+        value=_value,
+        mean=float(_samples.mean()),
+        ac_rms=float(_samples.std()),
+    )
@@ -0,0 +1,130 @@
+""" ADS1115 background sampler """
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import RPi.GPIO as GPIO
+
+from .ring_buffer import SampleRingBuffer
+
+
+class ADS1115Sampler:
+    """Cycle the ADS1115 MUX over the channels in the background.
+
+    The conversions run in the I2C worker thread, a few rounds over all the
+    channels per job so the other I2C transactions get the bus in between,
+    and only the results of a job are handed to the event loop. Every
+    conversion is a single-shot one, whose end is detected on the ALERT/RDY
+    pin when rdy_pin (BOARD numbering) is given, otherwise by polling the OS
+    bit of the config register, so a part running slower than its nominal
+    data rate never returns the conversion of the previous channel.
+    """
+
+    def __init__(
+        self,
+        adc,
+        logger: logging.Logger,
+        channels: Sequence[int] = (0, 1, 2, 3),
+        sps: int = 860,
+        buffer_size: int = 64,
+        rdy_pin: Optional[int] = None,
+        pga: int = 6144,
+        rounds_per_job: int = 4,
+    ) -> None:
+        self.adc = adc
+        self.logger = logger
+        self.channels = tuple(channels)
+        self.sps = sps
+        self.pga = pga
+        self.rdy_pin = rdy_pin
+        # 4 rounds of 4 channels hold the bus ~20 ms at 860 SPS
+        self.rounds_per_job = rounds_per_job
+        self.buffers: Dict[int, SampleRingBuffer] = {
+            _channel: SampleRingBuffer(buffer_size) for _channel in self.channels
+        }
+        self.missed_ready = 0
+        self._task = None
+        # set from the RPi.GPIO thread, waited for in the I2C worker thread
+        self._ready = threading.Event()
+        self._round_done = asyncio.Event()
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """start sampling"""
+        if self.rdy_pin is not None:
+            GPIO.setmode(GPIO.BOARD)
+            GPIO.setup(self.rdy_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(
+                self.rdy_pin, GPIO.FALLING, callback=self._on_ready_edge
+            )
+        self._task = loop.create_task(self._async_run())
+
+    def stop(self) -> None:
+        """stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.rdy_pin is not None:
+            GPIO.remove_event_detect(self.rdy_pin)
+
+    async def async_wait_round(self, timeout: float) -> bool:
+        """wait until every channel has been sampled once"""
+        try:
+            await asyncio.wait_for(self._round_done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _on_ready_edge(self, channel) -> None:  # pylint: disable=unused-argument
+        """called from the RPi.GPIO thread"""
+        self._ready.set()
+
+    async def _async_run(self) -> None:
+        if self.rdy_pin is not None:
+            try:
+                await self.adc.enable_ready_pin()
+            except OSError as err:
+                # the OS bit tells the end of the conversions as well
+                self.logger.warning(
+                    f"ADS1115 ALERT/RDY pin not enabled, polling instead: {err}"
+                )
+                GPIO.remove_event_detect(self.rdy_pin)
+                self.rdy_pin = None
+
+        while True:
+            try:
+                _rounds = await self.adc.i2c.run_job(self._sample_rounds)
+            except OSError as err:
+                self.logger.warning(f"ADS1115 sampling failed: {err}")
+                await asyncio.sleep(1)
+                continue
+
+            for _round in _rounds:
+                for _channel, _value in zip(self.channels, _round):
+                    self.buffers[_channel].append(_value)
+            self._round_done.set()
+
+    def _sample_rounds(self, bus) -> List[Tuple[float, ...]]:
+        """called in the I2C worker thread"""
+        return [
+            tuple(self._convert(bus, _channel) for _channel in self.channels)
+            for _ in range(self.rounds_per_job)
+        ]
+
+    def _convert(self, bus, channel: int) -> float:
+        # a conversion lasts 1/sps within ±10 %, leave room for a slow part
+        _timeout = 2.0 / self.sps + 0.01
+        if self.rdy_pin is None:
+            return self.adc.convert(bus, channel, self.pga, self.sps, _timeout)
+
+        # pulses of the previous conversion may have come in after its read
+        self._ready.clear()
+        return self.adc.convert(
+            bus, channel, self.pga, self.sps, _timeout, self._wait_ready
+        )
+
+    def _wait_ready(self, timeout: float) -> bool:
+        if self._ready.wait(timeout):
+            return True
+        self.missed_ready += 1
+        return False
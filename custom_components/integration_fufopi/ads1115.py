@@ -1,5 +1,4 @@
 """ ADS1115 """
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -10,6 +9,8 @@ from homeassistant.const import (
 from homeassistant.components.sensor import SensorEntity
 
 from .const import DOMAIN
+from .entity import FufoPiEntity
+from .snapshot import adc_key
 
 
 def add_ads1115_sensors(coordinator, config_entry):
@@ -22,13 +23,22 @@ def add_ads1115_sensors(coordinator, config_entry):
     return sensors
 
 
-class ADS1115Entity(CoordinatorEntity):
+class ADS1115Entity(FufoPiEntity):
     """ADS1115 base entity"""
 
     def __init__(self, coordinator, config_entry, channel_no):
         super().__init__(coordinator)
         self.config_entry = config_entry
         self._channel_no = channel_no
+        self.data_keys = frozenset({adc_key(self._channel_no)})
+
+    @property
+    def available(self):
+        """Return True once the channel has samples."""
+        return (
+            super().available
+            and self.coordinator.data.adc[self._channel_no] is not None
+        )
 
     @property
     def unique_id(self):
@@ -48,6 +58,9 @@ class ADS1115Entity(CoordinatorEntity):
 class ADS1115Sensor(ADS1115Entity, SensorEntity):
     """ADS1115 sensor"""
 
+    # raw readings jitter by a few LSB, ignore changes under 1 mV
+    state_deadband = 1.0
+
     def __init__(self, coordinator, config_entry, channel_no):
         super().__init__(coordinator, config_entry, channel_no)
         self._attr_name = f"ADS1115 Channel {self._channel_no}"
@@ -55,8 +68,6 @@ class ADS1115Sensor(ADS1115Entity, SensorEntity):
         self._attr_device_class = DEVICE_CLASS_VOLTAGE
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.data[f"ads1115_ch{self._channel_no}"]
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.coordinator.data.adc[self._channel_no].value
@@ -8,7 +8,6 @@
 # http://shop.pimoroni.com/products/adafruit-triple-axis-accelerometer
 
 from decimal import Decimal
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -20,12 +19,33 @@ from homeassistant.const import (
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.switch import SwitchEntity, DEVICE_CLASS_OUTLET
 
-from .const import DOMAIN, ATTRIBUTION
+from .const import DOMAIN, ATTRIBUTION, VIBRATION_BANDS
+from .entity import FufoPiEntity
 
 # from . import FufoPiCoordinator
 
 
-class ADXL345Entity(CoordinatorEntity):
+def add_adxl345_sensors(sensors, coordinator, config_entry):
+    """add sensors, if the ADXL345 was found on the I2C bus"""
+    if coordinator.i2c_adxl345 is None:
+        return
+
+    sensors.append(ADXL345AccelXSensor(coordinator, config_entry))
+    sensors.append(ADXL345AccelYSensor(coordinator, config_entry))
+    sensors.append(ADXL345AccelZSensor(coordinator, config_entry))
+    sensors.append(ADXL345RangeSensor(coordinator, config_entry))
+    sensors.append(ADXL345BandwidthSensor(coordinator, config_entry))
+
+    if coordinator.vibration_stream is not None:
+        sensors.append(ADXL345VibrationRMSSensor(coordinator, config_entry))
+        sensors.append(ADXL345VibrationPeakSensor(coordinator, config_entry))
+        sensors.append(ADXL345CrestFactorSensor(coordinator, config_entry))
+        sensors.append(ADXL345DominantFrequencySensor(coordinator, config_entry))
+        for _band in range(len(VIBRATION_BANDS)):
+            sensors.append(ADXL345BandSensor(coordinator, config_entry, _band))
+
+
+class ADXL345Entity(FufoPiEntity):
     """Power distribution base entity"""
 
     def __init__(self, coordinator, config_entry):
@@ -47,6 +67,11 @@ class ADXL345Entity(CoordinatorEntity):
             "manufacturer": "cHINITO",
         }
 
+    @property
+    def available(self):
+        """Return True if the sensor answered in the last refresh."""
+        return super().available and self.coordinator.data.adxl345 is not None
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
@@ -71,14 +96,12 @@ class ADXL345AccelXSensor(ADXL345Entity, SensorEntity):
         return super().unique_id + "accX"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.i2c_adxl345.accel_x
+            self.coordinator.data.adxl345.accel_x
         ).quantize(Decimal("1.000"))
 
-        self.async_write_ha_state()
-
 
 class ADXL345AccelYSensor(ADXL345Entity, SensorEntity):
     """Fridge voltage sensor"""
@@ -94,14 +117,12 @@ class ADXL345AccelYSensor(ADXL345Entity, SensorEntity):
         return super().unique_id + "accY"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.i2c_adxl345.accel_y
+            self.coordinator.data.adxl345.accel_y
         ).quantize(Decimal("1.000"))
 
-        self.async_write_ha_state()
-
 
 class ADXL345AccelZSensor(ADXL345Entity, SensorEntity):
     """Fridge voltage sensor"""
@@ -117,14 +138,12 @@ class ADXL345AccelZSensor(ADXL345Entity, SensorEntity):
         return super().unique_id + "accZ"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.i2c_adxl345.accel_z
+            self.coordinator.data.adxl345.accel_z
         ).quantize(Decimal("1.000"))
 
-        self.async_write_ha_state()
-
 
 class ADXL345PowerSwitch(ADXL345Entity, SwitchEntity):
     """integration_blueprint switch class."""
@@ -141,15 +160,17 @@ class ADXL345PowerSwitch(ADXL345Entity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
         """Turn on the switch."""
-        self.coordinator.i2c_adxl345.enable_measurement()
+        await self.coordinator.i2c_adxl345.async_enable_measurement()
+        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
         """Turn off the switch."""
-        self.coordinator.i2c_adxl345.disable_measurement()
+        await self.coordinator.i2c_adxl345.async_disable_measurement()
+        await self.coordinator.async_request_refresh()
 
     @property
     def is_on(self) -> bool | None:
-        return self.coordinator.i2c_adxl345.is_enabled
+        return self.coordinator.data.adxl345.enabled
 
 
 class ADXL345RangeSensor(ADXL345Entity, SensorEntity):
@@ -166,9 +187,9 @@ class ADXL345RangeSensor(ADXL345Entity, SensorEntity):
         return super().unique_id + "range"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _range = self.coordinator.i2c_adxl345.range
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _range = self.coordinator.data.adxl345.range
 
         if _range == self.coordinator.i2c_adxl345.RANGE_2G:
             self._attr_native_value = Decimal(2)
@@ -181,8 +202,6 @@ class ADXL345RangeSensor(ADXL345Entity, SensorEntity):
         else:
             self._attr_native_value = Decimal(0)
 
-        self.async_write_ha_state()
-
 
 class ADXL345BandwidthSensor(ADXL345Entity, SensorEntity):
     """Fridge voltage sensor"""
@@ -198,9 +217,9 @@ class ADXL345BandwidthSensor(ADXL345Entity, SensorEntity):
         return super().unique_id + "Bandwidth"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _bandwidth = self.coordinator.i2c_adxl345.bandwidth_rate
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _bandwidth = self.coordinator.data.adxl345.bandwidth_rate
 
         if _bandwidth == self.coordinator.i2c_adxl345.BANDWIDTH_RATE_25HZ:
             self._attr_native_value = Decimal(25)
@@ -219,4 +238,126 @@ class ADXL345BandwidthSensor(ADXL345Entity, SensorEntity):
         else:
             self._attr_native_value = Decimal(0)
 
-        self.async_write_ha_state()
+
+class ADXL345VibrationEntity(ADXL345Entity):
+    """Vibration captured by the FIFO stream"""
+
+    @property
+    def available(self):
+        """Return True if enough samples were streamed."""
+        return super().available and self.coordinator.data.adxl345.vibration is not None
+
+
+class ADXL345VibrationRMSSensor(ADXL345VibrationEntity, SensorEntity):
+    """vibration rms sensor"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Vibration RMS"
+        self._attr_native_unit_of_measurement = SPEED_METERS_PER_SECOND + "²"
+        self._attr_icon = "mdi:vibrate"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "vibRMS"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.adxl345.vibration.rms
+        ).quantize(Decimal("1.000"))
+
+
+class ADXL345VibrationPeakSensor(ADXL345VibrationEntity, SensorEntity):
+    """vibration peak sensor"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Vibration peak"
+        self._attr_native_unit_of_measurement = SPEED_METERS_PER_SECOND + "²"
+        self._attr_icon = "mdi:vibrate"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "vibPeak"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.adxl345.vibration.peak
+        ).quantize(Decimal("1.000"))
+
+
+class ADXL345CrestFactorSensor(ADXL345VibrationEntity, SensorEntity):
+    """vibration crest factor sensor"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Crest factor"
+        self._attr_icon = "mdi:sine-wave"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "crest"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.adxl345.vibration.crest_factor
+        ).quantize(Decimal("1.00"))
+
+
+class ADXL345SpectrumEntity(ADXL345Entity):
+    """Spectrum of the vibration captured by the FIFO stream"""
+
+    @property
+    def available(self):
+        """Return True if a full FFT block was streamed."""
+        return super().available and self.coordinator.data.adxl345.spectrum is not None
+
+
+class ADXL345DominantFrequencySensor(ADXL345SpectrumEntity, SensorEntity):
+    """dominant vibration frequency sensor"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Vibration frequency"
+        self._attr_device_class = DEVICE_CLASS_FREQUENCY
+        self._attr_native_unit_of_measurement = FREQUENCY_HERTZ
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "vibFreq"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.adxl345.spectrum.dominant_frequency
+        ).quantize(Decimal("1.0"))
+
+
+class ADXL345BandSensor(ADXL345SpectrumEntity, SensorEntity):
+    """vibration band sensor"""
+
+    def __init__(self, coordinator, config_entry, band):
+        super().__init__(coordinator, config_entry)
+        self._band = band
+        _low, _high = VIBRATION_BANDS[band]
+        self._attr_name = f"Vibration {_low}-{_high} Hz"
+        self._attr_native_unit_of_measurement = SPEED_METERS_PER_SECOND + "²"
+        self._attr_icon = "mdi:chart-bell-curve"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + f"vibBand{self._band}"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.adxl345.spectrum.band_rms[self._band]
+        ).quantize(Decimal("1.000"))
@@ -1,6 +1,5 @@
 from decimal import Decimal
 
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -11,6 +10,7 @@ from homeassistant.const import (
     DEVICE_CLASS_POWER,
     POWER_WATT,
     DEVICE_CLASS_BATTERY,
+    TIME_MINUTES,
 )
 
 from homeassistant.components.binary_sensor import (
@@ -20,17 +20,34 @@ from homeassistant.components.binary_sensor import (
 
 from homeassistant.components.sensor import SensorEntity
 
-from .const import DOMAIN, ATTRIBUTION
+from .const import DOMAIN, ATTRIBUTION, BATTERY_TEMPERATURE_ADC_CHANNEL
+from .entity import FufoPiEntity
+from .snapshot import adc_key, charger_keys
 
 # from . import FufoPiCoordinator
 
 
-class BatteryEntity(CoordinatorEntity):
+def add_battery_sensors(sensors, coordinator, config_entry):
+    """Add devices"""
+    sensors.append(BatteryChargeSensor(coordinator, config_entry))
+    sensors.append(BatteryTimeToEmptySensor(coordinator, config_entry))
+    sensors.append(BatteryTimeToFullSensor(coordinator, config_entry))
+
+
+class BatteryEntity(FufoPiEntity):
     """VE Direct base entity"""
 
+    # record fields of the main charger the entity state is built from, None
+    # for states that move at every refresh
+    record_fields = ()
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator)
         self.config_entry = config_entry
+        if self.record_fields is not None:
+            self.data_keys = charger_keys(
+                coordinator.smart_solar.charger_id, *self.record_fields
+            )
 
     @property
     def unique_id(self):
@@ -59,6 +76,8 @@ class BatteryEntity(CoordinatorEntity):
 class BatteryVoltageSensor(BatteryEntity, SensorEntity):
     """Battery voltage sensor"""
 
+    record_fields = ("battery_voltage",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Battery voltage"
@@ -70,17 +89,18 @@ class BatteryVoltageSensor(BatteryEntity, SensorEntity):
         return super().unique_id + "V"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.smart_solar.battery_voltage
+            self.coordinator.data.smart_solar.battery_voltage
         ) * Decimal(0.001).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
 
 
 class BatteryCurrentSensor(BatteryEntity, SensorEntity):
     """Battery voltage sensor"""
 
+    record_fields = ("battery_current",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Battery current"
@@ -92,17 +112,18 @@ class BatteryCurrentSensor(BatteryEntity, SensorEntity):
         return super().unique_id + "I"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = (
-            Decimal(self.coordinator.smart_solar.battery_current) * Decimal(0.001)
+            Decimal(self.coordinator.data.smart_solar.battery_current) * Decimal(0.001)
         ).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
 
 
 class PowerToBattSensor(BatteryEntity, SensorEntity):
     """Calculated power sensor"""
 
+    record_fields = ("battery_voltage", "battery_current")
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Battery in power"
@@ -114,22 +135,19 @@ class PowerToBattSensor(BatteryEntity, SensorEntity):
         return super().unique_id + "PIB"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _v = Decimal(self.coordinator.smart_solar.battery_voltage) * Decimal(0.001)
-        _i = Decimal(self.coordinator.smart_solar.battery_current) * Decimal(0.001)
-
-        if _i > Decimal(0):
-            self._attr_native_value = (_v * _i).quantize(Decimal("1.000"))
-        else:
-            self._attr_native_value = Decimal(0)
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.battery_in_power
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
 
 
 class PowerFromBattSensor(BatteryEntity, SensorEntity):
     """Calculated power sensor"""
 
+    record_fields = ("battery_voltage", "battery_current")
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Battery out power"
@@ -141,24 +159,19 @@ class PowerFromBattSensor(BatteryEntity, SensorEntity):
         return super().unique_id + "POB"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _v = Decimal(self.coordinator.smart_solar.battery_voltage) * Decimal(0.001)
-        _i = Decimal(self.coordinator.smart_solar.battery_current) * Decimal(0.001)
-
-        if _i < Decimal(0):
-            self._attr_native_value = (_v * _i * Decimal(-1.0)).quantize(
-                Decimal("1.000")
-            )
-        else:
-            self._attr_native_value = Decimal(0)
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.battery_out_power
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
 
 
 class BatteryStateBinarySensor(BatteryEntity, BinarySensorEntity):
     """battery state binary_sensor class."""
 
+    record_fields = ("battery_current",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Battery is charging"
@@ -169,69 +182,132 @@ class BatteryStateBinarySensor(BatteryEntity, BinarySensorEntity):
         return super().unique_id + "BS"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _i = Decimal(self.coordinator.smart_solar.battery_current)
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _i = Decimal(self.coordinator.data.smart_solar.battery_current)
 
         if _i > Decimal(0):
             self._attr_is_on = True
         else:
             self._attr_is_on = False
 
-        self.async_write_ha_state()
-
 
 class BatteryPerCentSensor(BatteryEntity, SensorEntity):
     """% of battery capacity"""
 
+    record_fields = ("battery_voltage", "battery_current")
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Battery left"
         self._attr_device_class = DEVICE_CLASS_BATTERY
         self._attr_native_unit_of_measurement = "%"
+        self._resting_voltage = None
+        # the voltage curves are compensated with the battery temperature
+        if BATTERY_TEMPERATURE_ADC_CHANNEL is not None:
+            self.data_keys |= {adc_key(BATTERY_TEMPERATURE_ADC_CHANNEL)}
 
     @property
     def unique_id(self):
         return super().unique_id + "BPC"
 
+    @property
+    def available(self):
+        """Return True once the battery voltage is known."""
+        return super().available and self.coordinator.data.battery is not None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        _attributes = super().extra_state_attributes
+        _attributes["profile"] = self.coordinator.soc_engine.profile.name
+        if self._resting_voltage is not None:
+            _attributes["resting_voltage"] = round(self._resting_voltage / 1000, 3)
+        return _attributes
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _battery = self.coordinator.data.battery
+        self._resting_voltage = _battery.resting_voltage
+        self._attr_native_value = Decimal(_battery.voltage_soc).quantize(Decimal("1.0"))
+
+
+class BatteryCounterEntity(BatteryEntity, SensorEntity):
+    """Sensor of the coulomb counter, integrated at every refresh"""
+
+    record_fields = None
+
+    @property
+    def available(self):
+        """Return True once the battery current is known."""
+        return (
+            super().available
+            and self.coordinator.data.battery is not None
+            and self.coordinator.data.battery.soc is not None
+        )
+
+
+class BatteryChargeSensor(BatteryCounterEntity):
+    """% of battery capacity counted from the current"""
+
+    state_deadband = 0.1
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Battery charge"
+        self._attr_device_class = DEVICE_CLASS_BATTERY
+        self._attr_native_unit_of_measurement = "%"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "SOC"
+
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _data = [
-            (Decimal(9.0), Decimal(0.0)),
-            (Decimal(10.0), Decimal(20.0)),
-            (Decimal(11.0), Decimal(40.0)),
-            (Decimal(12.0), Decimal(60.0)),
-            (Decimal(13.0), Decimal(80.0)),
-            (Decimal(14.0), Decimal(100.0)),
-            (Decimal(15.0), Decimal(120.0)),
-        ]
-
-        _min_voltage, _min_per_cent = _data[0]
-        _voltage = Decimal(self.coordinator.smart_solar.battery_voltage) * Decimal(
-            0.001
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(self.coordinator.data.battery.soc).quantize(
+            Decimal("1.0")
         )
 
-        self._attr_native_value = Decimal(0)
-
-        if _voltage >= _min_voltage:
-            for _v, _per_cent in _data:
-                if _voltage == _v:
-                    self._attr_native_value = _per_cent.quantize(Decimal("1.0"))
-
-                elif _voltage < _v:
-                    self._attr_native_value = self._scale(
-                        _voltage, (_v, _per_cent), (_min_voltage, _min_per_cent)
-                    ).quantize(Decimal("1.0"))
-                else:
-                    _min_voltage = _v
-                    _min_per_cent = _per_cent
-
-        self.async_write_ha_state()
-
-    def _scale(self, x, upper, lower):
-        _x1, _y1 = lower
-        _x2, _y2 = upper
-        _m = (_y2 - _y1) / (_x2 - _x1)
-        _n = _m * _x1 - _y1
-        return x * _m - _n
+
+class BatteryTimeToEmptySensor(BatteryCounterEntity):
+    """Minutes left at the present discharge current"""
+
+    state_deadband = 1.0
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Battery time to empty"
+        self._attr_native_unit_of_measurement = TIME_MINUTES
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "TTE"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _seconds = self.coordinator.data.battery.time_to_empty
+        self._attr_native_value = None if _seconds is None else round(_seconds / 60)
+
+
+class BatteryTimeToFullSensor(BatteryCounterEntity):
+    """Minutes to full charge at the present charge current"""
+
+    state_deadband = 1.0
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Battery time to full"
+        self._attr_native_unit_of_measurement = TIME_MINUTES
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "TTF"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _seconds = self.coordinator.data.battery.time_to_full
+        self._attr_native_value = None if _seconds is None else round(_seconds / 60)
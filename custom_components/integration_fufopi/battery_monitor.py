@@ -0,0 +1,88 @@
+""" Battery coulomb counter persistence """
+import dataclasses
+import logging
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .battery_soc import BatteryProfile, BatteryState, CoulombCounter
+from .const import DOMAIN
+
+STORAGE_KEY = f"{DOMAIN}.battery_soc"
+STORAGE_VERSION = 1
+# the counter moves every refresh, write it once a minute at most
+STORAGE_SAVE_DELAY = 60
+
+# VE Direct state of operation of a full battery
+FULL_STATE_OF_OPERATION = "Float"
+
+
+class BatteryMonitor:
+    """Coulomb counted state of charge of the battery, kept across restarts.
+
+    The counter is restored from the HA storage, so a restart does not fall
+    back to the voltage state of charge. The time the integration was down is
+    not integrated, the next refresh resumes from the saved charge.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, logger: logging.Logger, profile: BatteryProfile
+    ) -> None:
+        self.logger = logger
+        self.counter = CoulombCounter(profile)
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """restore the state of charge saved by a previous run"""
+        _data = await self._store.async_load()
+        if not _data:
+            return
+
+        if _data.get("profile") != self.counter.profile.name:
+            self.logger.info("Battery profile changed, state of charge reset")
+            return
+        self.counter.soc = _data.get("soc")
+
+    @callback
+    def async_update(
+        self,
+        state: Optional[BatteryState],
+        current: Optional[float],
+        state_of_operation: Optional[str],
+        timestamp: float,
+    ) -> Optional[BatteryState]:
+        """return the battery state completed with the coulomb counter"""
+        if state is None or current is None:
+            return state
+
+        _soc = self.counter.update(
+            timestamp,
+            current,
+            state.voltage_soc,
+            state_of_operation == FULL_STATE_OF_OPERATION,
+        )
+        # a delayed save is postponed by every new call, schedule it once
+        if not self._save_pending:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+            self._save_pending = True
+
+        return dataclasses.replace(
+            state,
+            soc=_soc,
+            time_to_empty=self.counter.time_to_empty(current),
+            time_to_full=self.counter.time_to_full(current),
+        )
+
+    async def async_save(self) -> None:
+        """write the state of charge now, the reloaded entry resumes from it"""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_pending = False
+        return {
+            "profile": self.counter.profile.name,
+            "soc": None if self.counter.soc is None else round(self.counter.soc, 3),
+        }
@@ -0,0 +1,224 @@
+""" Battery state of charge """
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+# reference temperature of the voltage curves, °C
+REFERENCE_TEMPERATURE = 25.0
+
+
+@dataclass(frozen=True)
+class BatteryProfile:
+    """Electrical model of a battery"""
+
+    name: str
+    # Ah
+    capacity: float
+    # resting voltage in mV to state of charge in %, at 25 °C, ascending
+    ocv_curve: Tuple[Tuple[float, float], ...]
+    # mΩ, the drop under load is removed from the measured voltage
+    internal_resistance: float
+    # drift of the resting voltage, mV/°C
+    temperature_coefficient: float
+    # discharge time the capacity is rated at, h
+    rated_hours: float = 20.0
+    # capacity lost at higher discharge currents
+    peukert_exponent: float = 1.0
+    # share of the charge current that ends up stored
+    charge_efficiency: float = 1.0
+
+
+# 6GFM100G: capacity, internal resistance and Peukert exponent (100 h and 1 h
+# rates) are the ones of the datasheet, which has no resting voltage table, the
+# curve is the usual one of 12 V gel cells
+ELEKSOL_GEL_100AH = BatteryProfile(
+    name="Eleksol 6GFM100G gel",
+    capacity=100.0,
+    ocv_curve=(
+        (11800.0, 0.0),
+        (12000.0, 20.0),
+        (12200.0, 40.0),
+        (12400.0, 60.0),
+        (12600.0, 80.0),
+        (12850.0, 100.0),
+    ),
+    internal_resistance=4.6,
+    # 0.2 mV/°C per cell
+    temperature_coefficient=1.2,
+    rated_hours=100.0,
+    peukert_exponent=1.15,
+    charge_efficiency=0.9,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryState:
+    """Battery figures of one refresh"""
+
+    # measured voltage corrected to rest at 25 °C, mV
+    resting_voltage: float
+    # state of charge from the resting voltage, %
+    voltage_soc: float
+    # state of charge from the coulomb counter, %
+    soc: Optional[float] = None
+    # at the current of the refresh, s, None when not discharging / charging
+    time_to_empty: Optional[float] = None
+    time_to_full: Optional[float] = None
+
+
+class SoCEngine:
+    """Evaluate the state of charge curve of a battery profile.
+
+    The curve is compiled once into arrays, a lookup is a single interpolation
+    clamped to the ends of the curve.
+    """
+
+    def __init__(self, profile: BatteryProfile) -> None:
+        self.profile = profile
+        self._voltages = np.array([_v for _v, _ in profile.ocv_curve], dtype=float)
+        self._socs = np.array([_soc for _, _soc in profile.ocv_curve], dtype=float)
+        if np.any(np.diff(self._voltages) <= 0):
+            raise ValueError(f"Voltages of {profile.name} are not ascending")
+
+    def resting_voltage(
+        self, voltage: float, current: float = 0.0, temperature: Optional[float] = None
+    ) -> float:
+        """return the voltage in mV the battery would have at rest at 25 °C
+
+        current is in mA, positive while charging, as in VE Direct.
+        """
+        # mA × mΩ = µV
+        _voltage = voltage - current * self.profile.internal_resistance / 1000.0
+        if temperature is not None:
+            _voltage -= self.profile.temperature_coefficient * (
+                temperature - REFERENCE_TEMPERATURE
+            )
+        return _voltage
+
+    def voltage_soc(
+        self, voltage: float, current: float = 0.0, temperature: Optional[float] = None
+    ) -> float:
+        """return the state of charge in % of a measured voltage in mV"""
+        return float(
+            np.interp(
+                self.resting_voltage(voltage, current, temperature),
+                self._voltages,
+                self._socs,
+            )
+        )
+
+    def state(
+        self,
+        voltage: Optional[float],
+        current: Optional[float],
+        temperature: Optional[float] = None,
+    ) -> Optional[BatteryState]:
+        """return the battery state of a VE Direct record, None without voltage"""
+        if voltage is None:
+            return None
+
+        _resting = self.resting_voltage(voltage, current or 0.0, temperature)
+        return BatteryState(
+            resting_voltage=_resting,
+            voltage_soc=float(np.interp(_resting, self._voltages, self._socs)),
+        )
+
+
+class CoulombCounter:
+    """State of charge integrated from the battery current.
+
+    Every refresh adds the charge of the elapsed interval, with the mean of
+    the current at both ends, so a sample costs the same whatever the history.
+    Charge currents are derated by the charge efficiency, discharge currents
+    raised by Peukert's law. The drift is corrected to 100 % when the charger
+    floats, and slowly pulled to the voltage state of charge after the battery
+    rested for rest_time.
+    """
+
+    def __init__(
+        self,
+        profile: BatteryProfile,
+        rest_current: float = 500.0,
+        rest_time: float = 1800.0,
+        rest_gain: float = 0.02,
+        max_gap: float = 60.0,
+    ) -> None:
+        self.profile = profile
+        # mA below which the battery is resting
+        self.rest_current = rest_current
+        self.rest_time = rest_time
+        # share of the voltage error corrected per refresh at rest
+        self.rest_gain = rest_gain
+        # longer intervals are not integrated, the current is not known
+        self.max_gap = max_gap
+        self.soc: Optional[float] = None
+        self._last: Optional[Tuple[float, float]] = None
+        self._rest_since: Optional[float] = None
+
+    def update(
+        self, timestamp: float, current: float, voltage_soc: float, full: bool
+    ) -> float:
+        """return the state of charge in % after a refresh
+
+        timestamp is a time.monotonic(), current in mA positive while charging.
+        A sample not newer than the previous one, a record of the charger
+        that did not send any block since, is not counted again.
+        """
+        if self._last is not None and timestamp <= self._last[0]:
+            return self.soc
+
+        if self.soc is None:
+            self.soc = voltage_soc
+
+        if self._last is not None:
+            _last_timestamp, _last_current = self._last
+            _elapsed = timestamp - _last_timestamp
+            if 0 < _elapsed <= self.max_gap:
+                self.soc += self._charge((current + _last_current) / 2, _elapsed)
+        self._last = (timestamp, current)
+
+        if abs(current) >= self.rest_current:
+            self._rest_since = None
+        elif self._rest_since is None:
+            self._rest_since = timestamp
+
+        if full:
+            self.soc = 100.0
+        elif (
+            self._rest_since is not None
+            and timestamp - self._rest_since >= self.rest_time
+        ):
+            self.soc += self.rest_gain * (voltage_soc - self.soc)
+
+        self.soc = min(100.0, max(0.0, self.soc))
+        return self.soc
+
+    def time_to_empty(self, current: float) -> Optional[float]:
+        """return the seconds left at a discharge current in mA"""
+        if self.soc is None or current > -self.rest_current:
+            return None
+        _left = self.soc / 100.0 * self.profile.capacity
+        return _left / self._discharge_current(-current / 1000.0) * 3600.0
+
+    def time_to_full(self, current: float) -> Optional[float]:
+        """return the seconds to full at a charge current in mA"""
+        if self.soc is None or current < self.rest_current:
+            return None
+        _missing = (100.0 - self.soc) / 100.0 * self.profile.capacity
+        _stored = current / 1000.0 * self.profile.charge_efficiency
+        return _missing / _stored * 3600.0
+
+    def _charge(self, current: float, elapsed: float) -> float:
+        """return the state of charge in % added by a mean current in mA"""
+        _amps = current / 1000.0
+        if _amps >= 0:
+            _amps *= self.profile.charge_efficiency
+        else:
+            _amps = -self._discharge_current(-_amps)
+        return _amps * elapsed / 3600.0 / self.profile.capacity * 100.0
+
+    def _discharge_current(self, amps: float) -> float:
+        """return the current the capacity is drained at, Peukert's law"""
+        _rated = self.profile.capacity / self.profile.rated_hours
+        return amps * (amps / _rated) ** (self.profile.peukert_exponent - 1.0)
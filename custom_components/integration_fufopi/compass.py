@@ -0,0 +1,187 @@
+"""Orientation of the box, from the ADXL345 and the HMC5883L"""
+from decimal import Decimal
+
+from homeassistant.core import callback
+from homeassistant.const import DEGREE
+
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.switch import SwitchEntity
+
+from .const import DOMAIN, ATTRIBUTION
+from .entity import FufoPiEntity
+
+
+def add_compass_sensors(sensors, coordinator, config_entry):
+    """add sensors, pitch and roll need the ADXL345, the heading both sensors"""
+    if coordinator.i2c_adxl345 is None:
+        return
+
+    sensors.append(CompassPitchSensor(coordinator, config_entry))
+    sensors.append(CompassRollSensor(coordinator, config_entry))
+
+    if coordinator.i2c_hcm5883 is not None:
+        sensors.append(CompassHeadingSensor(coordinator, config_entry))
+
+
+def add_compass_switches(switches, coordinator, config_entry):
+    """add the calibration switch, if the HMC5883L was found"""
+    if coordinator.i2c_hcm5883 is not None:
+        switches.append(CompassCalibrationSwitch(coordinator, config_entry))
+
+
+class CompassEntity(FufoPiEntity):
+    """Orientation base entity"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator)
+        self.config_entry = config_entry
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return self.config_entry.entry_id + "compass"
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, "compass")},
+            "name": "Compass",
+            "model": "ADXL345 + HMC5883L",
+            "manufacturer": "FufoPi",
+        }
+
+    @property
+    def available(self):
+        """Return True if the accelerometer answered in the last refresh."""
+        return super().available and self.coordinator.data.orientation is not None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        return {
+            "attribution": ATTRIBUTION,
+            "id": self.unique_id,
+            "integration": DOMAIN,
+        }
+
+
+class CompassPitchSensor(CompassEntity, SensorEntity):
+    """pitch sensor, nose up is positive"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Pitch"
+        self._attr_native_unit_of_measurement = DEGREE
+        self._attr_icon = "mdi:angle-acute"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "pitch"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.orientation.pitch
+        ).quantize(Decimal("1.0"))
+
+
+class CompassRollSensor(CompassEntity, SensorEntity):
+    """roll sensor, right side down is positive"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Roll"
+        self._attr_native_unit_of_measurement = DEGREE
+        self._attr_icon = "mdi:angle-acute"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "roll"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.orientation.roll
+        ).quantize(Decimal("1.0"))
+
+
+class CompassHeadingSensor(CompassEntity, SensorEntity):
+    """tilt compensated magnetic heading sensor"""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Heading"
+        self._attr_native_unit_of_measurement = DEGREE
+        self._attr_icon = "mdi:compass"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "heading"
+
+    @property
+    def available(self):
+        """Return True if the magnetometer answered too."""
+        return (
+            super().available and self.coordinator.data.orientation.heading is not None
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        _attributes = super().extra_state_attributes
+        _attributes["calibrated"] = self.coordinator.compass_calibration.calibrated
+        return _attributes
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.orientation.heading
+        ).quantize(Decimal("1.0"))
+
+
+class CompassCalibrationSwitch(CompassEntity, SwitchEntity):
+    """Compass calibration switch, on while the sweep is collected."""
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Compass calibration"
+        self._attr_icon = "mdi:compass-rose"
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return super().unique_id + "calibration"
+
+    @property
+    def available(self):
+        """Return True if the magnetometer answered in the last refresh."""
+        # the sweep does not need the accelerometer, skip the orientation check
+        return (
+            super(CompassEntity, self).available
+            and self.coordinator.data.hmc5883 is not None
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        _attributes = super().extra_state_attributes
+        _attributes["samples"] = self.coordinator.compass_calibration.samples
+        _attributes["calibrated"] = self.coordinator.compass_calibration.calibrated
+        return _attributes
+
+    async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
+        """Start collecting the sweep."""
+        self.coordinator.compass_calibration.start_sweep(self.coordinator.i2c_hcm5883)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
+        """Fit and save the calibration."""
+        await self.coordinator.compass_calibration.async_finish_sweep()
+        await self.coordinator.async_request_refresh()
+
+    @property
+    def is_on(self) -> bool:
+        return self.coordinator.compass_calibration.sweeping
@@ -0,0 +1,112 @@
+""" HMC5883L hard and soft iron calibration """
+import asyncio
+from collections import deque
+import logging
+from typing import Deque, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .orientation import MagCalibration, fit_ellipsoid
+
+STORAGE_KEY = f"{DOMAIN}.compass_calibration"
+STORAGE_VERSION = 1
+
+
+class CompassCalibration:
+    """Magnetometer calibration, fitted on a sweep and saved to the HA storage.
+
+    While sweeping every new burst read of the HMC5883L is collected, the box
+    has to be turned through as many orientations as possible. The fit runs in
+    the executor when the sweep is finished.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, logger: logging.Logger, max_samples: int = 2000
+    ) -> None:
+        self.hass = hass
+        self.logger = logger
+        self.calibration = MagCalibration()
+        # True once a fitted calibration is in use
+        self.calibrated = False
+        self._samples: Deque[Tuple[float, float, float]] = deque(maxlen=max_samples)
+        self._task = None
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+
+    @property
+    def sweeping(self) -> bool:
+        """return True while collecting samples"""
+        return self._task is not None
+
+    @property
+    def samples(self) -> int:
+        """return the number of samples of the current sweep"""
+        return len(self._samples)
+
+    async def async_load(self) -> None:
+        """restore the calibration saved by a previous run"""
+        _data = await self._store.async_load()
+        if not _data:
+            return
+
+        self.calibration = MagCalibration(
+            hard_iron=tuple(_data["hard_iron"]),
+            soft_iron=tuple(tuple(_row) for _row in _data["soft_iron"]),
+        )
+        self.calibrated = True
+
+    def start_sweep(self, hmc) -> None:
+        """start collecting the readings of the magnetometer"""
+        self.stop_sweep()
+        self._samples.clear()
+        self._task = self.hass.loop.create_task(self._async_sweep(hmc))
+
+    def stop_sweep(self) -> None:
+        """stop collecting, without fitting"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def async_finish_sweep(self) -> bool:
+        """stop collecting and fit the samples, return True if it fitted"""
+        self.stop_sweep()
+
+        _calibration = await self.hass.async_add_executor_job(
+            fit_ellipsoid, list(self._samples)
+        )
+        if _calibration is None:
+            self.logger.warning(
+                f"Compass calibration failed with {self.samples} samples, "
+                "the sweep has to cover all the orientations"
+            )
+            return False
+
+        self.calibration = _calibration
+        self.calibrated = True
+        await self._store.async_save(
+            {
+                "hard_iron": list(_calibration.hard_iron),
+                "soft_iron": [list(_row) for _row in _calibration.soft_iron],
+            }
+        )
+        return True
+
+    async def _async_sweep(self, hmc) -> None:
+        _last = None
+        while True:
+            try:
+                # paced by the data ready wait of the burst read
+                _vector = await hmc.async_read_vector()
+            except OSError as err:
+                self.logger.warning(f"HMC5883L read failed: {err}")
+                await asyncio.sleep(1)
+                continue
+
+            if _vector == _last or None in _vector:
+                # idle or saturated, nothing new to collect
+                await asyncio.sleep(0.1)
+                continue
+
+            self._samples.append(_vector)
+            _last = _vector
@@ -29,6 +29,41 @@ CONF_PASSWORD = "password"
 # Defaults
 DEFAULT_NAME = DOMAIN
 
+# Nox fans: BOARD pin, PWM backend ("pigpio" or "rpi_gpio"), frequency in Hz and
+# BOARD pin of the tachometer, None for 2 and 3 wire fans without it
+NOX_FANS = ((15, "pigpio", 25000, None),)
+# Automatic fan control: (°C, duty %) points of the curve, hysteresis in °C
+# and period in s
+NOX_FAN_CURVE = ((45.0, 0.0), (50.0, 30.0), (65.0, 60.0), (75.0, 100.0))
+NOX_FAN_HYSTERESIS = 3.0
+NOX_FAN_INTERVAL = 5.0
+# ADS1115 channel of an enclosure temperature sensor (LM35, 10 mV/°C), None to
+# follow the CPU temperature only
+NOX_FAN_ADC_CHANNEL = None
+NOX_FAN_ADC_MV_PER_DEGREE = 10.0
+# ADS1115 channel of a battery temperature sensor (LM35, 10 mV/°C), None to
+# use the curves at 25 °C
+BATTERY_TEMPERATURE_ADC_CHANNEL = None
+BATTERY_TEMPERATURE_MV_PER_DEGREE = 10.0
+# Host of the pigpio daemon, None for localhost
+PIGPIO_HOST = None
+
+# Bands of the vibration spectrum sensors, in Hz
+VIBRATION_BANDS = ((0, 20), (20, 60), (60, 120), (120, 200))
+
+# Energy sensors by integrated channel, lane_<n> is the power lane on relay n
+ENERGY_CHANNELS = {
+    "battery_in": "Battery in energy",
+    "battery_out": "Battery out energy",
+    "load": "Load energy",
+    "rpi": "Rpi energy",
+    "fridge": "Fridge energy",
+    "lane_0": "Power 1 energy",
+    "lane_1": "Power 2 energy",
+    "lane_2": "Power 3 energy",
+    "lane_3": "Power 4 energy",
+}
+
 
 STARTUP_MESSAGE = f"""
 -------------------------------------------------------------------
@@ -40,6 +75,7 @@ If you have any issues with this you need to open an issue here:
 -------------------------------------------------------------------
 """
 PID_VALUE_LIST = {"0xA060": "SmartSolar MPPT 100|20 48V"}
+
 CS_VALUE_LIST = {
     "0": "Off",
     "2": "Fault",
@@ -56,8 +92,15 @@ CS_VALUE_LIST = {
     "248": "BatterySafe",
     "252": "External Control",
 }
+
+MPPT_VALUE_LIST = {
+    "0": "Off",
+    "1": "Voltage or current limited",
+    "2": "MPP Tracker active",
+}
+
 OR_VALUE_LIST = {
-    "0x00000000": "No reason", 
+    "0x00000000": "No reason",
     "0x00000001": "No input power",
     "0x00000002": "Switched off (power switch)",
     "0x00000004": "Switched off (device mode register) ",
@@ -69,8 +112,25 @@ OR_VALUE_LIST = {
     "0x00000100": "Analysing input voltage",
 }
 
-MPPT_VALUE_LIST = {
-    "0": "Off",
-    "1": "Voltage or current limited",
-    "2": "MPP Tracker active",
+ERR_VALUE_LIST = {
+    "0": "No error",
+    "2": "Battery voltage too high",
+    "17": "Charger temperature too high",
+    "18": "Charger over current",
+    "19": "Charger current reversed",
+    "20": "Bulk time limit exceeded",
+    "21": "Current sensor issue (sensor bias/sensor broken)",
+    "26": "Terminals overheated",
+    "28": "Converter issue (dual converter models only)",
+    "33": "Input voltage too high (solar panel)",
+    "34": "Input current too high (solar panel)",
+    "38": "Input shutdown (due to excessive battery voltage)",
+    "39": "Input shutdown (due to current flow during off mode)",
+    "65": "Lost communication with one of devices",
+    "66": "Synchronised charging device configuration issue",
+    "67": "BMS connection lost",
+    "68": "Network misconfigured",
+    "116": "Factory calibration data lost",
+    "117": "Invalid/incompatible firmware",
+    "119": "User settings invalid",
 }
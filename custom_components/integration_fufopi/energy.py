@@ -0,0 +1,53 @@
+""" Energy totals """
+from decimal import Decimal
+
+from homeassistant.core import callback
+
+from homeassistant.const import (
+    DEVICE_CLASS_ENERGY,
+    ENERGY_KILO_WATT_HOUR,
+)
+
+from homeassistant.components.sensor import SensorEntity, STATE_CLASS_TOTAL_INCREASING
+
+from .const import DOMAIN, ENERGY_CHANNELS
+from .entity import FufoPiEntity
+
+
+def add_energy_sensors(sensors, coordinator, config_entry):
+    """Add devices"""
+    for _channel, _name in ENERGY_CHANNELS.items():
+        sensors.append(EnergySensor(coordinator, config_entry, _channel, _name))
+
+
+class EnergySensor(FufoPiEntity, SensorEntity):
+    """Energy integrated by the coordinator, moving at every refresh"""
+
+    def __init__(self, coordinator, config_entry, channel, name):
+        super().__init__(coordinator)
+        self.config_entry = config_entry
+        self._channel = channel
+        self._attr_name = name
+        self._attr_state_class = STATE_CLASS_TOTAL_INCREASING
+        self._attr_device_class = DEVICE_CLASS_ENERGY
+        self._attr_native_unit_of_measurement = ENERGY_KILO_WATT_HOUR
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return self.config_entry.entry_id + "energy" + self._channel
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self.config_entry.entry_id + "energy")},
+            "name": "Energy meter",
+            "manufacturer": "Ermenda",
+        }
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = (
+            Decimal(self.coordinator.data.energy[self._channel]) / 1000
+        ).quantize(Decimal("1.000"))
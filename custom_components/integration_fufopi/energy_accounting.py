@@ -0,0 +1,66 @@
+""" Energy totals persistence """
+import logging
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .energy_meter import EnergyMeter
+
+STORAGE_KEY = f"{DOMAIN}.energy"
+STORAGE_VERSION = 1
+# the totals move every refresh, flush them in batches
+STORAGE_SAVE_DELAY = 300
+
+
+class EnergyAccounting:
+    """Energy totals of the lanes, loads and battery, kept across restarts.
+
+    The totals are only ever restored from the HA storage and added to, so
+    a restart can lose the energy of the last unsaved batch at worst, never
+    count it twice.
+    """
+
+    def __init__(self, hass: HomeAssistant, logger: logging.Logger, channels) -> None:
+        self.logger = logger
+        self.meter = EnergyMeter(channels)
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """restore the totals saved by a previous run"""
+        _data = await self._store.async_load()
+        if not _data:
+            return
+
+        self.meter.restore(_data.get("totals", {}))
+
+    @callback
+    def async_update(
+        self, powers: Mapping[str, Optional[float]], timestamp: float
+    ) -> Mapping[str, float]:
+        """return the totals in Wh after adding the powers of a refresh"""
+        self.meter.update(timestamp, powers)
+
+        # a delayed save is postponed by every new call, schedule it once
+        if not self._save_pending:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+            self._save_pending = True
+
+        return MappingProxyType(dict(self.meter.totals))
+
+    async def async_save(self) -> None:
+        """write the totals now, the reloaded entry resumes from them"""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_pending = False
+        return {
+            "totals": {
+                _channel: round(_total, 4)
+                for _channel, _total in self.meter.totals.items()
+            }
+        }
@@ -0,0 +1,49 @@
+""" Energy integration """
+from typing import Dict, Mapping, Optional, Tuple
+
+
+class EnergyMeter:
+    """Energy totals integrated from the powers of each refresh.
+
+    Every channel keeps its last sample only, the energy of an interval is the
+    trapezoid between the powers at both ends. Intervals longer than max_gap,
+    or with a missing power at one end, are not integrated: the energy drawn
+    while nothing was measured is not guessed, and a restart resumes from the
+    saved totals without counting the down time.
+    """
+
+    def __init__(self, channels, max_gap: float = 60.0) -> None:
+        self.channels = tuple(channels)
+        self.max_gap = max_gap
+        # Wh by channel
+        self.totals: Dict[str, float] = {_channel: 0.0 for _channel in self.channels}
+        self._last: Dict[str, Tuple[float, float]] = {}
+
+    def restore(self, totals: Mapping[str, float]) -> None:
+        """restore the totals of a previous run, unknown channels are dropped"""
+        for _channel, _total in totals.items():
+            if _channel in self.totals:
+                self.totals[_channel] = float(_total)
+        self._last.clear()
+
+    def update(self, timestamp: float, powers: Mapping[str, Optional[float]]) -> None:
+        """add the energy since the previous refresh, powers in W
+
+        timestamp is a time.monotonic(), negative powers count as 0.
+        """
+        for _channel in self.channels:
+            _power = powers.get(_channel)
+            if _power is None:
+                self._last.pop(_channel, None)
+                continue
+
+            _power = max(_power, 0.0)
+            _last = self._last.get(_channel)
+            self._last[_channel] = (timestamp, _power)
+            if _last is None:
+                continue
+
+            _last_timestamp, _last_power = _last
+            _elapsed = timestamp - _last_timestamp
+            if 0 < _elapsed <= self.max_gap:
+                self.totals[_channel] += (_power + _last_power) / 2 * _elapsed / 3600
@@ -1,9 +1,89 @@
 """BlueprintEntity class"""
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, PID_VALUE_LIST, VERSION, ATTRIBUTION
 
 
+class FufoPiEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when it changed.
+
+    Subclasses compute their attributes in ``_async_update_attrs``, the state
+    is then compared with the last one written and the write is skipped when
+    nothing changed. Numeric states may also ignore changes smaller than
+    ``state_deadband``. Entities setting ``data_keys`` are not updated at all
+    when none of those coordinator keys changed in the refresh.
+    """
+
+    state_deadband = None
+    data_keys = None
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator)
+        self._written_state = None
+
+    @property
+    def available(self) -> bool:
+        """Return False until the coordinator built its first snapshot.
+
+        Subclasses reading the snapshot in their own ``available`` build on
+        this one.
+        """
+        return super().available and self.coordinator.data is not None
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._inputs_unchanged():
+            return
+
+        # optional sensors may be missing from the data
+        if self.available:
+            self._async_update_attrs()
+        self.async_write_ha_state_if_changed()
+
+    def _inputs_unchanged(self) -> bool:
+        if self.data_keys is None or self._written_state is None:
+            return False
+
+        # availability is not part of the data, always honour its changes
+        if self.available != self._written_state[0]:
+            return False
+
+        _changed = self.coordinator.data.changed_keys
+        return _changed is not None and _changed.isdisjoint(self.data_keys)
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state only if it differs from the last one written"""
+        _state = (self.available, self.state, self.extra_state_attributes)
+
+        if self._written_state is not None and self._is_unchanged(_state):
+            return
+
+        self._written_state = _state
+        self.async_write_ha_state()
+
+    def _is_unchanged(self, state) -> bool:
+        _available, _value, _attributes = state
+        _old_available, _old_value, _old_attributes = self._written_state
+
+        if _available != _old_available or _attributes != _old_attributes:
+            return False
+
+        if self.state_deadband is not None:
+            try:
+                return abs(float(_value) - float(_old_value)) < self.state_deadband
+            except (TypeError, ValueError):
+                pass
+
+        return _value == _old_value
+
+
 class VEDirectEntity(CoordinatorEntity):
     """VE Direct base entity"""
 
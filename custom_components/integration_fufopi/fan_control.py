@@ -0,0 +1,224 @@
+""" Thermal fan control """
+import asyncio
+from bisect import bisect_right
+import logging
+import time
+from typing import Awaitable, Callable, Optional, Sequence, Tuple
+
+from RPi import GPIO
+
+# CPU temperature in millidegrees
+CPU_THERMAL_ZONE = "/sys/class/thermal/thermal_zone0/temp"
+
+TemperatureSource = Callable[[], Awaitable[Optional[float]]]
+
+
+class FanCurve:
+    """Duty cycle from the temperature, interpolated between points.
+
+    The duty goes up as soon as the curve asks for more, but only goes down
+    once the temperature fell hysteresis degrees below the one that set it,
+    so the fan does not hunt around a point.
+    """
+
+    def __init__(
+        self, points: Sequence[Tuple[float, float]], hysteresis: float = 3.0
+    ) -> None:
+        self.temperatures = [_temperature for _temperature, _ in points]
+        self.duties = [_duty for _, _duty in points]
+        self.hysteresis = hysteresis
+        self.duty_cycle: Optional[float] = None
+        self._set_at: Optional[float] = None
+
+    def target(self, temperature: float) -> float:
+        """return the duty cycle of the curve at temperature, 0 to 100"""
+        _index = bisect_right(self.temperatures, temperature)
+        if _index == 0:
+            return self.duties[0]
+        if _index == len(self.temperatures):
+            return self.duties[-1]
+
+        _t0, _t1 = self.temperatures[_index - 1], self.temperatures[_index]
+        _d0, _d1 = self.duties[_index - 1], self.duties[_index]
+        return _d0 + (_d1 - _d0) * (temperature - _t0) / (_t1 - _t0)
+
+    def update(self, temperature: float) -> float:
+        """return the duty cycle to apply at temperature"""
+        _target = self.target(temperature)
+
+        if (
+            self.duty_cycle is None
+            or _target > self.duty_cycle
+            or (
+                _target < self.duty_cycle
+                and temperature <= self._set_at - self.hysteresis
+            )
+        ):
+            self.duty_cycle = _target
+            self._set_at = temperature
+
+        return self.duty_cycle
+
+
+class TachCounter:
+    """Count the tachometer pulses of a fan on a GPIO edge callback"""
+
+    def __init__(self, pin_no: int, pulses_per_revolution: int = 2) -> None:
+        self.pin_no = pin_no
+        self.pulses_per_revolution = pulses_per_revolution
+        # only incremented from the RPi.GPIO thread
+        self._pulses = 0
+        self._last = (0, time.monotonic())
+
+    def start(self) -> None:
+        """start counting"""
+        GPIO.setmode(GPIO.BOARD)
+        GPIO.setup(self.pin_no, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        GPIO.add_event_detect(self.pin_no, GPIO.FALLING, callback=self._on_pulse)
+        self._last = (self._pulses, time.monotonic())
+
+    def stop(self) -> None:
+        """stop counting"""
+        GPIO.remove_event_detect(self.pin_no)
+
+    def rpm(self) -> float:
+        """return the speed since the previous call"""
+        _pulses, _now = self._pulses, time.monotonic()
+        _last_pulses, _last_now = self._last
+        self._last = (_pulses, _now)
+
+        if _now <= _last_now:
+            return 0.0
+        return (
+            (_pulses - _last_pulses)
+            / self.pulses_per_revolution
+            / (_now - _last_now)
+            * 60.0
+        )
+
+    def _on_pulse(self, channel) -> None:  # pylint: disable=unused-argument
+        """called from the RPi.GPIO thread"""
+        self._pulses += 1
+
+
+class FanController:
+    """Run the fan curve on the hottest temperature source at a fixed rate.
+
+    Without any temperature, or when a step fails, the fan is run at full
+    speed, overheating costs more than the noise.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        curve: FanCurve,
+        sources: Sequence[TemperatureSource],
+        set_duty_cycle: Callable[[float], Awaitable[None]],
+        interval: float = 5.0,
+        tach: Optional[TachCounter] = None,
+    ) -> None:
+        self.logger = logger
+        self.curve = curve
+        self.sources = tuple(sources)
+        self.set_duty_cycle = set_duty_cycle
+        self.interval = interval
+        self.tach = tach
+        self.temperature: Optional[float] = None
+        self.rpm: Optional[float] = None
+        self._applied: Optional[float] = None
+        self._task = None
+        self._write: Optional[asyncio.Future] = None
+
+    @property
+    def running(self) -> bool:
+        """return True while the fan is controlled"""
+        return self._task is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """start controlling the fan"""
+        if self._task is not None:
+            return
+        if self.tach is not None:
+            self.tach.start()
+        self._applied = None
+        self._task = loop.create_task(self._async_run())
+
+    def stop(self) -> None:
+        """stop controlling, the fan keeps its last duty cycle"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        if self.tach is not None:
+            self.tach.stop()
+            self.rpm = None
+
+    async def async_stop(self) -> None:
+        """stop controlling once the duty cycle being written, if any, is set"""
+        _task = self._task
+        self.stop()
+        if _task is None:
+            return
+
+        # a write left in flight would land after the next manual duty cycle
+        await asyncio.wait([_task])
+        if self._write is not None:
+            await asyncio.wait([self._write])
+
+    async def async_step(self) -> None:
+        """read the temperatures and apply the duty cycle of the curve"""
+        _temperatures = [
+            _temperature
+            for _temperature in [await _source() for _source in self.sources]
+            if _temperature is not None
+        ]
+
+        if _temperatures:
+            self.temperature = max(_temperatures)
+            _duty_cycle = self.curve.update(self.temperature)
+        else:
+            self.logger.warning("No fan temperature source, running at full speed")
+            self.temperature = None
+            _duty_cycle = 100.0
+
+        if self.tach is not None:
+            self.rpm = self.tach.rpm()
+            if self.rpm == 0 and _duty_cycle > 0 and self._applied:
+                self.logger.warning("Fan stalled, no tachometer pulses")
+
+        if _duty_cycle != self._applied:
+            await self._async_apply(_duty_cycle)
+
+    async def _async_apply(self, duty_cycle: float) -> None:
+        # shielded so a cancelled control leaves a write async_stop can wait for
+        self._write = asyncio.ensure_future(self.set_duty_cycle(duty_cycle))
+        await asyncio.shield(self._write)
+        self._applied = duty_cycle
+
+    async def _async_run(self) -> None:
+        _loop = asyncio.get_running_loop()
+        _next = _loop.time()
+
+        while True:
+            try:
+                await self.async_step()
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("Fan control failed, running at full speed")
+                try:
+                    if self._applied != 100.0:
+                        await self._async_apply(100.0)
+                except Exception as err:  # pylint: disable=broad-except
+                    self.logger.warning(f"Fan full speed failed: {err}")
+
+            # fixed rate, whatever the time the step took
+            _next += self.interval
+            await asyncio.sleep(max(0.0, _next - _loop.time()))
+
+
+def cpu_temperature(path: str = CPU_THERMAL_ZONE) -> Optional[float]:
+    """return the temperature of a thermal zone in °C, None if unreadable"""
+    try:
+        with open(path, encoding="ascii") as _file:
+            return int(_file.read().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
@@ -1,6 +1,5 @@
 from decimal import Decimal
 
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -15,15 +14,24 @@ from homeassistant.components.switch import SwitchEntity, DEVICE_CLASS_OUTLET
 from homeassistant.components.sensor import SensorEntity
 
 from .const import DOMAIN, ATTRIBUTION
+from .entity import FufoPiEntity
+from .power_figures import FRIDGE_RELAY
+from .snapshot import charger_keys, relay_key
 
 
-class FridgeEntity(CoordinatorEntity):
+class FridgeEntity(FufoPiEntity):
     """Power distribution base entity"""
 
+    # record fields of the main charger the entity state is built from
+    record_fields = ()
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator)
         self.config_entry = config_entry
-        self.relay_index = 1
+        self.relay_index = FRIDGE_RELAY
+        self.data_keys = charger_keys(
+            coordinator.smart_solar.charger_id, *self.record_fields
+        ) | {relay_key(self.relay_index)}
 
     @property
     def unique_id(self):
@@ -65,14 +73,12 @@ class FridgePowerSwitch(FridgeEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
         """Turn on the switch."""
         self.coordinator.relay_board.relay[self.relay_index].relay_on()
-        # self._attr_is_on = True
-        # self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
         """Turn off the switch."""
         self.coordinator.relay_board.relay[self.relay_index].relay_off()
-        # self._attr_is_on = False
-        # self.async_write_ha_state()
+        self.async_write_ha_state_if_changed()
 
     @property
     def is_on(self) -> bool | None:
@@ -82,6 +88,8 @@ class FridgePowerSwitch(FridgeEntity, SwitchEntity):
 class FridgeCurrentSensor(FridgeEntity, SensorEntity):
     """Fridge voltage sensor"""
 
+    record_fields = ("load_current",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Fridge current"
@@ -93,22 +101,19 @@ class FridgeCurrentSensor(FridgeEntity, SensorEntity):
         return super().unique_id + "I"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _v = Decimal(self.coordinator.smart_solar.panel_voltage) * Decimal(0.001)
-        _i = Decimal(self.coordinator.smart_solar.load_current) * Decimal(0.001)
-        _i = _i - Decimal(0.5)
-        if self.coordinator.relay_board.relay[self.relay_index].is_on:
-            self._attr_native_value = _i.quantize(Decimal("1.000"))
-        else:
-            self._attr_native_value = Decimal(0)
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.fridge_current
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
 
 
 class FridgePowerSensor(FridgeEntity, SensorEntity):
     """Solar panel power sensor"""
 
+    record_fields = ("battery_voltage", "load_current")
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Fridge power"
@@ -120,13 +125,9 @@ class FridgePowerSensor(FridgeEntity, SensorEntity):
         return super().unique_id + "P"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _v = Decimal(self.coordinator.smart_solar.panel_voltage) * Decimal(0.001)
-        _i = Decimal(self.coordinator.smart_solar.load_current) * Decimal(0.001)
-        _i = _i - Decimal(0.5)
-        if self.coordinator.relay_board.relay[self.relay_index].is_on:
-            self._attr_native_value = (_i * _v).quantize(Decimal("1.000"))
-        else:
-            self._attr_native_value = Decimal(0)
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.fridge_power
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
@@ -8,7 +8,6 @@
 # http://shop.pimoroni.com/products/adafruit-triple-axis-accelerometer
 
 from decimal import Decimal
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -21,9 +20,10 @@ from homeassistant.components.binary_sensor import BinarySensorEntity, DEVICE_CL
 from homeassistant.components.switch import SwitchEntity
 
 from .const import DOMAIN, ATTRIBUTION
+from .entity import FufoPiEntity
 
 
-class HCM5883LEntity(CoordinatorEntity):
+class HCM5883LEntity(FufoPiEntity):
     """HCM5883L base entity"""
 
     def __init__(self, coordinator, config_entry):
@@ -45,6 +45,11 @@ class HCM5883LEntity(CoordinatorEntity):
             "manufacturer": "Honeywell",
         }
 
+    @property
+    def available(self):
+        """Return True if the sensor answered in the last refresh."""
+        return super().available and self.coordinator.data.hmc5883 is not None
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
@@ -74,11 +79,9 @@ class HCM5883LSampleNoSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "sampleno"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = Decimal(self.coordinator.i2c_hcm5883.sample_no)
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(self.coordinator.data.hmc5883.sample_no)
 
 
 class HCM5883LOutputRateSensor(HCM5883LEntity, SensorEntity):
@@ -95,11 +98,9 @@ class HCM5883LOutputRateSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "output_rate"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = Decimal(self.coordinator.i2c_hcm5883.output_rate)
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(self.coordinator.data.hmc5883.output_rate)
 
 
 class HCM5883LMeasureConfigSensor(HCM5883LEntity, SensorEntity):
@@ -114,9 +115,9 @@ class HCM5883LMeasureConfigSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "meas_config"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        val = self.coordinator.i2c_hcm5883.measurement_mode
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        val = self.coordinator.data.hmc5883.measurement_mode
         if val == 0:
             self._attr_native_value = "Normal"
         elif val == 1:
@@ -128,8 +129,6 @@ class HCM5883LMeasureConfigSensor(HCM5883LEntity, SensorEntity):
         else:
             self._attr_native_value = "Invalid"
 
-        self.async_write_ha_state()
-
 
 class HCM5883LRangeSensor(HCM5883LEntity, SensorEntity):
     """range sensor"""
@@ -144,11 +143,9 @@ class HCM5883LRangeSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "range"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.i2c_hcm5883.sensor_range
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.coordinator.data.hmc5883.sensor_range
 
 
 class HCM5883LGainSensor(HCM5883LEntity, SensorEntity):
@@ -164,11 +161,9 @@ class HCM5883LGainSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "gain"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.i2c_hcm5883.gain
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.coordinator.data.hmc5883.gain
 
 
 class HCM5883LResolutionSensor(HCM5883LEntity, SensorEntity):
@@ -184,11 +179,9 @@ class HCM5883LResolutionSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "resolution"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.i2c_hcm5883.resolution
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.coordinator.data.hmc5883.resolution
 
 
 class HCM5883LOperationModeSensor(HCM5883LEntity, SensorEntity):
@@ -203,9 +196,9 @@ class HCM5883LOperationModeSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "op_mode"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        val = self.coordinator.i2c_hcm5883.operating_mode
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        val = self.coordinator.data.hmc5883.operating_mode
         if val == 0:
             self._attr_native_value = "Continuous-Measurement Mode"
         elif val == 1:
@@ -217,8 +210,6 @@ class HCM5883LOperationModeSensor(HCM5883LEntity, SensorEntity):
         else:
             self._attr_native_value = "Invalid"
 
-        self.async_write_ha_state()
-
 
 class HCM5883Li2cHighSpeedBinarySensor(HCM5883LEntity, BinarySensorEntity):
     """HCM5883L i2c hight speed binary_sensor class."""
@@ -232,11 +223,9 @@ class HCM5883Li2cHighSpeedBinarySensor(HCM5883LEntity, BinarySensorEntity):
         return super().unique_id + "i2cHigh"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_is_on = self.coordinator.i2c_hcm5883.i2c_high_speed
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_is_on = self.coordinator.data.hmc5883.i2c_high_speed
 
 
 class HCM5883LLockedBinarySensor(HCM5883LEntity, BinarySensorEntity):
@@ -252,11 +241,9 @@ class HCM5883LLockedBinarySensor(HCM5883LEntity, BinarySensorEntity):
         return super().unique_id + "lock"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_is_on = self.coordinator.i2c_hcm5883.is_locked
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_is_on = self.coordinator.data.hmc5883.is_locked
 
 
 class HCM5883LReadyBinarySensor(HCM5883LEntity, BinarySensorEntity):
@@ -271,11 +258,9 @@ class HCM5883LReadyBinarySensor(HCM5883LEntity, BinarySensorEntity):
         return super().unique_id + "ready"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_is_on = self.coordinator.i2c_hcm5883.is_ready
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_is_on = self.coordinator.data.hmc5883.is_ready
 
 
 class HCM5883LMagXSensor(HCM5883LEntity, SensorEntity):
@@ -292,13 +277,12 @@ class HCM5883LMagXSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "magX"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _mag = self.coordinator.data.hmc5883.mag_x
         self._attr_native_value = (
-            Decimal(self.coordinator.i2c_hcm5883.mag_x)
-        ).quantize(Decimal("1.000"))
-
-        self.async_write_ha_state()
+            None if _mag is None else Decimal(_mag).quantize(Decimal("1.000"))
+        )
 
 
 class HCM5883LMagYSensor(HCM5883LEntity, SensorEntity):
@@ -315,13 +299,12 @@ class HCM5883LMagYSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "magY"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _mag = self.coordinator.data.hmc5883.mag_y
         self._attr_native_value = (
-            Decimal(self.coordinator.i2c_hcm5883.mag_y)
-        ).quantize(Decimal("1.000"))
-
-        self.async_write_ha_state()
+            None if _mag is None else Decimal(_mag).quantize(Decimal("1.000"))
+        )
 
 
 class HCM5883LMagZSensor(HCM5883LEntity, SensorEntity):
@@ -338,13 +321,12 @@ class HCM5883LMagZSensor(HCM5883LEntity, SensorEntity):
         return super().unique_id + "magZ"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _mag = self.coordinator.data.hmc5883.mag_z
         self._attr_native_value = (
-            Decimal(self.coordinator.i2c_hcm5883.mag_z)
-        ).quantize(Decimal("1.000"))
-
-        self.async_write_ha_state()
+            None if _mag is None else Decimal(_mag).quantize(Decimal("1.000"))
+        )
 
 
 class HCM5883LContinuosModeSwitch(HCM5883LEntity, SwitchEntity):
@@ -361,12 +343,14 @@ class HCM5883LContinuosModeSwitch(HCM5883LEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
         """Turn on the switch."""
-        self.coordinator.i2c_hcm5883.operating_mode = 0
+        await self.coordinator.i2c_hcm5883.async_set_operating_mode(0)
+        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
         """Turn off the switch."""
-        self.coordinator.i2c_hcm5883.operating_mode = 1
+        await self.coordinator.i2c_hcm5883.async_set_operating_mode(1)
+        await self.coordinator.async_request_refresh()
 
     @property
     def is_on(self) -> bool | None:
-        return self.coordinator.i2c_hcm5883.operating_mode == 0
+        return self.coordinator.data.hmc5883.operating_mode == 0
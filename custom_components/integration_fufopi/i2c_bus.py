@@ -0,0 +1,119 @@
+""" I2C bus worker """
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Any, Callable, Deque, List, Sequence, Tuple, Union
+
+from smbus2 import SMBus
+
+
+class I2CBusWorker:
+    """Serialise all the transactions of one I2C bus in a dedicated thread.
+
+    The SMBus handle is owned by the worker thread, coroutines queue their
+    transactions and await the result. Transactions queued while the thread is
+    busy are run back to back in a single executor job. Longer sequences, such
+    as sampling loops, run as a job on the SMBus handle between transactions.
+    """
+
+    def __init__(self, bus_no: int) -> None:
+        self.bus_no = bus_no
+        self._bus = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"fufopi_i2c{bus_no}"
+        )
+        self._queue: Deque[Tuple[asyncio.Future, Union[str, Callable], tuple]] = deque()
+        self._lock = threading.Lock()
+        self._draining = False
+
+    async def read_block(self, address: int, register: int, length: int) -> List[int]:
+        """return length bytes read from register"""
+        return await self._submit("read_i2c_block_data", address, register, length)
+
+    async def write_block(self, address: int, register: int, data: Sequence[int]):
+        """write data bytes starting at register"""
+        await self._submit("write_i2c_block_data", address, register, list(data))
+
+    async def read_byte(self, address: int, register: int) -> int:
+        """return the byte read from register"""
+        return await self._submit("read_byte_data", address, register)
+
+    async def write_byte(self, address: int, register: int, value: int):
+        """write one byte to register"""
+        await self._submit("write_byte_data", address, register, value)
+
+    async def run_job(self, job: Callable[..., Any], *args) -> Any:
+        """return job(bus, *args) run in the worker thread on the SMBus handle
+
+        The job holds the bus while it runs, keep it to a few milliseconds.
+        """
+        return await self._submit(job, *args)
+
+    def close(self) -> None:
+        """close the bus once the queued transactions are done"""
+        self._executor.submit(self._close)
+        self._executor.shutdown(wait=False)
+
+    def _submit(self, method: Union[str, Callable], *args) -> asyncio.Future:
+        _loop = asyncio.get_running_loop()
+        _future = _loop.create_future()
+
+        with self._lock:
+            self._queue.append((_future, method, args))
+            if self._draining:
+                return _future
+            self._draining = True
+
+        self._executor.submit(self._drain, _loop)
+        return _future
+
+    def _drain(self, loop: asyncio.AbstractEventLoop) -> None:
+        """run in the worker thread until the queue is empty"""
+        _drained = False
+        try:
+            while True:
+                with self._lock:
+                    if not self._queue:
+                        self._draining = False
+                        _drained = True
+                        return
+                    _batch = list(self._queue)
+                    self._queue.clear()
+
+                _results = []
+                for _future, _method, _args in _batch:
+                    # any error fails its own transaction only, not the queue
+                    try:
+                        if self._bus is None:
+                            self._bus = SMBus(self.bus_no)
+                        if callable(_method):
+                            _result = _method(self._bus, *_args)
+                        else:
+                            _result = getattr(self._bus, _method)(*_args)
+                    except Exception as err:  # pylint: disable=broad-except
+                        _results.append((_future, None, err))
+                    else:
+                        _results.append((_future, _result, None))
+
+                loop.call_soon_threadsafe(self._resolve, _results)
+        finally:
+            # let the next transaction start a new drain whatever happened
+            if not _drained:
+                with self._lock:
+                    self._draining = False
+
+    @staticmethod
+    def _resolve(results) -> None:
+        for _future, _result, _error in results:
+            if _future.done():
+                continue
+            if _error is not None:
+                _future.set_exception(_error)
+            else:
+                _future.set_result(_result)
+
+    def _close(self) -> None:
+        if self._bus is not None:
+            self._bus.close()
+            self._bus = None
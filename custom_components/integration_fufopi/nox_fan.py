@@ -1,8 +1,9 @@
 """ ACS714 """
 from decimal import Decimal
+import logging
+
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
-from RPi import GPIO
 
 from homeassistant.const import (
     ELECTRIC_POTENTIAL_MILLIVOLT,
@@ -12,24 +13,53 @@ from homeassistant.const import (
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    NOX_FAN_ADC_CHANNEL,
+    NOX_FAN_ADC_MV_PER_DEGREE,
+    NOX_FAN_CURVE,
+    NOX_FAN_HYSTERESIS,
+    NOX_FAN_INTERVAL,
+    NOX_FANS,
+    PIGPIO_HOST,
+)
+from .fan_control import FanController, FanCurve, TachCounter, cpu_temperature
+from .pwm import pwm_output
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+PRESET_AUTO = "auto"
 
 
 def add_nox_fan_fans(fans, coordinator, config_entry):
     """Add devices"""
-    fans.append(NoxFanFan(coordinator, config_entry, 15))
+    for _pin_no, _backend, _frequency, _tach_pin in NOX_FANS:
+        fans.append(
+            NoxFanFan(
+                coordinator, config_entry, _pin_no, _backend, _frequency, _tach_pin
+            )
+        )
 
 
 class NoxFanEntity(CoordinatorEntity):
     """Nox fan base entity"""
 
-    def __init__(self, coordinator, config_entry, pin_no):
+    def __init__(self, coordinator, config_entry, pin_no, backend, frequency):
         super().__init__(coordinator)
         self.config_entry = config_entry
         self._pin_no = pin_no
-        GPIO.setmode(GPIO.BOARD)
-        GPIO.setup(self._pin_no, GPIO.OUT)
-        self._pwm = GPIO.PWM(self._pin_no, self.frequency)
+        self._backend = backend
+        self._frequency = frequency
+        self._output = None
+
+    @property
+    def pwm(self):
+        """return the PWM output, opened on first use out of the event loop"""
+        if self._output is None:
+            self._output = pwm_output(
+                self._pin_no, self._frequency, self._backend, PIGPIO_HOST, _LOGGER
+            )
+        return self._output
 
     @property
     def unique_id(self):
@@ -47,38 +77,105 @@ class NoxFanEntity(CoordinatorEntity):
 
     @property
     def frequency(self):
-        """retrun the frequency in Hz"""
-        return 100
+        """return the frequency in Hz, the configured one until the output is open"""
+        if self._output is None:
+            return self._frequency
+        return self._output.frequency
 
 
 class NoxFanFan(NoxFanEntity, FanEntity):
-    """Nox fan fan"""
+    """Nox fan fan, following the temperature in the auto preset"""
 
-    def __init__(self, coordinator, config_entry, pin_no):
-        super().__init__(coordinator, config_entry, pin_no)
+    def __init__(self, coordinator, config_entry, pin_no, backend, frequency, tach_pin):
+        super().__init__(coordinator, config_entry, pin_no, backend, frequency)
         self._attr_name = f"Nox fan {self._pin_no}"
-        self._attr_supported_features = FanEntityFeature.SET_SPEED
+        self._attr_supported_features = (
+            FanEntityFeature.SET_SPEED | FanEntityFeature.PRESET_MODE
+        )
+        self._attr_preset_modes = [PRESET_AUTO]
+        self._attr_preset_mode = PRESET_AUTO
         self._attr_percentage = 0
+        self.controller = FanController(
+            _LOGGER,
+            FanCurve(NOX_FAN_CURVE, NOX_FAN_HYSTERESIS),
+            self._temperature_sources(),
+            self._async_set_duty_cycle,
+            NOX_FAN_INTERVAL,
+            None if tach_pin is None else TachCounter(tach_pin),
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        return {
+            "temperature": self.controller.temperature,
+            "rpm": None if self.controller.rpm is None else round(self.controller.rpm),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Start the automatic control."""
+        await super().async_added_to_hass()
+        if self._attr_preset_mode == PRESET_AUTO:
+            self.controller.start(self.hass.loop)
 
-    def turn_on(
+    async def async_turn_on(
         self,
         percentage: int | None = None,
         preset_mode: str | None = None,
         **kwargs,
     ) -> None:
-        if percentage is None:
-            self._pwm.start(100)
-            self._attr_percentage = 100
+        if preset_mode is not None:
+            await self.async_set_preset_mode(preset_mode)
         else:
-            self._pwm.start(percentage)
-            self._attr_percentage = percentage
-
-    def turn_off(self, **kwargs) -> None:
-        self._pwm.ChangeDutyCycle(0)
-        self._attr_percentage = 0
-        self._pwm.stop()
-
-    def set_percentage(self, percentage: int) -> None:
-        """Set the speed percentage of the fan."""
-        self._pwm.ChangeDutyCycle(percentage)
-        self._attr_percentage = percentage
+            await self.async_set_percentage(100 if percentage is None else percentage)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        await self.async_set_percentage(0)
+
+    async def async_set_percentage(self, percentage: int) -> None:
+        """Set the speed percentage of the fan, leaving the auto preset."""
+        await self.controller.async_stop()
+        self._attr_preset_mode = None
+        await self._async_set_duty_cycle(percentage)
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        """Hand the fan over to the temperature control."""
+        if preset_mode != PRESET_AUTO:
+            raise ValueError(f"Unknown preset mode: {preset_mode}")
+
+        self._attr_preset_mode = PRESET_AUTO
+        self.controller.start(self.hass.loop)
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop the control and the PWM output."""
+        await super().async_will_remove_from_hass()
+        await self.controller.async_stop()
+        if self._output is not None:
+            await self.hass.async_add_executor_job(self._output.stop)
+            self._output = None
+
+    def _temperature_sources(self):
+        _sources = [self._async_cpu_temperature]
+        if NOX_FAN_ADC_CHANNEL is not None:
+            _sources.append(self._async_adc_temperature)
+        return _sources
+
+    async def _async_cpu_temperature(self):
+        return await self.hass.async_add_executor_job(cpu_temperature)
+
+    async def _async_adc_temperature(self):
+        if self.coordinator.data is None:
+            return None
+        _stats = self.coordinator.data.adc[NOX_FAN_ADC_CHANNEL]
+        if _stats is None:
+            return None
+        return _stats.value / NOX_FAN_ADC_MV_PER_DEGREE
+
+    async def _async_set_duty_cycle(self, duty_cycle: float) -> None:
+        # the output is opened in the executor too, pigpio connects on open
+        await self.hass.async_add_executor_job(
+            lambda: self.pwm.set_duty_cycle(duty_cycle)
+        )
+        self._attr_percentage = round(duty_cycle)
+        self.async_write_ha_state()
@@ -0,0 +1,120 @@
+""" Compass calibration and tilt compensated orientation """
+from dataclasses import dataclass
+import math
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# fewer samples can not tell an ellipsoid from noise
+MIN_CALIBRATION_SAMPLES = 50
+
+
+@dataclass(frozen=True, slots=True)
+class MagCalibration:
+    """Hard and soft iron correction of the magnetometer.
+
+    The corrected field is soft_iron @ (raw - hard_iron), the ellipsoid of the
+    raw readings is mapped back to a sphere of the mean field strength.
+    """
+
+    hard_iron: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    soft_iron: Tuple[Tuple[float, float, float], ...] = (
+        (1.0, 0.0, 0.0),
+        (0.0, 1.0, 0.0),
+        (0.0, 0.0, 1.0),
+    )
+
+    def correct(self, mag: Sequence[float]) -> np.ndarray:
+        """return the corrected field vector"""
+        return np.asarray(self.soft_iron) @ (
+            np.asarray(mag, dtype=np.float64) - self.hard_iron
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Orientation:
+    """Orientation of the box, in degrees"""
+
+    # nose up is positive
+    pitch: float
+    # right side down is positive
+    roll: float
+    # magnetic heading 0-360, None without the magnetometer
+    heading: Optional[float]
+
+
+def fit_ellipsoid(samples) -> Optional[MagCalibration]:
+    """return the calibration mapping the samples on a sphere
+
+    Fits the general quadric ax² + by² + cz² + 2dxy + 2exz + 2fyz + 2gx + 2hy
+    + 2iz = 1 with one least squares solve. None if there are not enough
+    samples or they do not describe an ellipsoid, a sweep in a single plane
+    for instance.
+    """
+    _samples = np.asarray(samples, dtype=np.float64)
+    if len(_samples) < MIN_CALIBRATION_SAMPLES:
+        return None
+
+    _x, _y, _z = _samples.T
+    _design = np.column_stack(
+        (_x * _x, _y * _y, _z * _z, 2 * _x * _y, 2 * _x * _z, 2 * _y * _z)
+        + (2 * _x, 2 * _y, 2 * _z)
+    )
+    _coef, *_ = np.linalg.lstsq(_design, np.ones(len(_samples)), rcond=None)
+    _a, _b, _c, _d, _e, _f, _g, _h, _i = _coef
+
+    _quadric = np.array([[_a, _d, _e], [_d, _b, _f], [_e, _f, _c]])
+    _linear = np.array([_g, _h, _i])
+    try:
+        _center = -np.linalg.solve(_quadric, _linear)
+    except np.linalg.LinAlgError:
+        return None
+
+    # (v - center)ᵀ shape (v - center) = 1
+    _shape = _quadric / (1.0 + _center @ _quadric @ _center)
+    _eigenvalues, _eigenvectors = np.linalg.eigh(_shape)
+    if np.any(_eigenvalues <= 0):
+        return None
+
+    # keep the field strength, the geometric mean of the semi-axes
+    _radius = np.prod(_eigenvalues) ** (-1.0 / 6.0)
+    _soft_iron = (
+        _radius * _eigenvectors @ np.diag(np.sqrt(_eigenvalues)) @ _eigenvectors.T
+    )
+
+    return MagCalibration(
+        hard_iron=tuple(float(_val) for _val in _center),
+        soft_iron=tuple(tuple(float(_val) for _val in _row) for _row in _soft_iron),
+    )
+
+
+def orientation(
+    accel: Sequence[float],
+    mag: Optional[Sequence[float]],
+    calibration: MagCalibration,
+) -> Optional[Orientation]:
+    """return the pitch, roll and tilt compensated heading
+
+    Both sensors are expected to be mounted with their axes aligned, x to the
+    front, y to the left and z up. None in free fall, there is no gravity to
+    level with.
+    """
+    _up = np.array(accel, dtype=np.float64)
+    _norm = np.linalg.norm(_up)
+    if _norm == 0:
+        return None
+    _up /= _norm
+
+    _heading = None
+    if mag is not None and None not in mag:
+        # east and north in the sensor frame, whatever its tilt
+        _east = np.cross(calibration.correct(mag), _up)
+        _north = np.cross(_up, _east)
+        if np.any(_east) and np.any(_north):
+            _heading = math.degrees(math.atan2(_east[0], _north[0])) % 360.0
+
+    return Orientation(
+        pitch=math.degrees(math.atan2(_up[0], math.hypot(_up[1], _up[2]))),
+        roll=math.degrees(math.atan2(_up[1], _up[2])),
+        heading=_heading,
+    )
@@ -1,6 +1,5 @@
 from decimal import Decimal
 
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -14,14 +13,23 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.binary_sensor import BinarySensorEntity
 
 from .const import DOMAIN, ATTRIBUTION
+from .entity import FufoPiEntity
+from .power_figures import FRIDGE_RELAY
+from .snapshot import charger_keys, relay_key
 
 
-class PowerDistributionEntity(CoordinatorEntity):
+class PowerDistributionEntity(FufoPiEntity):
     """Power distribution base entity"""
 
+    # record fields of the main charger the entity state is built from
+    record_fields = ()
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator)
         self.config_entry = config_entry
+        self.data_keys = charger_keys(
+            coordinator.smart_solar.charger_id, *self.record_fields
+        )
 
     @property
     def unique_id(self):
@@ -50,6 +58,8 @@ class PowerDistributionEntity(CoordinatorEntity):
 class LoadCurrentSensor(PowerDistributionEntity, SensorEntity):
     """Load current sensor"""
 
+    record_fields = ("load_current",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Load current"
@@ -61,17 +71,18 @@ class LoadCurrentSensor(PowerDistributionEntity, SensorEntity):
         return super().unique_id + "LI"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = (
-            Decimal(self.coordinator.smart_solar.load_current) * Decimal(0.001)
+            Decimal(self.coordinator.data.smart_solar.load_current) * Decimal(0.001)
         ).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
 
 
 class LoadPowerSensor(PowerDistributionEntity, SensorEntity):
     """Calculated power sensor"""
 
+    record_fields = ("battery_voltage", "load_current")
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Load power"
@@ -83,19 +94,19 @@ class LoadPowerSensor(PowerDistributionEntity, SensorEntity):
         return super().unique_id + "LP"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _v = Decimal(self.coordinator.smart_solar.battery_voltage) * Decimal(0.001)
-        _i = Decimal(self.coordinator.smart_solar.load_current) * Decimal(0.001)
-
-        self._attr_native_value = (_v * _i).quantize(Decimal("1.000"))
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.load_power
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
 
 
 class LoadStateBinarySensor(PowerDistributionEntity, BinarySensorEntity):
     """load state binary_sensor class."""
 
+    record_fields = ("load_state",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Load state"
@@ -106,61 +117,57 @@ class LoadStateBinarySensor(PowerDistributionEntity, BinarySensorEntity):
         return super().unique_id + "LS"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
 
-        if self.coordinator.smart_solar.load_state == "ON":
-            self._attr_is_on = True
-        else:
-            self._attr_is_on = False
-
-        self.async_write_ha_state()
+        self._attr_is_on = self.coordinator.data.smart_solar.load_state is True
 
 
 class RpiCurrentSensor(PowerDistributionEntity, SensorEntity):
     """Rpi current sensor"""
 
+    record_fields = ("load_current",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Rpi current"
         self._attr_device_class = DEVICE_CLASS_CURRENT
         self._attr_native_unit_of_measurement = ELECTRIC_CURRENT_AMPERE
+        self.data_keys |= {relay_key(FRIDGE_RELAY)}
 
     @property
     def unique_id(self):
         return super().unique_id + "RpiI"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        if self.coordinator.relay_board.relay[1].is_on:
-            self._attr_native_value = (Decimal(0.5)).quantize(Decimal("1.000"))
-        else:
-            self._attr_native_value = (
-                Decimal(self.coordinator.smart_solar.load_current) * Decimal(0.001)
-            ).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.rpi_current
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
 
 
 class RpiPowerSensor(PowerDistributionEntity, SensorEntity):
     """Calculated power sensor"""
 
+    record_fields = ("battery_voltage", "load_current")
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Rpi power"
         self._attr_device_class = DEVICE_CLASS_POWER
         self._attr_native_unit_of_measurement = POWER_WATT
+        self.data_keys |= {relay_key(FRIDGE_RELAY)}
 
     @property
     def unique_id(self):
         return super().unique_id + "RpiP"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _v = Decimal(self.coordinator.smart_solar.battery_voltage) * Decimal(0.001)
-        _i = Decimal(self.coordinator.smart_solar.load_current) * Decimal(0.001)
-
-        self._attr_native_value = (_v * _i).quantize(Decimal("1.000"))
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.rpi_power
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
@@ -0,0 +1,81 @@
+""" Power figures derived from the VE Direct record """
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from .ve_direct import VEDirectRecord
+
+# relay board output of the fridge, the RPi stays on the load output alone
+# while it is off
+FRIDGE_RELAY = 1
+# A drawn by the RPi from the load output
+RPI_CURRENT = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class PowerFigures:
+    """Powers (W) and currents (A) of one refresh, None when an input is missing"""
+
+    battery_in_power: Optional[float]
+    battery_out_power: Optional[float]
+    load_power: Optional[float]
+    rpi_current: Optional[float]
+    rpi_power: Optional[float]
+    fridge_current: Optional[float]
+    fridge_power: Optional[float]
+    panel_current: Optional[float]
+
+
+def _product(*values: Optional[float]) -> Optional[float]:
+    _result = 1.0
+    for _value in values:
+        if _value is None:
+            return None
+        _result *= _value
+    return _result
+
+
+def power_figures(record: VEDirectRecord, relays: Sequence[bool]) -> PowerFigures:
+    """return the figures of the main charger record, computed once per refresh"""
+    _battery_voltage = (
+        None if record.battery_voltage is None else record.battery_voltage / 1000
+    )
+    _battery_current = (
+        None if record.battery_current is None else record.battery_current / 1000
+    )
+    _load_current = None if record.load_current is None else record.load_current / 1000
+    _panel_voltage = (
+        None if record.panel_voltage is None else record.panel_voltage / 1000
+    )
+
+    _battery_power = _product(_battery_voltage, _battery_current)
+    _fridge_on = relays[FRIDGE_RELAY]
+
+    # the load output feeds both, the RPi and fridge figures add up to it
+    _rpi_current = RPI_CURRENT if _fridge_on else _load_current
+    _fridge_current = None
+    if not _fridge_on:
+        _fridge_current = 0.0
+    elif _load_current is not None:
+        _fridge_current = _load_current - RPI_CURRENT
+
+    _panel_current = None
+    if _panel_voltage is not None and record.panel_power is not None:
+        _panel_current = (
+            record.panel_power / _panel_voltage if _panel_voltage > 0 else 0.0
+        )
+
+    return PowerFigures(
+        battery_in_power=None if _battery_power is None else max(_battery_power, 0.0),
+        battery_out_power=(
+            None if _battery_power is None else max(-_battery_power, 0.0)
+        ),
+        load_power=_product(_battery_voltage, _load_current),
+        rpi_current=_rpi_current,
+        # the load output is fed from the battery, day and night
+        rpi_power=_product(_battery_voltage, _rpi_current),
+        fridge_current=_fridge_current,
+        fridge_power=(
+            0.0 if not _fridge_on else _product(_battery_voltage, _fridge_current)
+        ),
+        panel_current=_panel_current,
+    )
@@ -1,7 +1,6 @@
 """ Power distribution lane """
 from decimal import Decimal
 from homeassistant.core import callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.switch import SwitchEntity, DEVICE_CLASS_OUTLET
 from homeassistant.const import (
@@ -9,37 +8,37 @@ from homeassistant.const import (
     DEVICE_CLASS_CURRENT,
     ELECTRIC_CURRENT_AMPERE,
 )
-from RPi import GPIO
 from .const import DOMAIN
+from .entity import FufoPiEntity
+from .snapshot import adc_key, relay_key
 
 
 def add_power_lane_sensors(sensors, coordinator, config_entry):
     """add sensors"""
-    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 1", 12, 0))
-    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 2", 16, 0))
-    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 3", 18, 0))
-    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 4", 13, 0))
+    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 1", 0, 3))
+    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 2", 1, 2))
+    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 3", 2, 1))
+    sensors.append(PowerLaneCurrentSensor(coordinator, config_entry, "Power 4", 3, 0))
 
 
 def add_power_lane_switches(switches, coordinator, config_entry):
     """add sensors"""
-    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 1", 12, 3))
-    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 2", 16, 2))
-    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 3", 18, 1))
-    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 4", 13, 0))
+    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 1", 0, 3))
+    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 2", 1, 2))
+    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 3", 2, 1))
+    switches.append(PowerLaneSwitch(coordinator, config_entry, "Power 4", 3, 0))
 
 
-class PowerLaneEntity(CoordinatorEntity):
+class PowerLaneEntity(FufoPiEntity):
     """Power lane entity"""
 
-    def __init__(self, coordinator, config_entry, name, relay_pin, channel_no):
+    def __init__(self, coordinator, config_entry, name, relay_index, channel_no):
         super().__init__(coordinator)
         self._name = name
         self._sensor_no = channel_no
-        self._relay_pin = relay_pin
+        # the pins are driven by the relay board of the coordinator
+        self._relay_index = relay_index
         self.config_entry = config_entry
-        GPIO.setmode(GPIO.BOARD)
-        GPIO.setup(self._relay_pin, GPIO.OUT)
 
     @property
     def unique_id(self):
@@ -60,20 +59,29 @@ class PowerLaneEntity(CoordinatorEntity):
 class PowerLaneCurrentSensor(PowerLaneEntity, SensorEntity):
     """Power lane current sensor"""
 
-    def __init__(self, coordinator, config_entry, name, relay_pin, channel_no):
-        super().__init__(coordinator, config_entry, name, relay_pin, channel_no)
+    def __init__(self, coordinator, config_entry, name, relay_index, channel_no):
+        super().__init__(coordinator, config_entry, name, relay_index, channel_no)
         self._attr_name = f"{self._name} current"
         self._attr_native_unit_of_measurement = ELECTRIC_CURRENT_AMPERE
         self._attr_device_class = DEVICE_CLASS_CURRENT
+        self.data_keys = frozenset({adc_key(self._sensor_no)})
+
+    @property
+    def available(self):
+        """Return True once the channel has samples."""
+        return (
+            super().available and self.coordinator.data.adc[self._sensor_no] is not None
+        )
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _sensor_value = self.coordinator.data[f"ads1115_ch{self._sensor_no}"]
-        # sensibility 185 mV/A
-        _sensibility = 185
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _stats = self.coordinator.data.adc[self._sensor_no]
+        _sensor_value = _stats.value
+        _calibration = self.coordinator.acs712_calibration
+        _sensibility = _calibration.sensitivity(self._sensor_no)
 
-        _raw_value = (_sensor_value - 2400) / _sensibility
+        _raw_value = _calibration.current(self._sensor_no, _sensor_value)
 
         self._attr_native_value = Decimal(_raw_value).quantize(Decimal("0.01"))
 
@@ -84,27 +92,33 @@ class PowerLaneCurrentSensor(PowerLaneEntity, SensorEntity):
             "sensor_units": ELECTRIC_POTENTIAL_MILLIVOLT,
             "sensibility": f"{_sensibility} mV/A",
             "raw value": _raw_value,
+            "zero_offset": round(_calibration.zero(self._sensor_no), 1),
+            "rms": Decimal(_calibration.rms_current(self._sensor_no, _stats)).quantize(
+                Decimal("0.01")
+            ),
         }
-        self.async_write_ha_state()
 
 
 class PowerLaneSwitch(PowerLaneEntity, SwitchEntity):
     """Power lane switch"""
 
-    def __init__(self, coordinator, config_entry, name, relay_pin, channel_no):
-        super().__init__(coordinator, config_entry, name, relay_pin, channel_no)
+    def __init__(self, coordinator, config_entry, name, relay_index, channel_no):
+        super().__init__(coordinator, config_entry, name, relay_index, channel_no)
         self._attr_name = f"{self._name} switch"
         self._attr_device_class = DEVICE_CLASS_OUTLET
+        self.data_keys = frozenset({relay_key(self._relay_index)})
 
     @property
     def is_on(self) -> bool | None:
         """Return True if entity is on."""
-        return GPIO.input(self._relay_pin) == 0
+        return self.coordinator.relay_board.relay[self._relay_index].is_on
 
-    def turn_on(self, **kwargs) -> None:
+    async def async_turn_on(self, **kwargs):  # pylint: disable=unused-argument
         """Turn the entity on."""
-        GPIO.output(self._relay_pin, 0)
+        self.coordinator.relay_board.relay[self._relay_index].relay_on()
+        self.async_write_ha_state_if_changed()
 
-    def turn_off(self, **kwargs):
+    async def async_turn_off(self, **kwargs):  # pylint: disable=unused-argument
         """Turn the entity off."""
-        GPIO.output(self._relay_pin, 1)
+        self.coordinator.relay_board.relay[self._relay_index].relay_off()
+        self.async_write_ha_state_if_changed()
@@ -0,0 +1,136 @@
+""" PWM outputs """
+import logging
+from typing import Optional
+
+import pigpio
+from RPi import GPIO
+
+PWM_BACKEND_PIGPIO = "pigpio"
+PWM_BACKEND_RPI_GPIO = "rpi_gpio"
+
+# BOARD pin to BCM GPIO of the 40 pin header
+BOARD_TO_BCM = {
+    3: 2,
+    5: 3,
+    7: 4,
+    8: 14,
+    10: 15,
+    11: 17,
+    12: 18,
+    13: 27,
+    15: 22,
+    16: 23,
+    18: 24,
+    19: 10,
+    21: 9,
+    22: 25,
+    23: 11,
+    24: 8,
+    26: 7,
+    27: 0,
+    28: 1,
+    29: 5,
+    31: 6,
+    32: 12,
+    33: 13,
+    35: 19,
+    36: 16,
+    37: 26,
+    38: 20,
+    40: 21,
+}
+
+# BCM GPIOs wired to the PWM peripheral
+HARDWARE_PWM_GPIOS = (12, 13, 18, 19)
+
+# the software PWM of RPi.GPIO can not follow higher frequencies
+RPI_GPIO_MAX_FREQUENCY = 100
+
+
+class PigpioPWM:
+    """PWM timed by the pigpio daemon.
+
+    GPIOs of the PWM peripheral get true hardware PWM at any frequency, the
+    others DMA timed PWM, where pigpio picks the closest frequency available
+    at its sample rate (8 kHz at most with the default 5 µs).
+    """
+
+    def __init__(self, pin_no: int, frequency: int, host: Optional[str] = None):
+        self.pin_no = pin_no
+        self.gpio = BOARD_TO_BCM[pin_no]
+        self._pi = pigpio.pi(host) if host is not None else pigpio.pi()
+        if not self._pi.connected:
+            # the handle keeps its reconnect thread until stopped
+            self._pi.stop()
+            raise OSError(f"pigpio daemon not reachable on {host or 'localhost'}")
+
+        self.hardware = self.gpio in HARDWARE_PWM_GPIOS
+        try:
+            if self.hardware:
+                self.frequency = frequency
+            else:
+                self._pi.set_PWM_range(self.gpio, 100)
+                self.frequency = self._pi.set_PWM_frequency(self.gpio, frequency)
+        except pigpio.error:
+            self._pi.stop()
+            raise
+
+    def set_duty_cycle(self, percentage: float) -> None:
+        """set the duty cycle, 0 to 100"""
+        if self.hardware:
+            self._pi.hardware_PWM(self.gpio, self.frequency, int(percentage * 10000))
+        else:
+            self._pi.set_PWM_dutycycle(self.gpio, int(round(percentage)))
+
+    def stop(self) -> None:
+        """stop the output and release the daemon connection"""
+        self.set_duty_cycle(0)
+        self._pi.stop()
+
+
+class RPiGPIOPWM:
+    """PWM timed in software by the RPi.GPIO thread"""
+
+    def __init__(self, pin_no: int, frequency: int):
+        self.pin_no = pin_no
+        self.frequency = frequency
+        GPIO.setmode(GPIO.BOARD)
+        GPIO.setup(pin_no, GPIO.OUT)
+        self._pwm = GPIO.PWM(pin_no, frequency)
+        self._started = False
+
+    def set_duty_cycle(self, percentage: float) -> None:
+        """set the duty cycle, 0 to 100"""
+        if self._started:
+            self._pwm.ChangeDutyCycle(percentage)
+        else:
+            self._pwm.start(percentage)
+            self._started = True
+
+    def stop(self) -> None:
+        """stop the output"""
+        self._pwm.stop()
+        self._started = False
+
+
+def pwm_output(
+    pin_no: int,
+    frequency: int,
+    backend: str = PWM_BACKEND_PIGPIO,
+    host: Optional[str] = None,
+    logger: Optional[logging.Logger] = None,
+):
+    """return the PWM output of a BOARD pin, on RPi.GPIO if pigpio fails
+
+    The RPi.GPIO output runs at RPI_GPIO_MAX_FREQUENCY at most.
+    """
+    if backend == PWM_BACKEND_PIGPIO:
+        try:
+            return PigpioPWM(pin_no, frequency, host)
+        except (OSError, pigpio.error) as err:
+            if logger is not None:
+                logger.warning(f"pigpio PWM on pin {pin_no} failed: {err}")
+    elif backend != PWM_BACKEND_RPI_GPIO:
+        raise ValueError(f"Unknown PWM backend: {backend}")
+
+    return RPiGPIOPWM(pin_no, min(frequency, RPI_GPIO_MAX_FREQUENCY))
@@ -0,0 +1,58 @@
+""" I2C register cache """
+import time
+from typing import Dict, Optional, Tuple
+
+
+class RegisterCache:
+    """Write-through cache of the configuration registers of one I2C device.
+
+    Reads are served from memory once a register is known, writes go to the
+    device and update the cache. A cached value older than max_age seconds is
+    read again, to notice a device reset behind our back. Registers the device
+    changes by itself (data, status) must not go through the cache.
+    """
+
+    def __init__(self, bus, address: int, max_age: Optional[float] = 300.0) -> None:
+        self.bus = bus
+        self.address = address
+        self.max_age = max_age
+        # register -> (value, time.monotonic() it was read or written)
+        self._values: Dict[int, Tuple[int, float]] = {}
+
+    async def async_read(self, register: int) -> int:
+        """return the register value, from the cache if it is fresh"""
+        _cached = self._values.get(register)
+        if _cached is not None and not self._expired(_cached[1]):
+            return _cached[0]
+
+        try:
+            _value = await self.bus.read_byte(self.address, register)
+        except OSError:
+            self._values.pop(register, None)
+            raise
+
+        self._values[register] = (_value, time.monotonic())
+        return _value
+
+    async def async_write(self, register: int, value: int) -> None:
+        """write the register and remember its value"""
+        try:
+            await self.bus.write_byte(self.address, register, value)
+        except OSError:
+            # the write may have landed or not
+            self._values.pop(register, None)
+            raise
+
+        self._values[register] = (value, time.monotonic())
+
+    def invalidate(self, register: Optional[int] = None) -> None:
+        """forget one register, or all of them"""
+        if register is None:
+            self._values.clear()
+        else:
+            self._values.pop(register, None)
+
+    def _expired(self, timestamp: float) -> bool:
+        if self.max_age is None:
+            return False
+        return time.monotonic() - timestamp > self.max_age
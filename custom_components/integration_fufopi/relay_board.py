@@ -1,3 +1,7 @@
+import logging
+import time
+from typing import Optional, Sequence, Tuple
+
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.switch import SwitchEntity
 
@@ -5,19 +9,48 @@ import RPi.GPIO as GPIO
 
 from .const import DOMAIN, ATTRIBUTION
 
+# BOARD pins of the relay outputs, relay index order
+RELAY_PINS = (12, 16, 18, 13)
 
-class RelayBoardPigPio:
-    """PigPio relay board class"""
 
-    def __init__(self) -> None:
-        # Initialite pigpio pi
+class RelayBoardPigPio:
+    """Relay board, the only owner of the relay pins.
+
+    The state of the outputs is kept in a shadow updated on every write, so
+    reading it costs no GPIO access. Every verify_interval seconds the pins
+    are read back to catch anything else driving them.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        pins: Sequence[int] = RELAY_PINS,
+        verify_interval: Optional[float] = 60.0,
+    ) -> None:
         GPIO.setmode(GPIO.BOARD)
-        self.relay = [
-            RelayPigPio(pin_no=12, inverted=True),
-            RelayPigPio(pin_no=16, inverted=True),
-            RelayPigPio(pin_no=18, inverted=True),
-            RelayPigPio(pin_no=13, inverted=True),
-        ]
+        self.logger = logger
+        self.relay = [RelayPigPio(pin_no=_pin, inverted=True) for _pin in pins]
+        self.verify_interval = verify_interval
+        self._verified = time.monotonic()
+
+    def states(self) -> Tuple[bool, ...]:
+        """return the state of all the relays, read back when it is due"""
+        if self.verify_interval is not None:
+            _now = time.monotonic()
+            if _now - self._verified >= self.verify_interval:
+                self._verified = _now
+                self.verify()
+
+        return tuple(_relay.is_on for _relay in self.relay)
+
+    def verify(self) -> None:
+        """read back the pins and fix the shadow of the ones that differ"""
+        for _index, _relay in enumerate(self.relay):
+            if _relay.read_back() and self.logger is not None:
+                self.logger.warning(
+                    f"Relay {_index} on pin {_relay.pin_no} was changed outside "
+                    f"the relay board, now {'on' if _relay.is_on else 'off'}"
+                )
 
 
 class RelayPigPio:
@@ -26,37 +59,38 @@ class RelayPigPio:
     def __init__(self, pin_no, inverted=False) -> None:
         self._pin_no = pin_no
         self._inverted = inverted
+        # last state written to the pin
+        self._is_on = False
         GPIO.setmode(GPIO.BOARD)
         GPIO.setup(self._pin_no, GPIO.OUT)
         self.relay_off()
 
+    @property
+    def pin_no(self):
+        """Return the BOARD pin of the relay"""
+        return self._pin_no
+
     @property
     def is_on(self):
-        """Return if relay is on or not"""
-        if GPIO.input(self._pin_no) == 1:
-            if self._inverted is True:
-                return False
-            else:
-                return True
-        else:
-            if self._inverted is True:
-                return True
-            else:
-                return False
+        """Return if relay is on or not, from the shadow"""
+        return self._is_on
 
     def relay_on(self):
         """Switch relay on"""
-        if self._inverted is True:
-            GPIO.output(self._pin_no, 0)
-        else:
-            GPIO.output(self._pin_no, 1)
+        GPIO.output(self._pin_no, 0 if self._inverted else 1)
+        self._is_on = True
 
     def relay_off(self):
         """Switch relay off"""
-        if self._inverted is True:
-            GPIO.output(self._pin_no, 1)
-        else:
-            GPIO.output(self._pin_no, 0)
+        GPIO.output(self._pin_no, 1 if self._inverted else 0)
+        self._is_on = False
+
+    def read_back(self) -> bool:
+        """Read the pin into the shadow, return True if they differed"""
+        _is_on = (GPIO.input(self._pin_no) == 1) != self._inverted
+        _changed = _is_on != self._is_on
+        self._is_on = _is_on
+        return _changed
 
 
 class RelayBoardEntity(CoordinatorEntity):
@@ -0,0 +1,38 @@
+""" Sample ring buffer """
+from array import array
+from typing import Optional
+
+
+class SampleRingBuffer:
+    """Last samples of one channel, oldest overwritten first"""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.count = 0
+        self._samples = array("d", bytes(8 * size))
+        self._index = 0
+
+    def append(self, value: float) -> None:
+        """store a sample, dropping the oldest one when full"""
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def values(self) -> array:
+        """return a copy of the stored samples, oldest first"""
+        if self.count < self.size:
+            return self._samples[: self.count]
+        return self._samples[self._index :] + self._samples[: self._index]
+
+    @property
+    def latest(self) -> Optional[float]:
+        """return the last sample, None if empty"""
+        if self.count == 0:
+            return None
+        return self._samples[self._index - 1]
+
+    def mean(self) -> Optional[float]:
+        """return the mean of the stored samples, None if empty"""
+        if self.count == 0:
+            return None
+        return sum(self.values()) / self.count
@@ -9,6 +9,14 @@ from .smart_solar_MPPT import add_smart_solar_mppt_sensors
 
 from .power_lane import add_power_lane_sensors
 
+from .adxl345 import add_adxl345_sensors
+
+from .compass import add_compass_sensors
+
+from .battery import add_battery_sensors
+
+from .energy import add_energy_sensors
+
 
 async def async_setup_entry(hass, entry, async_add_devices):
     """Setup entities platform."""
@@ -24,4 +32,12 @@ async def async_setup_entry(hass, entry, async_add_devices):
 
     add_power_lane_sensors(sensors, coordinator, entry)
 
+    add_adxl345_sensors(sensors, coordinator, entry)
+
+    add_compass_sensors(sensors, coordinator, entry)
+
+    add_battery_sensors(sensors, coordinator, entry)
+
+    add_energy_sensors(sensors, coordinator, entry)
+
     async_add_devices(sensors)
@@ -1,10 +1,9 @@
 """ Smart Solar MPPT"""
 from decimal import Decimal
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
 from homeassistant.components.sensor import SensorEntity
 
 from homeassistant.const import (
@@ -19,96 +18,142 @@ from homeassistant.const import (
 )
 
 from .const import DOMAIN, ATTRIBUTION
+from .entity import FufoPiEntity
+from .snapshot import charger_keys
+
+# unique id suffixes of the sensors of the single charger the integration
+# supported before, when the ids carried no serial number
+LEGACY_SUFFIXES = (
+    "PID",
+    "FW",
+    "SER#",
+    "CS",
+    "MPPT",
+    "OR",
+    "HSDS",
+    "Checksum",
+    "ERR",
+    "IL",
+    "I",
+    "V",
+    "VPV",
+    "PPV",
+    "H19",
+    "H20",
+    "H21",
+    "H22",
+    "H23",
+    "BPC",
+)
+
+
+async def async_migrate_legacy_ids(
+    hass: HomeAssistant, config_entry: ConfigEntry, charger_id: str
+) -> None:
+    """hand the entities and device of the single charger over to charger_id
+
+    The main charger keeps the entity ids and the history recorded before the
+    chargers were identified by serial number.
+    """
+    _legacy = config_entry.entry_id + "SmartSolar"
+    _current = _legacy + charger_id
+    _entities = er.async_get(hass)
 
-PID_VALUE_LIST = {"0xA060": "SmartSolar MPPT 100|20 48V"}
-
-CS_VALUE_LIST = {
-    "0": "Off",
-    "2": "Fault",
-    "3": "Bulk",
-    "4": "Absorption",
-    "5": "Float",
-    "6": "Storage",
-    "7": "Equalize (manual)",
-    "9": "Inverting",
-    "11": "Power supply",
-    "245": "Starting-up",
-    "246": "Repeated absorption",
-    "247": "Auto equalize / Recondition",
-    "248": "BatterySafe",
-    "252": "External Control",
-}
-
-MPPT_VALUE_LIST = {
-    "0": "Off",
-    "1": "Voltage or current limited",
-    "2": "MPP Tracker active",
-}
-
-OR_VALUE_LIST = {
-    "0x00000000": "No reason",
-    "0x00000001": "No input power",
-    "0x00000002": "Switched off (power switch)",
-    "0x00000004": "Switched off (device mode register) ",
-    "0x00000008": "Remote input",
-    "0x00000010": "Protection active ",
-    "0x00000020": "Paygo",
-    "0x00000040": "BMS",
-    "0x00000080": "Engine shutdown",
-    "0x00000100": "Analysing input voltage",
-}
-
-ERR_VALUE_LIST = {
-    "0": "No error",
-    "2": "Battery voltage too high",
-    "17": "Charger temperature too high",
-    "18": "Charger over current",
-    "19": "Charger current reversed",
-    "20": "Bulk time limit exceeded",
-    "21": "Current sensor issue (sensor bias/sensor broken)",
-    "26": "Terminals overheated",
-    "28": "Converter issue (dual converter models only)",
-    "33": "Input voltage too high (solar panel)",
-    "34": "Input current too high (solar panel)",
-    "38": "Input shutdown (due to excessive battery voltage)",
-    "39": "Input shutdown (due to current flow during off mode)",
-    "65": "Lost communication with one of devices",
-    "66": "Synchronised charging device configuration issue",
-    "67": "BMS connection lost",
-    "68": "Network misconfigured",
-    "116": "Factory calibration data lost",
-    "117": "Invalid/incompatible firmware",
-    "119": "User settings invalid",
-}
+    @callback
+    def _migrate(entity_entry: er.RegistryEntry):
+        _suffix = entity_entry.unique_id[len(_legacy) :]
+        if (
+            not entity_entry.unique_id.startswith(_legacy)
+            or _suffix not in LEGACY_SUFFIXES
+            # the entity was already created again by a previous run
+            or _entities.async_get_entity_id(
+                entity_entry.domain, DOMAIN, _current + _suffix
+            )
+            is not None
+        ):
+            return None
+        return {"new_unique_id": _current + _suffix}
+
+    await er.async_migrate_entries(hass, config_entry.entry_id, _migrate)
+
+    _devices = dr.async_get(hass)
+    _device = _devices.async_get_device({(DOMAIN, _legacy)})
+    if _device is not None and _devices.async_get_device({(DOMAIN, _current)}) is None:
+        _devices.async_update_device(_device.id, new_identifiers={(DOMAIN, _current)})
 
 
 def add_smart_solar_mppt_sensors(sensors, coordinator, config_entry):
     """append sensors"""
-    sensors.append(SmartSolarProductIDSensor(coordinator, config_entry))
-    sensors.append(SmartSolarFirmwareSensor(coordinator, config_entry))
-    sensors.append(SmartSolarSerialNumberSensor(coordinator, config_entry))
-    sensors.append(SmartSolarCSSensor(coordinator, config_entry))
-    sensors.append(SmartSolarMPPTSensor(coordinator, config_entry))
-    sensors.append(SmartSolarHSDSSensor(coordinator, config_entry))
-    sensors.append(SmartSolarORSensor(coordinator, config_entry))
-    sensors.append(SmartSolarCheckSumSensor(coordinator, config_entry))
-    sensors.append(SmartSolarErrSensor(coordinator, config_entry))
-    sensors.append(SmartSolarILSensor(coordinator, config_entry))
-    sensors.append(SmartSolarISensor(coordinator, config_entry))
-    sensors.append(SmartSolarVSensor(coordinator, config_entry))
-    sensors.append(SmartSolarVPVSensor(coordinator, config_entry))
-    sensors.append(SmartSolarPPVSensor(coordinator, config_entry))
-    sensors.append(SmartSolarH19Sensor(coordinator, config_entry))
-    sensors.append(SmartSolarH20Sensor(coordinator, config_entry))
-    sensors.append(SmartSolarH21Sensor(coordinator, config_entry))
-    sensors.append(SmartSolarH22Sensor(coordinator, config_entry))
-    sensors.append(SmartSolarH23Sensor(coordinator, config_entry))
-    sensors.append(BatteryPerCentSensor(coordinator, config_entry))
-
-
-class SmartSolarEntity(CoordinatorEntity):
+    for _charger in coordinator.chargers.values():
+        sensors.append(SmartSolarProductIDSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarFirmwareSensor(coordinator, config_entry, _charger))
+        sensors.append(
+            SmartSolarSerialNumberSensor(coordinator, config_entry, _charger)
+        )
+        sensors.append(SmartSolarCSSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarMPPTSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarHSDSSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarORSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarCheckSumSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarErrSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarILSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarISensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarVSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarVPVSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarPPVSensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarH19Sensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarH20Sensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarH21Sensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarH22Sensor(coordinator, config_entry, _charger))
+        sensors.append(SmartSolarH23Sensor(coordinator, config_entry, _charger))
+        sensors.append(BatteryPerCentSensor(coordinator, config_entry, _charger))
+
+    sensors.append(SmartSolarTotalPPVSensor(coordinator, config_entry))
+    sensors.append(SmartSolarTotalYieldTodaySensor(coordinator, config_entry))
+    sensors.append(SmartSolarTotalYieldSensor(coordinator, config_entry))
+
+
+class SmartSolarEntity(FufoPiEntity):
     """Smart solar mppt base entity"""
 
+    # record fields the entity state is built from
+    record_fields = ()
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator)
+        self.config_entry = config_entry
+        self.charger = charger
+        self._charger_id = charger.charger_id
+        self.data_keys = charger_keys(self._charger_id, *self.record_fields)
+
+    @property
+    def record(self):
+        """return the record of this charger in the coordinator snapshot"""
+        return self.coordinator.data.chargers[self._charger_id]
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return self.config_entry.entry_id + "SmartSolar" + self._charger_id
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {
+                (
+                    DOMAIN,
+                    self.config_entry.entry_id + "SmartSolar" + self._charger_id,
+                )
+            },
+            "name": f"SmartSolar {self._charger_id}",
+            "model": self.charger.product_id,
+            "manufacturer": "Victron Energy",
+        }
+
+
+class SmartSolarTotalsEntity(FufoPiEntity):
+    """Aggregated values of all the smart solar chargers"""
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator)
         self.config_entry = config_entry
@@ -116,14 +161,13 @@ class SmartSolarEntity(CoordinatorEntity):
     @property
     def unique_id(self):
         """Return a unique ID to use for this entity."""
-        return self.config_entry.entry_id + "SmartSolar"
+        return self.config_entry.entry_id + "SmartSolarTotals"
 
     @property
     def device_info(self):
         return {
-            "identifiers": {(DOMAIN, self.config_entry.entry_id + "SmartSolar")},
-            "name": "SmartSolar MPPT 100|20 48V",
-            "model": "HQ2129WD7QV",
+            "identifiers": {(DOMAIN, self.config_entry.entry_id + "SmartSolarTotals")},
+            "name": "SmartSolar totals",
             "manufacturer": "Victron Energy",
         }
 
@@ -131,8 +175,10 @@ class SmartSolarEntity(CoordinatorEntity):
 class SmartSolarProductIDSensor(SmartSolarEntity, SensorEntity):
     """Smart solar Product ID Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("product_id",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Product ID"
         self._attr_icon = "mdi:identifier"
 
@@ -141,18 +187,18 @@ class SmartSolarProductIDSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "PID"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.product_id
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.product_id
 
 
 class SmartSolarFirmwareSensor(SmartSolarEntity, SensorEntity):
     """Smart solar Firmware Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("firmware",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Firmware Version"
         self._attr_icon = "mdi:identifier"
 
@@ -161,18 +207,18 @@ class SmartSolarFirmwareSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "FW"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.firmware
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.firmware
 
 
 class SmartSolarSerialNumberSensor(SmartSolarEntity, SensorEntity):
     """Smart solar serial number Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("serial_number",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Serial Number"
         self._attr_icon = "mdi:music-accidental-sharp"
 
@@ -181,18 +227,18 @@ class SmartSolarSerialNumberSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "SER#"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.serial_number
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.serial_number
 
 
 class SmartSolarCSSensor(SmartSolarEntity, SensorEntity):
     """Smart solar operation state Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("state_of_operation",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "State of operation"
         self._attr_icon = "mdi:car-turbocharger"
 
@@ -201,18 +247,18 @@ class SmartSolarCSSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "CS"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.state_of_operation
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.state_of_operation
 
 
 class SmartSolarMPPTSensor(SmartSolarEntity, SensorEntity):
     """Smart solar tracker op mode Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("tracker_operation_mode",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Tracker operation mode"
         self._attr_icon = "mdi:radar"
 
@@ -221,18 +267,18 @@ class SmartSolarMPPTSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "MPPT"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.tracker_operation_mode
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.tracker_operation_mode
 
 
 class SmartSolarORSensor(SmartSolarEntity, SensorEntity):
     """Smart solar off reason Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("off_reason",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Off Reason"
         self._attr_icon = "mdi:playlist-remove"
 
@@ -241,18 +287,18 @@ class SmartSolarORSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "OR"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.off_reason
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.off_reason
 
 
 class SmartSolarHSDSSensor(SmartSolarEntity, SensorEntity):
     """Smart solar day seq number Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("day_seq_number",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Day seq number"
 
     @property
@@ -260,18 +306,18 @@ class SmartSolarHSDSSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "HSDS"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.day_seq_number
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.day_seq_number
 
 
 class SmartSolarCheckSumSensor(SmartSolarEntity, SensorEntity):
     """Smart solar checksum Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("checksum",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Checksum"
 
     @property
@@ -279,18 +325,18 @@ class SmartSolarCheckSumSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "Checksum"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.checksum
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.checksum
 
 
 class SmartSolarErrSensor(SmartSolarEntity, SensorEntity):
     """Smart solar checksum Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("error_reason",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Error reason"
 
     @property
@@ -298,18 +344,18 @@ class SmartSolarErrSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "ERR"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.error_reason
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.error_reason
 
 
 class SmartSolarILSensor(SmartSolarEntity, SensorEntity):
     """Smart solar checksum Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("load_current",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "IL"
         self._attr_device_class = DEVICE_CLASS_CURRENT
         self._attr_native_unit_of_measurement = ELECTRIC_CURRENT_MILLIAMPERE
@@ -319,18 +365,18 @@ class SmartSolarILSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "IL"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.load_current
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.load_current
 
 
 class SmartSolarISensor(SmartSolarEntity, SensorEntity):
     """Smart solar checksum Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("battery_current",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "I"
         self._attr_device_class = DEVICE_CLASS_CURRENT
         self._attr_native_unit_of_measurement = ELECTRIC_CURRENT_MILLIAMPERE
@@ -340,18 +386,18 @@ class SmartSolarISensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "I"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.battery_current
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.battery_current
 
 
 class SmartSolarVSensor(SmartSolarEntity, SensorEntity):
     """Smart solar checksum Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("battery_voltage",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "V"
         self._attr_device_class = DEVICE_CLASS_VOLTAGE
         self._attr_native_unit_of_measurement = ELECTRIC_POTENTIAL_MILLIVOLT
@@ -361,18 +407,18 @@ class SmartSolarVSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "V"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.battery_voltage
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.battery_voltage
 
 
 class SmartSolarVPVSensor(SmartSolarEntity, SensorEntity):
     """Smart solar VPV Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("panel_voltage",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "VPV"
         self._attr_device_class = DEVICE_CLASS_VOLTAGE
         self._attr_native_unit_of_measurement = ELECTRIC_POTENTIAL_MILLIVOLT
@@ -382,18 +428,18 @@ class SmartSolarVPVSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "VPV"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.panel_voltage
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.panel_voltage
 
 
 class SmartSolarPPVSensor(SmartSolarEntity, SensorEntity):
     """Smart solar PPV Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("panel_power",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "PPV"
         self._attr_device_class = DEVICE_CLASS_POWER
         self._attr_native_unit_of_measurement = POWER_WATT
@@ -403,18 +449,18 @@ class SmartSolarPPVSensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "PPV"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.panel_power
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.panel_power
 
 
 class SmartSolarH19Sensor(SmartSolarEntity, SensorEntity):
     """Smart solar PPV Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("yield_total",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "H19"
         self._attr_device_class = DEVICE_CLASS_ENERGY
         self._attr_native_unit_of_measurement = "0,01 kWh"
@@ -424,18 +470,18 @@ class SmartSolarH19Sensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "H19"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.yield_total
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.yield_total
 
 
 class SmartSolarH20Sensor(SmartSolarEntity, SensorEntity):
     """Smart solar PPV Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("yield_today",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "H20"
         self._attr_device_class = DEVICE_CLASS_ENERGY
         self._attr_native_unit_of_measurement = "0,01 kWh"
@@ -445,18 +491,18 @@ class SmartSolarH20Sensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "H20"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.yield_today
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.yield_today
 
 
 class SmartSolarH21Sensor(SmartSolarEntity, SensorEntity):
     """Smart solar PPV Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("max_power_today",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "H21"
         self._attr_device_class = DEVICE_CLASS_POWER
         self._attr_native_unit_of_measurement = POWER_WATT
@@ -466,18 +512,18 @@ class SmartSolarH21Sensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "H21"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.max_power_today
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.max_power_today
 
 
 class SmartSolarH22Sensor(SmartSolarEntity, SensorEntity):
     """Smart solar PPV Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("yield_yesterday",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "H22"
         self._attr_device_class = DEVICE_CLASS_ENERGY
         self._attr_native_unit_of_measurement = "0,01 kWh"
@@ -487,18 +533,18 @@ class SmartSolarH22Sensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "H22"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.yield_yesterday
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.yield_yesterday
 
 
 class SmartSolarH23Sensor(SmartSolarEntity, SensorEntity):
     """Smart solar PPV Sensor class."""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("max_power_yesterday",)
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "H23"
         self._attr_device_class = DEVICE_CLASS_POWER
         self._attr_native_unit_of_measurement = POWER_WATT
@@ -508,18 +554,18 @@ class SmartSolarH23Sensor(SmartSolarEntity, SensorEntity):
         return super().unique_id + "H23"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = self.coordinator.smart_solar.max_power_yesterday
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.record.max_power_yesterday
 
 
 class BatteryPerCentSensor(SmartSolarEntity, SensorEntity):
     """% of battery capacity"""
 
-    def __init__(self, coordinator, config_entry):
-        super().__init__(coordinator, config_entry)
+    record_fields = ("battery_voltage", "battery_current")
+
+    def __init__(self, coordinator, config_entry, charger):
+        super().__init__(coordinator, config_entry, charger)
         self._attr_name = "Battery left"
         self._attr_device_class = DEVICE_CLASS_BATTERY
         self._attr_native_unit_of_measurement = "%"
@@ -528,44 +574,79 @@ class BatteryPerCentSensor(SmartSolarEntity, SensorEntity):
     def unique_id(self):
         return super().unique_id + "BPC"
 
-    def _scale(self, x, upper, lower):
-        _x1, _y1 = lower
-        _x2, _y2 = upper
-        _m = (_y2 - _y1) / (_x2 - _x1)
-        _n = _m * _x1 - _y1
-        return x * _m - _n
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        if self.record.battery_voltage is None:
+            self._attr_native_value = None
+            return
+
+        # the curve of the coordinator, on the voltage seen by this charger
+        self._attr_native_value = Decimal(
+            self.coordinator.soc_engine.voltage_soc(
+                self.record.battery_voltage, self.record.battery_current or 0
+            )
+        ).quantize(Decimal("1.0"))
+
+
+class SmartSolarTotalPPVSensor(SmartSolarTotalsEntity, SensorEntity):
+    """Combined panel power of all chargers"""
+
+    data_keys = frozenset({"total_panel_power"})
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Combined PPV"
+        self._attr_device_class = DEVICE_CLASS_POWER
+        self._attr_native_unit_of_measurement = POWER_WATT
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "PPV"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.coordinator.data.total_panel_power
+
+
+class SmartSolarTotalYieldTodaySensor(SmartSolarTotalsEntity, SensorEntity):
+    """Combined yield today of all chargers"""
+
+    data_keys = frozenset({"total_yield_today"})
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Combined yield today"
+        self._attr_device_class = DEVICE_CLASS_ENERGY
+        self._attr_native_unit_of_measurement = "0,01 kWh"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "H20"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.coordinator.data.total_yield_today
+
+
+class SmartSolarTotalYieldSensor(SmartSolarTotalsEntity, SensorEntity):
+    """Combined yield total of all chargers"""
+
+    data_keys = frozenset({"total_yield_total"})
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = "Combined yield total"
+        self._attr_device_class = DEVICE_CLASS_ENERGY
+        self._attr_native_unit_of_measurement = "0,01 kWh"
+
+    @property
+    def unique_id(self):
+        return super().unique_id + "H19"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _data = [
-            (Decimal(9000), Decimal(0.0)),
-            (Decimal(10000), Decimal(20.0)),
-            (Decimal(11000), Decimal(40.0)),
-            (Decimal(12000), Decimal(60.0)),
-            (Decimal(13000), Decimal(80.0)),
-            (Decimal(14000), Decimal(100.0)),
-            (Decimal(15000), Decimal(120.0)),
-        ]
-
-        _min_voltage, _min_per_cent = _data[0]
-        _voltage = Decimal(self.coordinator.smart_solar.battery_voltage)
-
-        # self.coordinator.logger.warn(f"_voltage: {_voltage}")
-
-        self._attr_native_value = Decimal(0)
-
-        if _voltage >= _min_voltage:
-            for _v, _per_cent in _data:
-                if _voltage == _v:
-                    self._attr_native_value = _per_cent.quantize(Decimal("1.0"))
-
-                elif _voltage < _v:
-                    self._attr_native_value = self._scale(
-                        _voltage, (_v, _per_cent), (_min_voltage, _min_per_cent)
-                    ).quantize(Decimal("1.0"))
-                else:
-                    _min_voltage = _v
-                    _min_per_cent = _per_cent
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = self.coordinator.data.total_yield_total
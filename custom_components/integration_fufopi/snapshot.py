@@ -0,0 +1,146 @@
+""" Coordinator data snapshot """
+from dataclasses import dataclass, fields
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple
+
+from .adc_filter import ChannelStats
+from .battery_soc import BatteryState
+from .orientation import Orientation
+from .power_figures import PowerFigures
+from .ve_direct import VEDirectRecord
+from .vibration import VibrationSpectrum, VibrationStats
+
+RECORD_FIELDS = tuple(_field.name for _field in fields(VEDirectRecord))
+
+
+def charger_key(serial_number: str, field: str) -> str:
+    """return the data key of a VE Direct record field"""
+    return f"{serial_number}.{field}"
+
+
+def charger_keys(serial_number: str, *record_fields: str) -> FrozenSet[str]:
+    """return the data keys of several VE Direct record fields"""
+    return frozenset(charger_key(serial_number, _field) for _field in record_fields)
+
+
+def adc_key(channel: int) -> str:
+    """return the data key of an ADC channel"""
+    return f"ads1115_ch{channel}"
+
+
+def relay_key(index: int) -> str:
+    """return the data key of a relay output"""
+    return f"relay_{index}"
+
+
+@dataclass(frozen=True, slots=True)
+class ADXL345Reading:
+    """Accelerometer registers and axes (m/s²) read in one refresh"""
+
+    enabled: bool
+    range: int
+    bandwidth_rate: int
+    accel_x: float
+    accel_y: float
+    accel_z: float
+    # only available while the FIFO is streaming
+    vibration: Optional[VibrationStats] = None
+    spectrum: Optional[VibrationSpectrum] = None
+
+
+@dataclass(frozen=True, slots=True)
+class HMC5883Reading:
+    """Compass registers and axes (Gauss) read in one refresh"""
+
+    sample_no: int
+    output_rate: float
+    measurement_mode: int
+    gain: int
+    sensor_range: float
+    resolution: float
+    i2c_high_speed: bool
+    operating_mode: int
+    is_locked: bool
+    is_ready: bool
+    # None while the axis is out of the sensor range
+    mag_x: Optional[float]
+    mag_y: Optional[float]
+    mag_z: Optional[float]
+
+
+@dataclass(frozen=True, slots=True)
+class FufoPiSnapshot:
+    """Data of one coordinator refresh, shared read only by all the entities.
+
+    Values are native numbers: VE Direct records as decoded by the readers,
+    ADC channel statistics in mV and relay states as booleans.
+    """
+
+    # time.monotonic() of the refresh
+    timestamp: float
+    # VE Direct records by charger serial number, main charger first
+    chargers: Mapping[str, VEDirectRecord]
+    # ADS1115 channels filtered over the sampler window, in mV, None for a
+    # channel without samples
+    adc: Tuple[Optional[ChannelStats], ...]
+    # relay board outputs, True when on
+    relays: Tuple[bool, ...]
+    # optional I2C sensors, None when missing or not answering
+    adxl345: Optional[ADXL345Reading]
+    hmc5883: Optional[HMC5883Reading]
+    # from the ADXL345 and the HMC5883L, None without the ADXL345
+    orientation: Optional[Orientation]
+    # battery of the main charger, None until its voltage is known
+    battery: Optional[BatteryState]
+    # derived from the main charger record and the relays
+    power: PowerFigures
+    # integrated since the first run, Wh by energy channel
+    energy: Mapping[str, float]
+    # aggregated over all the chargers
+    total_panel_power: int
+    total_yield_today: int
+    total_yield_total: int
+    # data keys that changed since the previous refresh, None when every key
+    # has to be considered changed (first refresh)
+    changed_keys: Optional[FrozenSet[str]]
+
+    @property
+    def smart_solar(self) -> VEDirectRecord:
+        """return the record of the main charger"""
+        return next(iter(self.chargers.values()))
+
+
+def changed_keys(
+    previous: Optional[FufoPiSnapshot],
+    chargers: Mapping[str, VEDirectRecord],
+    adc: Tuple[Optional[ChannelStats], ...],
+    relays: Tuple[bool, ...],
+    totals: Dict[str, int],
+) -> Optional[FrozenSet[str]]:
+    """return the data keys whose value differs from the previous snapshot"""
+    if previous is None:
+        return None
+
+    _changed = set()
+
+    for _serial, _record in chargers.items():
+        _old = previous.chargers.get(_serial)
+        # records are only replaced when a new block is received
+        if _record is _old:
+            continue
+        for _field in RECORD_FIELDS:
+            if _old is None or getattr(_record, _field) != getattr(_old, _field):
+                _changed.add(charger_key(_serial, _field))
+
+    for _channel, (_value, _old) in enumerate(zip(adc, previous.adc)):
+        if _value != _old:
+            _changed.add(adc_key(_channel))
+
+    for _index, (_value, _old) in enumerate(zip(relays, previous.relays)):
+        if _value != _old:
+            _changed.add(relay_key(_index))
+
+    for _key, _value in totals.items():
+        if _value != getattr(previous, _key):
+            _changed.add(_key)
+
+    return frozenset(_changed)
@@ -1,6 +1,5 @@
 from decimal import Decimal
 
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.core import callback
 
 from homeassistant.const import (
@@ -17,14 +16,22 @@ from homeassistant.const import (
 from homeassistant.components.sensor import SensorEntity, STATE_CLASS_TOTAL_INCREASING
 
 from .const import DOMAIN, ATTRIBUTION
+from .entity import FufoPiEntity
+from .snapshot import charger_keys
 
 
-class SolarPanelEntity(CoordinatorEntity):
+class SolarPanelEntity(FufoPiEntity):
     """Solar panel base entity"""
 
+    # record fields of the main charger the entity state is built from
+    record_fields = ()
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator)
         self.config_entry = config_entry
+        self.data_keys = charger_keys(
+            coordinator.smart_solar.charger_id, *self.record_fields
+        )
 
     @property
     def unique_id(self):
@@ -53,6 +60,8 @@ class SolarPanelEntity(CoordinatorEntity):
 class SolarPanelVoltageSensor(SolarPanelEntity, SensorEntity):
     """Solar panel voltage sensor"""
 
+    record_fields = ("panel_voltage",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel voltage"
@@ -64,17 +73,18 @@ class SolarPanelVoltageSensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "V"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.smart_solar.panel_voltage
+            self.coordinator.data.smart_solar.panel_voltage
         ) * Decimal(0.001).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
 
 
 class SolarPanelCurrentSensor(SolarPanelEntity, SensorEntity):
     """SolarPanel voltage sensor"""
 
+    record_fields = ("panel_voltage", "panel_power")
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel current"
@@ -86,21 +96,19 @@ class SolarPanelCurrentSensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "I"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        _v = Decimal(self.coordinator.smart_solar.panel_voltage) * Decimal(0.001)
-        _p = Decimal(self.coordinator.smart_solar.panel_power)
-        if _v > Decimal(0):
-            self._attr_native_value = (_p / _v).quantize(Decimal("1.000"))
-        else:
-            self._attr_native_value = Decimal(0)
-
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        _value = self.coordinator.data.power.panel_current
+        self._attr_native_value = (
+            None if _value is None else Decimal(_value).quantize(Decimal("1.000"))
+        )
 
 
 class SolarPanelPowerSensor(SolarPanelEntity, SensorEntity):
     """Solar panel power sensor"""
 
+    record_fields = ("panel_power",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel power"
@@ -112,15 +120,16 @@ class SolarPanelPowerSensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "P"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = Decimal(self.coordinator.smart_solar.panel_power)
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(self.coordinator.data.smart_solar.panel_power)
 
 
 class SolarPanelMaxPowerTodaySensor(SolarPanelEntity, SensorEntity):
     """Solar panel max power today sensor"""
 
+    record_fields = ("max_power_today",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel max power today"
@@ -132,15 +141,18 @@ class SolarPanelMaxPowerTodaySensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "MPT"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._attr_native_value = Decimal(self.coordinator.smart_solar.max_power_today)
-        self.async_write_ha_state()
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
+        self._attr_native_value = Decimal(
+            self.coordinator.data.smart_solar.max_power_today
+        )
 
 
 class SolarPanelMaxPowerYesterdaySensor(SolarPanelEntity, SensorEntity):
     """Solar panel max power yesterday sensor"""
 
+    record_fields = ("max_power_yesterday",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel max power yesterday"
@@ -152,17 +164,18 @@ class SolarPanelMaxPowerYesterdaySensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "MPY"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.smart_solar.max_power_yesterday
+            self.coordinator.data.smart_solar.max_power_yesterday
         )
-        self.async_write_ha_state()
 
 
 class SolarPanelProductionTodaySensor(SolarPanelEntity, SensorEntity):
     """Solar panel production today power sensor"""
 
+    record_fields = ("yield_today",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel production today"
@@ -175,17 +188,18 @@ class SolarPanelProductionTodaySensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "YT"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.smart_solar.yield_today
+            self.coordinator.data.smart_solar.yield_today
         ) * Decimal(0.01).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
 
 
 class SolarPanelProductionYesterdaySensor(SolarPanelEntity, SensorEntity):
     """Solar panel production today power sensor"""
 
+    record_fields = ("yield_yesterday",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel production yesterday"
@@ -197,17 +211,18 @@ class SolarPanelProductionYesterdaySensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "YY"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.smart_solar.yield_yesterday
+            self.coordinator.data.smart_solar.yield_yesterday
         ) * Decimal(0.01).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
 
 
 class SolarPanelProductionTotalSensor(SolarPanelEntity, SensorEntity):
     """Solar panel production total power sensor"""
 
+    record_fields = ("yield_total",)
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
         self._attr_name = "Solar panel production total"
@@ -219,9 +234,8 @@ class SolarPanelProductionTotalSensor(SolarPanelEntity, SensorEntity):
         return super().unique_id + "YTT"
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the coordinator data."""
         self._attr_native_value = Decimal(
-            self.coordinator.smart_solar.yield_total
+            self.coordinator.data.smart_solar.yield_total
         ) * Decimal(0.01).quantize(Decimal("1.000"))
-        self.async_write_ha_state()
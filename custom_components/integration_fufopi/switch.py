@@ -1,5 +1,6 @@
 """Switch platform for integration_blueprint."""
 from .const import DOMAIN
+from .compass import add_compass_switches
 from .power_lane import add_power_lane_switches
 
 
@@ -8,4 +9,5 @@ async def async_setup_entry(hass, entry, async_add_devices):
     coordinator = hass.data[DOMAIN][entry.entry_id]
     switches = []
     add_power_lane_switches(switches, coordinator, entry)
+    add_compass_switches(switches, coordinator, entry)
     async_add_devices(switches)
@@ -0,0 +1,432 @@
+""" VE Direct serial protocol """
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import serial
+
+from .const import (
+    CS_VALUE_LIST,
+    ERR_VALUE_LIST,
+    MPPT_VALUE_LIST,
+    OR_VALUE_LIST,
+    PID_VALUE_LIST,
+)
+
+VE_DIRECT_BAUDRATE = 19200
+
+# HEX protocol commands (VE.Direct Protocol 3.32, chapter 4)
+HEX_CMD_PING = 0x1
+HEX_CMD_GET = 0x7
+HEX_CMD_SET = 0x8
+
+# HEX protocol responses
+HEX_RSP_DONE = 0x1
+HEX_RSP_UNKNOWN = 0x3
+HEX_RSP_ERROR = 0x4
+HEX_RSP_PING = 0x5
+HEX_RSP_GET = 0x7
+HEX_RSP_SET = 0x8
+HEX_RSP_ASYNC = 0xA
+
+# Get/Set response flags
+HEX_FLAG_UNKNOWN_ID = 0x01
+HEX_FLAG_NOT_SUPPORTED = 0x02
+HEX_FLAG_PARAMETER_ERROR = 0x04
+
+# Registers
+REG_BATTERY_VOLTAGE = 0xED8D  # un16, 0.01 V
+REG_BATTERY_CURRENT = 0xED8F  # sn16, 0.1 A
+REG_PANEL_VOLTAGE = 0xEDBB  # un16, 0.01 V
+REG_PANEL_POWER = 0xEDBC  # un32, 0.01 W
+REG_LOAD_CURRENT = 0xEDAD  # un16, 0.1 A
+REG_HISTORY_DAY_0 = 0x1050  # today, 0x1051 yesterday ... up to 0x106E
+
+
+# Decoding tables, keyed by the numeric value of the field
+PID_LABELS = {int(_key, 16): _label for _key, _label in PID_VALUE_LIST.items()}
+CS_LABELS = {int(_key): _label for _key, _label in CS_VALUE_LIST.items()}
+MPPT_LABELS = {int(_key): _label for _key, _label in MPPT_VALUE_LIST.items()}
+ERR_LABELS = {int(_key): _label for _key, _label in ERR_VALUE_LIST.items()}
+OR_NO_REASON = OR_VALUE_LIST["0x00000000"]
+OR_FLAG_LABELS = tuple(
+    (int(_key, 16), _label.strip())
+    for _key, _label in OR_VALUE_LIST.items()
+    if int(_key, 16) != 0
+)
+
+
+class VEDirectHexError(Exception):
+    """Error returned by a VE Direct HEX request"""
+
+
+def hex_frame(command: int, payload: bytes = b"") -> bytes:
+    """Encode a HEX frame, checksum makes command + payload sum 0x55"""
+    _checksum = (0x55 - command - sum(payload)) & 0xFF
+    return f":{command:X}{payload.hex().upper()}{_checksum:02X}\n".encode("ascii")
+
+
+@dataclass(frozen=True, slots=True)
+class VEDirectRecord:
+    """Text block decoded to native values.
+
+    Voltages are in mV, currents in mA, powers in W and yields in 0.01 kWh.
+    Fields missing from the block or not parseable are None.
+    """
+
+    product_id: Optional[str]
+    firmware: Optional[str]
+    serial_number: Optional[str]
+    state_of_operation: Optional[str]
+    tracker_operation_mode: Optional[str]
+    off_reason: Optional[str]
+    off_reason_flags: Tuple[str, ...]
+    error_reason: Optional[str]
+    day_seq_number: Optional[int]
+    checksum: Optional[str]
+    load_state: Optional[bool]
+    load_current: Optional[int]
+    battery_voltage: Optional[int]
+    battery_current: Optional[int]
+    panel_voltage: Optional[int]
+    panel_power: Optional[int]
+    yield_total: Optional[int]
+    yield_today: Optional[int]
+    max_power_today: Optional[int]
+    yield_yesterday: Optional[int]
+    max_power_yesterday: Optional[int]
+
+
+def _int(value: Optional[str], base: int = 10) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value, base)
+    except ValueError:
+        return None
+
+
+def _off_reason_flags(value: Optional[int]) -> Tuple[str, ...]:
+    if not value:
+        return ()
+    return tuple(_label for _bit, _label in OR_FLAG_LABELS if value & _bit)
+
+
+def decode_block(block: Dict[str, str]) -> VEDirectRecord:
+    """Decode the raw text fields of a block, once per block"""
+    _off_reason = _int(block.get("OR"), 16)
+    _flags = _off_reason_flags(_off_reason)
+    _load = block.get("LOAD")
+
+    return VEDirectRecord(
+        product_id=PID_LABELS.get(_int(block.get("PID"), 16)),
+        firmware=block.get("FW"),
+        serial_number=block.get("SER#"),
+        state_of_operation=CS_LABELS.get(_int(block.get("CS"))),
+        tracker_operation_mode=MPPT_LABELS.get(_int(block.get("MPPT"))),
+        off_reason=(
+            ", ".join(_flags) if _flags else OR_NO_REASON if _off_reason == 0 else None
+        ),
+        off_reason_flags=_flags,
+        error_reason=ERR_LABELS.get(_int(block.get("ERR"))),
+        day_seq_number=_int(block.get("HSDS")),
+        checksum=block.get("Checksum"),
+        load_state=None if _load is None else _load == "ON",
+        load_current=_int(block.get("IL")),
+        battery_voltage=_int(block.get("V")),
+        battery_current=_int(block.get("I")),
+        panel_voltage=_int(block.get("VPV")),
+        panel_power=_int(block.get("PPV")),
+        yield_total=_int(block.get("H19")),
+        yield_today=_int(block.get("H20")),
+        max_power_today=_int(block.get("H21")),
+        yield_yesterday=_int(block.get("H22")),
+        max_power_yesterday=_int(block.get("H23")),
+    )
+
+
+class VEDirectTextParser:
+    """Incremental VE Direct text protocol parser.
+
+    Bytes are fed as they arrive and a block is only returned once its
+    checksum has been validated: the sum of every byte of the block, from the
+    leading ``\\r\\n`` up to and including the checksum byte, must be 0
+    modulo 256 (VE.Direct Protocol 3.32, chapter 2). HEX frames found in the
+    stream, even in the middle of a block, are passed without the leading ':'
+    and trailing '\\n' to ``on_hex_frame`` and the block resumes after them.
+    """
+
+    WAIT_HEADER = 0
+    IN_KEY = 1
+    IN_VALUE = 2
+    IN_CHECKSUM = 3
+    HEX = 4
+
+    _CR = ord("\r")
+    _LF = ord("\n")
+    _TAB = ord("\t")
+    _COLON = ord(":")
+
+    def __init__(self, on_hex_frame: Callable[[bytes], None] = None) -> None:
+        self.invalid_blocks = 0
+        self._on_hex_frame = on_hex_frame
+        self._state = self.WAIT_HEADER
+        self._hex_resume_state = self.WAIT_HEADER
+        self._bytes_sum = 0
+        self._key = bytearray()
+        self._value = bytearray()
+        self._hex = bytearray()
+        self._block = {}
+
+    def feed(self, data: bytes) -> List[Dict[str, str]]:
+        """Feed received bytes, return the valid blocks completed by them"""
+        _blocks = []
+        for _byte in data:
+            _block = self._input(_byte)
+            if _block is not None:
+                _blocks.append(_block)
+
+        return _blocks
+
+    def _input(self, byte: int):
+        # HEX frames may be interleaved anywhere in the text blocks, they start
+        # with ':' and end with '\n' and do not count for the text checksum
+        if byte == self._COLON and self._state != self.IN_CHECKSUM:
+            # a ':' in a HEX frame starts over a truncated one
+            if self._state != self.HEX:
+                self._hex_resume_state = self._state
+            self._state = self.HEX
+            self._hex.clear()
+            return None
+
+        if self._state == self.WAIT_HEADER:
+            self._bytes_sum += byte
+            if byte == self._LF:
+                self._state = self.IN_KEY
+
+        elif self._state == self.IN_KEY:
+            self._bytes_sum += byte
+            if byte == self._TAB:
+                if self._key == b"Checksum":
+                    self._state = self.IN_CHECKSUM
+                else:
+                    self._state = self.IN_VALUE
+            else:
+                self._key.append(byte)
+
+        elif self._state == self.IN_VALUE:
+            self._bytes_sum += byte
+            if byte == self._CR:
+                self._block[self._key.decode("ascii", "ignore")] = self._value.decode(
+                    "ascii", "ignore"
+                )
+                self._key.clear()
+                self._value.clear()
+                self._state = self.WAIT_HEADER
+            else:
+                self._value.append(byte)
+
+        elif self._state == self.IN_CHECKSUM:
+            self._bytes_sum += byte
+            _valid = self._bytes_sum % 256 == 0
+            _block = self._block
+            _block["Checksum"] = f"0x{byte:02X}"
+
+            self._block = {}
+            self._key.clear()
+            self._value.clear()
+            self._bytes_sum = 0
+            self._state = self.WAIT_HEADER
+
+            if _valid:
+                return _block
+
+            self.invalid_blocks += 1
+
+        elif self._state == self.HEX:
+            if byte == self._LF:
+                self._state = self._hex_resume_state
+                if self._on_hex_frame is not None:
+                    self._on_hex_frame(bytes(self._hex))
+            else:
+                self._hex.append(byte)
+
+        return None
+
+
+class VEDirectHexClient:
+    """VE Direct HEX protocol client.
+
+    Requests are written straight away and several of them may be
+    outstanding at once, responses are matched to them by command and
+    register as they are found in the stream.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes], None],
+        logger: logging.Logger,
+        on_async: Callable[[int, bytes], None] = None,
+        max_pending: int = 4,
+        timeout: float = 1.0,
+    ) -> None:
+        self.logger = logger
+        self.timeout = timeout
+        self._write = write
+        self._on_async = on_async
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending = deque()
+
+    async def async_ping(self) -> int:
+        """Ping the device, return the firmware version"""
+        _payload = await self._async_request(HEX_CMD_PING, b"", (HEX_RSP_PING, None))
+        return int.from_bytes(_payload, "little")
+
+    async def async_get(self, register: int) -> bytes:
+        """Read a register, return its raw little endian value"""
+        _id = register.to_bytes(2, "little")
+        _payload = await self._async_request(
+            HEX_CMD_GET, _id + b"\x00", (HEX_RSP_GET, register)
+        )
+        return self._check_flags(register, _payload)
+
+    async def async_set(self, register: int, value: bytes) -> bytes:
+        """Write a register, return the value echoed by the device"""
+        _id = register.to_bytes(2, "little")
+        _payload = await self._async_request(
+            HEX_CMD_SET, _id + b"\x00" + value, (HEX_RSP_SET, register)
+        )
+        return self._check_flags(register, _payload)
+
+    def handle_frame(self, frame: bytes) -> None:
+        """Match a received HEX frame with the request waiting for it"""
+        try:
+            _command = int(frame[:1], 16)
+            _data = bytes.fromhex(frame[1:].decode("ascii"))
+        except ValueError:
+            self.logger.warning(f"HEX frame not valid: {frame}")
+            return
+
+        if (_command + sum(_data)) & 0xFF != 0x55:
+            self.logger.warning(f"HEX frame checksum not valid: {frame}")
+            return
+
+        _payload = _data[:-1]
+
+        if _command in (HEX_RSP_GET, HEX_RSP_SET, HEX_RSP_ASYNC):
+            if len(_payload) < 3:
+                self.logger.warning(f"HEX frame too short: {frame}")
+                return
+            _key = (_command, int.from_bytes(_payload[:2], "little"))
+        else:
+            _key = (_command, None)
+
+        if _command == HEX_RSP_ASYNC:
+            if self._on_async is not None:
+                self._on_async(_key[1], _payload[3:])
+            return
+
+        if _command in (HEX_RSP_UNKNOWN, HEX_RSP_ERROR):
+            # not tied to a register, fail the oldest request
+            if self._pending:
+                _, _future = self._pending.popleft()
+                if not _future.done():
+                    _future.set_exception(
+                        VEDirectHexError(f"Request rejected with response {_command}")
+                    )
+            return
+
+        for _item in self._pending:
+            if _item[0] == _key:
+                self._pending.remove(_item)
+                if not _item[1].done():
+                    _item[1].set_result(_payload)
+                return
+
+        self.logger.debug(f"Unexpected HEX response: {frame}")
+
+    async def _async_request(self, command: int, payload: bytes, key) -> bytes:
+        async with self._slots:
+            _item = (key, asyncio.get_running_loop().create_future())
+            self._pending.append(_item)
+            self._write(hex_frame(command, payload))
+            try:
+                return await asyncio.wait_for(_item[1], self.timeout)
+            finally:
+                if _item in self._pending:
+                    self._pending.remove(_item)
+
+    @staticmethod
+    def _check_flags(register: int, payload: bytes) -> bytes:
+        _flags = payload[2]
+        if _flags & HEX_FLAG_UNKNOWN_ID:
+            raise VEDirectHexError(f"Unknown register 0x{register:04X}")
+        if _flags & HEX_FLAG_NOT_SUPPORTED:
+            raise VEDirectHexError(f"Register 0x{register:04X} not supported")
+        if _flags & HEX_FLAG_PARAMETER_ERROR:
+            raise VEDirectHexError(f"Parameter error on register 0x{register:04X}")
+
+        return payload[3:]
+
+
+class VEDirectReader:
+    """Non blocking VE Direct stream reader.
+
+    The serial port is opened in non blocking mode and registered with the
+    event loop, so bytes are consumed as soon as they arrive instead of being
+    polled with a blocking ``read_all()``. Only checksum validated text blocks
+    are handed to ``on_frame``, HEX requests share the same port through
+    ``hex``.
+    """
+
+    def __init__(
+        self,
+        port: str,
+        on_frame: Callable[[Dict[str, str]], None],
+        logger: logging.Logger,
+        baudrate: int = VE_DIRECT_BAUDRATE,
+    ) -> None:
+        self.port = port
+        self.logger = logger
+        self._on_frame = on_frame
+        self._serial = serial.Serial(port, baudrate=baudrate, timeout=0)
+        self._loop = None
+        self.hex = VEDirectHexClient(self.write, logger)
+        self._parser = VEDirectTextParser(on_hex_frame=self.hex.handle_frame)
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start consuming the serial port on the given loop"""
+        self._loop = loop
+        self._loop.add_reader(self._serial.fileno(), self._on_readable)
+
+    def stop(self) -> None:
+        """Stop consuming and close the serial port"""
+        if self._loop is not None:
+            self._loop.remove_reader(self._serial.fileno())
+            self._loop = None
+        self._serial.close()
+
+    def write(self, data: bytes) -> None:
+        """Write raw bytes to the serial port"""
+        self._serial.write(data)
+
+    def _on_readable(self) -> None:
+        """Read whatever is available without blocking"""
+        try:
+            _chunk = self._serial.read(self._serial.in_waiting or 1)
+        except serial.SerialException as err:
+            self.logger.error(f"Error reading {self.port}: {err}")
+            return
+
+        self.feed(_chunk)
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse a chunk, partial blocks are kept by the parser"""
+        _invalid = self._parser.invalid_blocks
+        for _frame in self._parser.feed(chunk):
+            self._on_frame(_frame)
+
+        if self._parser.invalid_blocks != _invalid:
+            self.logger.warning(f"Discarded corrupt VE Direct block on {self.port}")
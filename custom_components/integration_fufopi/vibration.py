@@ -0,0 +1,174 @@
+""" ADXL345 vibration capture """
+import asyncio
+from dataclasses import dataclass
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ring_buffer import SampleRingBuffer
+
+
+@dataclass(frozen=True, slots=True)
+class VibrationStats:
+    """Dynamic acceleration over the captured window, in m/s²"""
+
+    rms: float
+    peak: float
+    crest_factor: float
+
+
+def vibration_stats(x, y, z) -> VibrationStats:
+    """return the statistics of the acceleration vector without its mean
+
+    Removing the mean of each axis drops gravity and the mounting tilt, what
+    is left is the vibration.
+    """
+    _axes = np.array([x, y, z], dtype=np.float64)
+    _dynamic = _axes - _axes.mean(axis=1, keepdims=True)
+    _magnitude = np.sqrt((_dynamic**2).sum(axis=0))
+
+    _rms = float(np.sqrt((_magnitude**2).mean()))
+    _peak = float(_magnitude.max())
+
+    return VibrationStats(
+        rms=_rms,
+        peak=_peak,
+        crest_factor=_peak / _rms if _rms > 0 else 0.0,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class VibrationSpectrum:
+    """Spectral summary of the captured window"""
+
+    # frequency of the strongest bin, DC excluded, in Hz
+    dominant_frequency: float
+    # square root of the energy in each band, in m/s²
+    band_rms: Tuple[float, ...]
+
+
+def vibration_spectrum(
+    x,
+    y,
+    z,
+    rate_hz: float,
+    block_size: int,
+    bands: Sequence[Tuple[float, float]],
+) -> Optional[VibrationSpectrum]:
+    """return the spectrum of the samples, averaged over blocks of block_size
+
+    Every block is detrended and Hann windowed, the power of the three axes is
+    summed and averaged over the blocks. None if there is not a full block.
+    """
+    _axes = np.array([x, y, z], dtype=np.float64)
+    _blocks = _axes.shape[1] // block_size
+    if _blocks == 0:
+        return None
+
+    _axes = _axes[:, _axes.shape[1] - _blocks * block_size :]
+    _axes = _axes.reshape(3, _blocks, block_size)
+    _axes = _axes - _axes.mean(axis=2, keepdims=True)
+
+    _window = np.hanning(block_size)
+    _power = np.abs(np.fft.rfft(_axes * _window, axis=2)) ** 2
+    _power = _power.sum(axis=0).mean(axis=0)
+
+    # one sided mean square per bin, so the bins add up to the signal power
+    _power /= block_size * (_window**2).sum()
+    _power[1:] *= 2
+    if block_size % 2 == 0:
+        _power[-1] /= 2
+
+    _frequencies = np.fft.rfftfreq(block_size, 1.0 / rate_hz)
+    _bands = [(_frequencies >= _low) & (_frequencies < _high) for _low, _high in bands]
+
+    return VibrationSpectrum(
+        dominant_frequency=float(_frequencies[1 + np.argmax(_power[1:])]),
+        band_rms=tuple(float(np.sqrt(_power[_band].sum())) for _band in _bands),
+    )
+
+
+class ADXL345FifoStream:
+    """Drain the ADXL345 FIFO in stream mode from a background task.
+
+    The FIFO keeps the last 32 samples, it is emptied every watermark samples
+    into one ring buffer per axis. At 100 kHz an I2C sample read takes about
+    1 ms, rates above 400 Hz can not be sustained.
+    """
+
+    def __init__(
+        self,
+        adxl,
+        logger: logging.Logger,
+        rate: int = 0x0D,
+        watermark: int = 16,
+        buffer_size: int = 1024,
+    ) -> None:
+        self.adxl = adxl
+        self.logger = logger
+        # bandwidth rate code, 400 Hz by default
+        self.rate = rate
+        self.watermark = watermark
+        self.buffers = tuple(SampleRingBuffer(buffer_size) for _ in range(3))
+        self.overruns = 0
+        self._task = None
+
+    @property
+    def rate_hz(self) -> int:
+        """return the output data rate in Hz"""
+        return self.adxl.BANDWIDTH_RATE_HZ[self.rate]
+
+    @property
+    def count(self) -> int:
+        """return the number of buffered samples"""
+        return self.buffers[0].count
+
+    @property
+    def latest(self) -> Optional[Tuple[float, float, float]]:
+        """return the last sample, None if empty"""
+        if self.count == 0:
+            return None
+        return tuple(_buffer.latest for _buffer in self.buffers)
+
+    def stats(self) -> Optional[VibrationStats]:
+        """return the vibration statistics of the buffered samples"""
+        if self.count < 2:
+            return None
+        return vibration_stats(*(_buffer.values() for _buffer in self.buffers))
+
+    def window(self) -> Tuple:
+        """return a copy of the buffered samples of the three axes"""
+        return tuple(_buffer.values() for _buffer in self.buffers)
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """start streaming"""
+        self._task = loop.create_task(self._async_run())
+
+    def stop(self) -> None:
+        """stop streaming"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_run(self) -> None:
+        await self.adxl.async_set_bandwidth_rate(self.rate)
+        await self.adxl.async_set_fifo_mode(self.adxl.FIFO_MODE_STREAM, self.watermark)
+        _interval = self.watermark / self.rate_hz
+
+        while True:
+            try:
+                _entries = await self.adxl.async_fifo_entries()
+                if _entries >= self.adxl.FIFO_SIZE:
+                    # samples were dropped since the last drain
+                    self.overruns += 1
+                if _entries:
+                    for _sample in await self.adxl.async_read_fifo(_entries):
+                        for _buffer, _value in zip(self.buffers, _sample):
+                            _buffer.append(_value)
+            except OSError as err:
+                self.logger.warning(f"ADXL345 FIFO read failed: {err}")
+                await asyncio.sleep(1)
+                continue
+
+            await asyncio.sleep(_interval)
@@ -0,0 +1,101 @@
+"""Test the ACS712 zero offset learning."""
+from datetime import timedelta
+import logging
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.integration_fufopi.acs712_calibration import (
+    ACS712_SENSITIVITY,
+    ACS712_ZERO_MV,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    ACS712Calibration,
+)
+from custom_components.integration_fufopi.adc_filter import ChannelStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _adc(mean, ac_rms=1.0):
+    """Build the ADC channels with channel 3 at mean mV."""
+    _idle = ChannelStats(ACS712_ZERO_MV, ACS712_ZERO_MV, 0.0)
+    return (_idle, _idle, _idle, ChannelStats(mean, mean, ac_rms))
+
+
+def _calibration(hass):
+    """Build a calibration of channel 3 switched by relay 0."""
+    return ACS712Calibration(hass, _LOGGER, {3: 0}, settle_time=5.0, alpha=0.5)
+
+
+async def test_zero_learned_only_with_relay_settled_off(hass):
+    """Test the zero is learned once the relay has been off long enough."""
+    calibration = _calibration(hass)
+    adc = _adc(ACS712_ZERO_MV + 20.0)
+
+    calibration.async_update(adc, (True,), 0.0)
+    calibration.async_update(adc, (False,), 1.0)
+    calibration.async_update(adc, (False,), 5.0)
+    assert calibration.zero(3) == ACS712_ZERO_MV
+
+    calibration.async_update(adc, (False,), 6.0)
+    assert calibration.zero(3) == ACS712_ZERO_MV + 10.0
+
+    # switching the relay on restarts the settle time
+    calibration.async_update(adc, (True,), 7.0)
+    calibration.async_update(adc, (False,), 8.0)
+    assert calibration.zero(3) == ACS712_ZERO_MV + 10.0
+
+
+async def test_zero_averages_quiet_windows_only(hass):
+    """Test the zero follows the mean with an EMA, skipping bad windows."""
+    calibration = _calibration(hass)
+    calibration.async_update(_adc(ACS712_ZERO_MV), (False,), 0.0)
+
+    calibration.async_update(_adc(ACS712_ZERO_MV + 20.0), (False,), 10.0)
+    calibration.async_update(_adc(ACS712_ZERO_MV + 20.0), (False,), 12.0)
+    assert calibration.zero(3) == pytest.approx(ACS712_ZERO_MV + 15.0)
+
+    # still carrying current, then a wiring fault, then no samples
+    calibration.async_update(_adc(ACS712_ZERO_MV, ac_rms=50.0), (False,), 14.0)
+    calibration.async_update(_adc(ACS712_ZERO_MV + 500.0), (False,), 16.0)
+    calibration.async_update((None, None, None, None), (False,), 18.0)
+    assert calibration.zero(3) == pytest.approx(ACS712_ZERO_MV + 15.0)
+
+
+async def test_calibration_round_trip(hass, hass_storage):
+    """Test the learned zero is saved while learning goes on and restored."""
+    calibration = _calibration(hass)
+    calibration.async_update(_adc(ACS712_ZERO_MV + 20.0), (False,), 0.0)
+    calibration.async_update(_adc(ACS712_ZERO_MV + 20.0), (False,), 10.0)
+
+    # learning at every refresh must not postpone the save
+    _now = dt_util.utcnow()
+    async_fire_time_changed(hass, _now + timedelta(seconds=STORAGE_SAVE_DELAY / 2))
+    calibration.async_update(_adc(ACS712_ZERO_MV + 20.0), (False,), 12.0)
+    async_fire_time_changed(hass, _now + timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    assert hass_storage[STORAGE_KEY]["data"]["channels"]["3"] == {
+        "zero": round(ACS712_ZERO_MV + 15.0, 2),
+        "sensitivity": ACS712_SENSITIVITY,
+    }
+
+    restored = _calibration(hass)
+    await restored.async_load()
+    assert restored.zero(3) == pytest.approx(ACS712_ZERO_MV + 15.0)
+    assert restored.sensitivity(3) == ACS712_SENSITIVITY
+
+
+async def test_calibration_saved_on_stop(hass, hass_storage):
+    """Test the learned zero is written at once, without the save delay."""
+    calibration = _calibration(hass)
+    calibration.async_update(_adc(ACS712_ZERO_MV + 20.0), (False,), 0.0)
+    calibration.async_update(_adc(ACS712_ZERO_MV + 20.0), (False,), 10.0)
+
+    await calibration.async_save()
+
+    assert hass_storage[STORAGE_KEY]["data"]["channels"]["3"]["zero"] == round(
+        ACS712_ZERO_MV + 10.0, 2
+    )
@@ -0,0 +1,57 @@
+"""Test ADC sample filtering."""
+
+from array import array
+
+import numpy as np
+import pytest
+
+from custom_components.integration_fufopi.adc_filter import (
+    FILTER_BOXCAR,
+    FILTER_EMA,
+    FILTER_MEDIAN,
+    ChannelFilter,
+    decimate,
+    filter_samples,
+)
+
+
+def test_decimate_drops_oldest_incomplete_group():
+    """Test groups are aligned on the newest sample."""
+    samples = np.array([100.0, 1.0, 3.0, 5.0, 7.0])
+
+    assert list(decimate(samples, 2)) == [2.0, 6.0]
+
+
+def test_filter_boxcar_and_median():
+    """Test the median rejects a spike the boxcar average does not."""
+    samples = array("d", [2400.0] * 7 + [4000.0])
+
+    boxcar = filter_samples(samples, ChannelFilter(FILTER_BOXCAR, oversampling=1))
+    median = filter_samples(samples, ChannelFilter(FILTER_MEDIAN, oversampling=1))
+
+    assert boxcar.value == 2600.0
+    assert median.value == 2400.0
+
+
+def test_filter_ema_weights_newest_samples():
+    """Test the EMA follows a step faster than the mean."""
+    samples = [0.0] * 4 + [100.0] * 4
+
+    stats = filter_samples(samples, ChannelFilter(FILTER_EMA, 1, ema_alpha=0.5))
+
+    assert stats.mean == 50.0
+    assert stats.value > 90.0
+
+
+def test_filter_rms():
+    """Test the RMS combines the offset and the AC component."""
+    stats = filter_samples([2400.0 - 30.0, 2400.0 + 30.0] * 4, ChannelFilter())
+
+    assert stats.ac_rms == 30.0
+    assert stats.rms(2400.0) == 30.0
+    assert stats.rms(2360.0) == pytest.approx(50.0)
+
+
+def test_filter_empty_buffer():
+    """Test an empty buffer is reported as no data, not 0 mV."""
+    assert filter_samples(array("d"), ChannelFilter()) is None
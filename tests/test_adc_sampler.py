@@ -0,0 +1,60 @@
+"""Test the ADS1115 background sampler."""
+import asyncio
+import logging
+from unittest.mock import patch
+
+from custom_components.integration_fufopi import adc_sampler
+from custom_components.integration_fufopi.adc_sampler import ADS1115Sampler
+
+
+class _FakeBus:
+    """I2C worker running the jobs inline."""
+
+    async def run_job(self, job, *args):
+        await asyncio.sleep(0)
+        return job(None, *args)
+
+
+class _FakeADS1115:
+    """ADS1115 converting every channel to 100 mV times its number."""
+
+    def __init__(self):
+        self.i2c = _FakeBus()
+
+    def convert(self, bus, channel, pga, sps, timeout, wait_ready=None):
+        return 100.0 * channel
+
+
+async def test_sampler_converts_rounds_in_jobs():
+    """Test a job samples several rounds and fills every channel buffer."""
+    adc = _FakeADS1115()
+    sampler = ADS1115Sampler(adc, logging.getLogger(__name__), rounds_per_job=4)
+
+    sampler.start(asyncio.get_running_loop())
+    assert await sampler.async_wait_round(1.0)
+    sampler.stop()
+
+    for _channel in sampler.channels:
+        assert sampler.buffers[_channel].count % 4 == 0
+        assert sampler.buffers[_channel].latest == 100.0 * _channel
+
+
+async def test_sampler_polls_when_ready_pin_fails():
+    """Test a failed ALERT/RDY setup falls back to polling, not to no data."""
+
+    class _NoReadyPinADS1115(_FakeADS1115):
+        async def enable_ready_pin(self):
+            raise OSError("no ack")
+
+    sampler = ADS1115Sampler(
+        _NoReadyPinADS1115(), logging.getLogger(__name__), rdy_pin=7
+    )
+
+    with patch.object(adc_sampler, "GPIO") as gpio:
+        sampler.start(asyncio.get_running_loop())
+        assert await sampler.async_wait_round(1.0)
+        sampler.stop()
+
+    gpio.remove_event_detect.assert_called_once_with(7)
+    assert sampler.rdy_pin is None
+    assert sampler.missed_ready == 0
@@ -0,0 +1,27 @@
+"""Test the coulomb counter persistence."""
+import logging
+
+from custom_components.integration_fufopi.battery_monitor import (
+    STORAGE_KEY,
+    BatteryMonitor,
+)
+from custom_components.integration_fufopi.battery_soc import ELEKSOL_GEL_100AH
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_soc_saved_on_stop_and_restored(hass, hass_storage):
+    """Test the state of charge is written at once and resumed after a reload."""
+    monitor = BatteryMonitor(hass, _LOGGER, ELEKSOL_GEL_100AH)
+    monitor.counter.soc = 62.5
+
+    await monitor.async_save()
+
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        "profile": ELEKSOL_GEL_100AH.name,
+        "soc": 62.5,
+    }
+
+    restored = BatteryMonitor(hass, _LOGGER, ELEKSOL_GEL_100AH)
+    await restored.async_load()
+    assert restored.counter.soc == 62.5
@@ -0,0 +1,148 @@
+"""Test the battery state of charge engine."""
+
+import pytest
+
+from custom_components.integration_fufopi.battery_soc import (
+    ELEKSOL_GEL_100AH,
+    BatteryProfile,
+    CoulombCounter,
+    SoCEngine,
+)
+
+PROFILE = BatteryProfile(
+    name="test",
+    capacity=100.0,
+    ocv_curve=((12000.0, 0.0), (13000.0, 100.0)),
+    internal_resistance=10.0,
+    temperature_coefficient=2.0,
+)
+
+
+def test_voltage_soc_interpolates_and_clamps():
+    """Test the curve is interpolated and clamped to 0-100 %."""
+    engine = SoCEngine(PROFILE)
+
+    assert engine.voltage_soc(12500.0) == 50.0
+    assert engine.voltage_soc(11000.0) == 0.0
+    assert engine.voltage_soc(14400.0) == 100.0
+
+
+def test_voltage_soc_load_compensation():
+    """Test the drop under a 10 A load is added back."""
+    engine = SoCEngine(PROFILE)
+
+    assert engine.resting_voltage(12400.0, -10000.0) == 12500.0
+    assert engine.voltage_soc(12400.0, -10000.0) == 50.0
+
+
+def test_voltage_soc_temperature_compensation():
+    """Test the voltage is brought back to 25 °C."""
+    engine = SoCEngine(PROFILE)
+
+    assert engine.resting_voltage(12480.0, 0.0, 15.0) == 12500.0
+
+
+def test_battery_state_without_voltage():
+    """Test no state is computed before the voltage is known."""
+    engine = SoCEngine(ELEKSOL_GEL_100AH)
+
+    assert engine.state(None, None) is None
+    assert engine.state(12850, None).voltage_soc == pytest.approx(100.0)
+
+
+def test_profile_must_be_ascending():
+    """Test a curve with voltages out of order is refused."""
+    with pytest.raises(ValueError):
+        SoCEngine(
+            BatteryProfile("bad", 1.0, ((13000.0, 100.0), (12000.0, 0.0)), 0.0, 0.0)
+        )
+
+
+def test_coulomb_counter_integrates_current():
+    """Test one hour at -10 A takes 10 % of a 100 Ah battery."""
+    counter = CoulombCounter(PROFILE)
+
+    assert counter.update(0.0, -10000.0, 50.0, False) == 50.0
+    for _second in range(1, 3601):
+        counter.update(float(_second), -10000.0, 50.0, False)
+
+    assert counter.soc == pytest.approx(40.0)
+
+
+
+def test_coulomb_counter_skips_stale_samples():
+    """Test the record of a silent charger is not integrated again."""
+    counter = CoulombCounter(PROFILE)
+    counter.update(0.0, -10000.0, 50.0, False)
+    counter.update(36.0, -10000.0, 50.0, False)
+
+    # the serial link died, the refreshes keep handing over the last record
+    for _refresh in range(100):
+        counter.update(36.0, -10000.0, 50.0, False)
+
+    assert counter.soc == pytest.approx(49.9)
+
+    # it comes back later than max_gap, the silence is not guessed either
+    counter.update(136.0, -10000.0, 50.0, False)
+    assert counter.soc == pytest.approx(49.9)
+
+def test_coulomb_counter_efficiency_and_peukert():
+    """Test charge is derated and high discharge currents drain faster."""
+    profile = BatteryProfile(
+        "test",
+        100.0,
+        PROFILE.ocv_curve,
+        0.0,
+        0.0,
+        rated_hours=20.0,
+        peukert_exponent=1.2,
+        charge_efficiency=0.8,
+    )
+    counter = CoulombCounter(profile)
+    counter.update(0.0, 10000.0, 50.0, False)
+    counter.update(36.0, 10000.0, 50.0, False)
+    assert counter.soc == pytest.approx(50.08)
+
+    counter = CoulombCounter(profile)
+    counter.update(0.0, -20000.0, 50.0, False)
+    counter.update(36.0, -20000.0, 50.0, False)
+    # 20 A is 4 times the 20 h rate
+    assert counter.soc == pytest.approx(50.0 - 0.2 * 4**0.2)
+
+
+def test_coulomb_counter_skips_gaps():
+    """Test the charge of an interval without samples is not guessed."""
+    counter = CoulombCounter(PROFILE, max_gap=60.0)
+    counter.update(0.0, -10000.0, 50.0, False)
+    counter.update(3600.0, -10000.0, 50.0, False)
+
+    assert counter.soc == 50.0
+
+
+def test_coulomb_counter_drift_correction():
+    """Test float resets to 100 % and rest pulls to the voltage estimate."""
+    counter = CoulombCounter(PROFILE)
+    counter.update(0.0, 2000.0, 50.0, False)
+    assert counter.update(2.0, 2000.0, 90.0, True) == 100.0
+
+    counter = CoulombCounter(PROFILE, rest_time=10.0, rest_gain=0.5)
+    counter.soc = 60.0
+    counter.update(0.0, 0.0, 40.0, False)
+    assert counter.soc == 60.0
+    counter.update(10.0, 0.0, 40.0, False)
+    assert counter.soc == pytest.approx(50.0)
+    counter.update(12.0, -5000.0, 40.0, False)
+    counter.update(14.0, 0.0, 40.0, False)
+    # the rest restarted with the load
+    assert counter.soc < 50.0 and counter.soc > 49.9
+
+
+def test_coulomb_counter_times():
+    """Test the time left follows the present current."""
+    counter = CoulombCounter(PROFILE)
+    counter.update(0.0, 0.0, 50.0, False)
+
+    assert counter.time_to_empty(-10000.0) == pytest.approx(5 * 3600.0)
+    assert counter.time_to_full(10000.0) == pytest.approx(5 * 3600.0)
+    assert counter.time_to_empty(0.0) is None
+    assert counter.time_to_full(-10000.0) is None
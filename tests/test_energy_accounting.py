@@ -0,0 +1,24 @@
+"""Test the energy totals persistence."""
+import logging
+
+from custom_components.integration_fufopi.energy_accounting import (
+    STORAGE_KEY,
+    EnergyAccounting,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_totals_saved_on_stop_and_restored(hass, hass_storage):
+    """Test the totals are written at once and resumed by the next instance."""
+    accounting = EnergyAccounting(hass, _LOGGER, ("load",))
+    accounting.async_update({"load": 360.0}, 0.0)
+    accounting.async_update({"load": 360.0}, 10.0)
+
+    await accounting.async_save()
+
+    assert hass_storage[STORAGE_KEY]["data"]["totals"] == {"load": 1.0}
+
+    restored = EnergyAccounting(hass, _LOGGER, ("load",))
+    await restored.async_load()
+    assert restored.async_update({}, 20.0)["load"] == 1.0
@@ -0,0 +1,42 @@
+"""Test the energy integration."""
+
+import pytest
+
+from custom_components.integration_fufopi.energy_meter import EnergyMeter
+
+
+def test_energy_meter_trapezoid():
+    """Test a power ramp is integrated with the mean of both ends."""
+    meter = EnergyMeter(("load",))
+
+    meter.update(0.0, {"load": 0.0})
+    meter.update(36.0, {"load": 200.0})
+
+    assert meter.totals["load"] == pytest.approx(1.0)
+
+
+def test_energy_meter_gaps_and_missing_powers():
+    """Test intervals without a measurement at both ends are skipped."""
+    meter = EnergyMeter(("load", "fridge"), max_gap=60.0)
+
+    meter.update(0.0, {"load": 100.0, "fridge": 50.0})
+    meter.update(3600.0, {"load": 100.0, "fridge": None})
+    meter.update(3636.0, {"load": 100.0, "fridge": 50.0})
+    meter.update(3672.0, {"load": -10.0, "fridge": 50.0})
+
+    # the negative power counts as 0
+    assert meter.totals["load"] == pytest.approx(1.5)
+    assert meter.totals["fridge"] == pytest.approx(0.5)
+
+
+def test_energy_meter_restore():
+    """Test a restart adds to the saved totals without the down time."""
+    meter = EnergyMeter(("load",))
+    meter.update(0.0, {"load": 100.0})
+
+    meter.restore({"load": 10.0, "removed": 5.0})
+    meter.update(10.0, {"load": 100.0})
+    assert meter.totals == {"load": 10.0}
+
+    meter.update(46.0, {"load": 100.0})
+    assert meter.totals["load"] == pytest.approx(11.0)
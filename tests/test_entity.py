@@ -0,0 +1,81 @@
+"""Test the entities added before the first coordinator refresh."""
+from functools import partial
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import STATE_UNAVAILABLE
+
+from custom_components.integration_fufopi.acs714 import ACS712Sensor
+from custom_components.integration_fufopi.ads1115 import ADS1115Sensor
+from custom_components.integration_fufopi.adxl345 import (
+    ADXL345AccelXSensor,
+    ADXL345BandSensor,
+    ADXL345DominantFrequencySensor,
+    ADXL345PowerSwitch,
+    ADXL345VibrationRMSSensor,
+)
+from custom_components.integration_fufopi.battery import (
+    BatteryChargeSensor,
+    BatteryPerCentSensor,
+    BatteryTimeToEmptySensor,
+)
+from custom_components.integration_fufopi.compass import (
+    CompassCalibrationSwitch,
+    CompassHeadingSensor,
+    CompassPitchSensor,
+)
+from custom_components.integration_fufopi.hmc5883L import (
+    HCM5883LContinuosModeSwitch,
+    HCM5883LMagXSensor,
+)
+from custom_components.integration_fufopi.power_lane import PowerLaneCurrentSensor
+
+ENTITIES = [
+    ADXL345AccelXSensor,
+    ADXL345PowerSwitch,
+    HCM5883LMagXSensor,
+    HCM5883LContinuosModeSwitch,
+    partial(ACS712Sensor, sensor_no=0),
+    partial(ADS1115Sensor, channel_no=0),
+    partial(PowerLaneCurrentSensor, name="Power 1", relay_index=0, channel_no=3),
+    ADXL345VibrationRMSSensor,
+    ADXL345DominantFrequencySensor,
+    partial(ADXL345BandSensor, band=0),
+    CompassPitchSensor,
+    CompassHeadingSensor,
+    CompassCalibrationSwitch,
+    BatteryPerCentSensor,
+    BatteryChargeSensor,
+    BatteryTimeToEmptySensor,
+]
+
+
+@pytest.mark.parametrize("factory", ENTITIES)
+async def test_entity_added_before_first_refresh(hass, factory):
+    """Test the entity state is written as unavailable without a snapshot."""
+    coordinator = MagicMock(data=None, last_update_success=True)
+    entity = factory(coordinator, MagicMock(entry_id="entry"))
+
+    assert entity.available is False
+
+    entity.hass = hass
+    entity.entity_id = "sensor.fufopi_test"
+    entity.async_write_ha_state()
+
+    assert hass.states.get("sensor.fufopi_test").state == STATE_UNAVAILABLE
+
+
+def test_compass_calibration_needs_the_magnetometer_only():
+    """Test the calibration switch follows the HMC5883L, not the orientation."""
+    coordinator = MagicMock(last_update_success=True)
+    coordinator.data.orientation = None
+    switch = CompassCalibrationSwitch(coordinator, MagicMock(entry_id="entry"))
+
+    assert switch.available is True
+
+    coordinator.data.hmc5883 = None
+    assert switch.available is False
+
+    coordinator.last_update_success = False
+    coordinator.data.hmc5883 = MagicMock()
+    assert switch.available is False
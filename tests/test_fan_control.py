@@ -0,0 +1,117 @@
+"""Test the thermal fan control."""
+
+import asyncio
+import logging
+
+from custom_components.integration_fufopi.fan_control import FanController, FanCurve
+
+CURVE = ((40.0, 0.0), (50.0, 50.0), (60.0, 100.0))
+
+
+def test_fan_curve_interpolates():
+    """Test the duty cycle between and beyond the points."""
+    curve = FanCurve(CURVE)
+
+    assert curve.target(30.0) == 0.0
+    assert curve.target(45.0) == 25.0
+    assert curve.target(55.0) == 75.0
+    assert curve.target(70.0) == 100.0
+
+
+def test_fan_curve_hysteresis():
+    """Test the duty only goes down after the hysteresis."""
+    curve = FanCurve(CURVE, hysteresis=3.0)
+
+    assert curve.update(50.0) == 50.0
+    assert curve.update(52.0) == 60.0
+    assert curve.update(50.0) == 60.0
+    assert curve.update(48.0) == 40.0
+
+
+async def test_fan_controller_follows_hottest_source():
+    """Test the hottest readable source drives the fan."""
+    applied = []
+
+    async def _cpu():
+        return 45.0
+
+    async def _enclosure():
+        return 55.0
+
+    async def _missing():
+        return None
+
+    async def _set(duty_cycle):
+        applied.append(duty_cycle)
+
+    controller = FanController(
+        logging.getLogger(__name__), FanCurve(CURVE), [_cpu, _enclosure, _missing], _set
+    )
+    await controller.async_step()
+    await controller.async_step()
+
+    assert controller.temperature == 55.0
+    assert applied == [75.0]
+
+
+async def test_fan_controller_without_temperature():
+    """Test the fan runs at full speed without any temperature."""
+    applied = []
+
+    async def _missing():
+        return None
+
+    async def _set(duty_cycle):
+        applied.append(duty_cycle)
+
+    controller = FanController(
+        logging.getLogger(__name__), FanCurve(CURVE), [_missing], _set
+    )
+    await controller.async_step()
+
+    assert applied == [100.0]
+
+
+async def test_fan_controller_failure_runs_full_speed():
+    """Test any failure of a step falls back to full speed."""
+    applied = []
+
+    async def _broken():
+        raise ValueError("bad reading")
+
+    async def _set(duty_cycle):
+        applied.append(duty_cycle)
+
+    controller = FanController(
+        logging.getLogger(__name__), FanCurve(CURVE), [_broken], _set, interval=0.01
+    )
+    controller.start(asyncio.get_running_loop())
+    await asyncio.sleep(0.05)
+    await controller.async_stop()
+
+    assert applied == [100.0]
+
+
+async def test_fan_controller_stop_waits_for_write():
+    """Test a write in flight lands before stopping returns."""
+    applied = []
+    writing = asyncio.Event()
+
+    async def _cpu():
+        return 55.0
+
+    async def _set(duty_cycle):
+        writing.set()
+        await asyncio.sleep(0.02)
+        applied.append(duty_cycle)
+
+    controller = FanController(
+        logging.getLogger(__name__), FanCurve(CURVE), [_cpu], _set
+    )
+    controller.start(asyncio.get_running_loop())
+    await writing.wait()
+    await controller.async_stop()
+    applied.append(20.0)
+
+    assert not controller.running
+    assert applied == [75.0, 20.0]
@@ -0,0 +1,34 @@
+"""Test the I2C bus worker."""
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.integration_fufopi import i2c_bus
+from custom_components.integration_fufopi.i2c_bus import I2CBusWorker
+
+
+class _FakeSMBus:
+    """SMBus answering the register number, failing on register 0xFF."""
+
+    def __init__(self, bus_no):
+        self.bus_no = bus_no
+
+    def read_byte_data(self, address, register):
+        if register == 0xFF:
+            raise ValueError("bad register")
+        return register
+
+    def close(self):
+        pass
+
+
+async def test_bus_worker_survives_any_error():
+    """Test an error fails its transaction only and the bus keeps working."""
+    with patch.object(i2c_bus, "SMBus", _FakeSMBus):
+        bus = I2CBusWorker(1)
+
+        with pytest.raises(ValueError):
+            await bus.read_byte(0x48, 0xFF)
+        assert await bus.read_byte(0x48, 0x01) == 0x01
+
+        bus.close()
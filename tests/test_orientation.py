@@ -0,0 +1,87 @@
+"""Test the compass calibration and orientation."""
+import numpy as np
+import pytest
+
+from custom_components.integration_fufopi.orientation import (
+    MagCalibration,
+    fit_ellipsoid,
+    orientation,
+)
+
+# field of 0.45 Gauss pointing north and down, 60° of inclination
+FIELD = 0.45 * np.array([np.cos(np.radians(60)), 0.0, -np.sin(np.radians(60))])
+
+
+def rotation(yaw, pitch=0.0, roll=0.0):
+    """return the world to sensor rotation, x front, y left, z up"""
+    _yaw, _pitch, _roll = np.radians([yaw, pitch, roll])
+    _z = np.array(
+        [
+            [np.cos(_yaw), np.sin(_yaw), 0],
+            [-np.sin(_yaw), np.cos(_yaw), 0],
+            [0, 0, 1],
+        ]
+    )
+    _y = np.array(
+        [
+            [np.cos(_pitch), 0, np.sin(_pitch)],
+            [0, 1, 0],
+            [-np.sin(_pitch), 0, np.cos(_pitch)],
+        ]
+    )
+    _x = np.array(
+        [
+            [1, 0, 0],
+            [0, np.cos(_roll), np.sin(_roll)],
+            [0, -np.sin(_roll), np.cos(_roll)],
+        ]
+    )
+    return _x @ _y @ _z
+
+
+@pytest.mark.parametrize(
+    "heading,pitch,roll", [(0, 0, 0), (90, 0, 0), (225, 10, -5), (30, -20, 15)]
+)
+def test_orientation_tilt_compensated(heading, pitch, roll):
+    """Test the heading does not move with the tilt."""
+    # world x north, y west, z up: the heading turns clockwise
+    _rotation = rotation(-heading, pitch, roll)
+    _accel = _rotation @ np.array([0.0, 0.0, 9.81])
+    _mag = _rotation @ FIELD
+
+    result = orientation(_accel, _mag, MagCalibration())
+
+    assert result.heading == pytest.approx(heading, abs=1e-6)
+    assert result.pitch == pytest.approx(pitch, abs=1e-6)
+    assert result.roll == pytest.approx(roll, abs=1e-6)
+
+
+def test_orientation_without_magnetometer():
+    """Test pitch and roll are reported without a heading."""
+    result = orientation((0.0, 0.0, 9.81), None, MagCalibration())
+
+    assert result.heading is None
+    assert result.pitch == 0.0
+    assert result.roll == 0.0
+
+
+def test_fit_ellipsoid_removes_hard_and_soft_iron():
+    """Test a distorted sweep is mapped back to a sphere."""
+    _rng = np.random.default_rng(1)
+    _directions = _rng.normal(size=(400, 3))
+    _sphere = 0.45 * _directions / np.linalg.norm(_directions, axis=1)[:, None]
+    _distortion = np.array([[1.2, 0.1, 0.0], [0.1, 0.8, 0.05], [0.0, 0.05, 1.0]])
+    _offset = np.array([0.1, -0.05, 0.2])
+    _raw = _sphere @ _distortion.T + _offset
+
+    calibration = fit_ellipsoid(_raw)
+
+    assert calibration.hard_iron == pytest.approx(_offset, abs=1e-6)
+    _corrected = np.array([calibration.correct(_sample) for _sample in _raw])
+    _radius = np.linalg.norm(_corrected, axis=1)
+    assert _radius.std() < 1e-6
+
+
+def test_fit_ellipsoid_needs_enough_samples():
+    """Test a short sweep is rejected."""
+    assert fit_ellipsoid(np.ones((10, 3))) is None
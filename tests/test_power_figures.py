@@ -0,0 +1,70 @@
+"""Test the power figures derived once per refresh."""
+
+import pytest
+
+from custom_components.integration_fufopi.energy_meter import EnergyMeter
+from custom_components.integration_fufopi.power_figures import power_figures
+from custom_components.integration_fufopi.ve_direct import decode_block
+
+BLOCK = {"V": "12800", "I": "-2000", "IL": "3000", "VPV": "20000", "PPV": "40"}
+
+
+def test_power_figures_fridge_on():
+    """Test the figures with the fridge on the load output."""
+    figures = power_figures(decode_block(BLOCK), (False, True))
+
+    assert figures.battery_in_power == 0.0
+    assert figures.battery_out_power == pytest.approx(25.6)
+    assert figures.load_power == pytest.approx(38.4)
+    assert figures.rpi_current == 0.5
+    assert figures.rpi_power == pytest.approx(6.4)
+    assert figures.fridge_current == pytest.approx(2.5)
+    assert figures.fridge_power == pytest.approx(32.0)
+    assert figures.panel_current == pytest.approx(2.0)
+
+
+def test_power_figures_fridge_off():
+    """Test the load output only feeds the RPi with the fridge off."""
+    figures = power_figures(decode_block(BLOCK), (False, False))
+
+    assert figures.rpi_current == pytest.approx(3.0)
+    assert figures.rpi_power == pytest.approx(38.4)
+    assert figures.fridge_current == 0.0
+    assert figures.fridge_power == 0.0
+
+
+def test_power_figures_missing_fields():
+    """Test missing record fields give missing figures, not errors."""
+    figures = power_figures(decode_block({"VPV": "0", "PPV": "0"}), (False, True))
+
+    assert figures.battery_in_power is None
+    assert figures.load_power is None
+    assert figures.fridge_current is None
+    assert figures.panel_current == 0.0
+
+
+def test_power_figures_loads_add_up_to_load_output():
+    """Test the RPi and fridge energies add up to the load output, at night too."""
+    meter = EnergyMeter(("load", "rpi", "fridge"))
+    refreshes = [
+        ({**BLOCK, "VPV": "20000"}, (False, True)),
+        ({**BLOCK, "VPV": "0", "PPV": "0"}, (False, True)),
+        ({**BLOCK, "VPV": "0", "PPV": "0", "IL": "400"}, (False, False)),
+        ({**BLOCK, "VPV": "0", "PPV": "0"}, (False, True)),
+    ]
+
+    for timestamp, (block, relays) in enumerate(refreshes):
+        figures = power_figures(decode_block(block), relays)
+        meter.update(
+            timestamp * 10.0,
+            {
+                "load": figures.load_power,
+                "rpi": figures.rpi_power,
+                "fridge": figures.fridge_power,
+            },
+        )
+
+    assert meter.totals["fridge"] > 0
+    assert meter.totals["rpi"] + meter.totals["fridge"] == pytest.approx(
+        meter.totals["load"]
+    )
@@ -0,0 +1,17 @@
+"""Test the PWM outputs."""
+from unittest.mock import MagicMock, patch
+
+from custom_components.integration_fufopi import pwm
+from custom_components.integration_fufopi.pwm import RPiGPIOPWM, pwm_output
+
+
+def test_pwm_output_releases_unreachable_daemon():
+    """Test a pigpio handle without daemon is stopped before falling back."""
+    _pi = MagicMock(connected=False)
+
+    with patch.object(pwm.pigpio, "pi", return_value=_pi), patch.object(pwm, "GPIO"):
+        output = pwm_output(12, 25000, pwm.PWM_BACKEND_PIGPIO)
+
+    _pi.stop.assert_called_once_with()
+    assert isinstance(output, RPiGPIOPWM)
+    assert output.frequency == pwm.RPI_GPIO_MAX_FREQUENCY
@@ -0,0 +1,73 @@
+"""Test the I2C register cache."""
+import pytest
+
+from custom_components.integration_fufopi.register_cache import RegisterCache
+
+
+class FakeBus:
+    """Record the transactions of a device with 0x10 in every register."""
+
+    def __init__(self):
+        self.registers = {}
+        self.reads = 0
+        self.fail = False
+
+    async def read_byte(self, address, register):
+        self.reads += 1
+        if self.fail:
+            raise OSError(121, "Remote I/O error")
+        return self.registers.get(register, 0x10)
+
+    async def write_byte(self, address, register, value):
+        if self.fail:
+            raise OSError(121, "Remote I/O error")
+        self.registers[register] = value
+
+
+async def test_register_cache_serves_reads_from_memory():
+    """Test a register is read from the bus once."""
+    bus = FakeBus()
+    cache = RegisterCache(bus, 0x53)
+
+    assert await cache.async_read(0x31) == 0x10
+    assert await cache.async_read(0x31) == 0x10
+    assert bus.reads == 1
+
+
+async def test_register_cache_write_through():
+    """Test a write updates the device and the cache."""
+    bus = FakeBus()
+    cache = RegisterCache(bus, 0x53)
+
+    await cache.async_write(0x2D, 0x08)
+
+    assert bus.registers[0x2D] == 0x08
+    assert await cache.async_read(0x2D) == 0x08
+    assert bus.reads == 0
+
+
+async def test_register_cache_reverifies_old_values():
+    """Test values older than max_age are read again."""
+    bus = FakeBus()
+    cache = RegisterCache(bus, 0x53, max_age=0.0)
+
+    await cache.async_write(0x2D, 0x08)
+    bus.registers[0x2D] = 0x00
+
+    assert await cache.async_read(0x2D) == 0x00
+    assert bus.reads == 1
+
+
+async def test_register_cache_drops_failed_writes():
+    """Test a failed write leaves the register unknown."""
+    bus = FakeBus()
+    cache = RegisterCache(bus, 0x53)
+    await cache.async_write(0x2D, 0x08)
+
+    bus.fail = True
+    with pytest.raises(OSError):
+        await cache.async_write(0x2D, 0x00)
+
+    bus.fail = False
+    assert await cache.async_read(0x2D) == 0x08
+    assert bus.reads == 1
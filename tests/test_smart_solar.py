@@ -0,0 +1,47 @@
+"""Test the VE Direct chargers and their entities."""
+import logging
+
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.integration_fufopi import smart_solar_MPPT
+from custom_components.integration_fufopi.const import DOMAIN
+from custom_components.integration_fufopi.smart_solar_MPPT import (
+    async_migrate_legacy_ids,
+)
+from custom_components.integration_fufopi.ve_direct import decode_block
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def test_charger_id_falls_back_to_the_port():
+    """Test a device sending no SER# is identified by its port."""
+    charger = smart_solar_MPPT(logger=_LOGGER, port="/dev/ttyUSB7")
+    charger.record = decode_block({"SER#": "HQ1", "V": "12800"})
+    assert charger.charger_id == "HQ1"
+
+    charger.record = decode_block({"V": "12800"})
+    assert charger.charger_id == "/dev/ttyUSB7"
+
+
+async def test_legacy_ids_move_to_the_main_charger(hass):
+    """Test the single charger entities and device keep their history."""
+    config_entry = MockConfigEntry(domain=DOMAIN, entry_id="test")
+    config_entry.add_to_hass(hass)
+    entities = er.async_get(hass)
+    devices = dr.async_get(hass)
+    device = devices.async_get_or_create(
+        config_entry_id="test", identifiers={(DOMAIN, "testSmartSolar")}
+    )
+    voltage = entities.async_get_or_create(
+        "sensor", DOMAIN, "testSmartSolarV", config_entry=config_entry
+    )
+    totals = entities.async_get_or_create(
+        "sensor", DOMAIN, "testSmartSolarTotalsPPV", config_entry=config_entry
+    )
+
+    await async_migrate_legacy_ids(hass, config_entry, "HQ1")
+
+    assert entities.async_get(voltage.entity_id).unique_id == "testSmartSolarHQ1V"
+    assert entities.async_get(totals.entity_id).unique_id == "testSmartSolarTotalsPPV"
+    assert devices.async_get(device.id).identifiers == {(DOMAIN, "testSmartSolarHQ1")}
@@ -0,0 +1,53 @@
+"""Test coordinator snapshot change tracking."""
+
+from custom_components.integration_fufopi.adc_filter import ChannelStats
+from custom_components.integration_fufopi.snapshot import (
+    FufoPiSnapshot,
+    adc_key,
+    changed_keys,
+    charger_key,
+    relay_key,
+)
+from custom_components.integration_fufopi.ve_direct import decode_block
+
+ADC = (ChannelStats(1.0, 1.0, 0.0), ChannelStats(2.0, 2.0, 0.0))
+TOTALS = {"total_panel_power": 0, "total_yield_today": 0, "total_yield_total": 0}
+
+
+def _snapshot(chargers, adc, relays):
+    """Build a snapshot without previous data."""
+    return FufoPiSnapshot(
+        timestamp=0.0,
+        chargers=chargers,
+        adc=adc,
+        relays=relays,
+        adxl345=None,
+        hmc5883=None,
+        orientation=None,
+        battery=None,
+        power=None,
+        energy={},
+        changed_keys=None,
+        **TOTALS,
+    )
+
+
+def test_changed_keys_first_refresh():
+    """Test every key is considered changed without a previous snapshot."""
+    assert changed_keys(None, {}, (), (), TOTALS) is None
+
+
+def test_changed_keys_reports_only_changes():
+    """Test only the fields that differ are reported."""
+    record = decode_block({"SER#": "HQ1", "V": "12800", "I": "100"})
+    previous = _snapshot({"HQ1": record}, ADC, (False, True))
+
+    unchanged = changed_keys(previous, {"HQ1": record}, ADC, (False, True), TOTALS)
+
+    assert unchanged == frozenset()
+
+    new_record = decode_block({"SER#": "HQ1", "V": "12700", "I": "100"})
+    adc = (ADC[0], ChannelStats(2.5, 2.0, 0.0))
+    changed = changed_keys(previous, {"HQ1": new_record}, adc, (True, True), TOTALS)
+
+    assert changed == {charger_key("HQ1", "battery_voltage"), adc_key(1), relay_key(0)}
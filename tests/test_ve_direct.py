@@ -0,0 +1,183 @@
+"""Test VE Direct protocol parsing."""
+import asyncio
+import logging
+
+import pytest
+
+from custom_components.integration_fufopi.ve_direct import (
+    HEX_CMD_GET,
+    HEX_RSP_ASYNC,
+    HEX_RSP_ERROR,
+    HEX_RSP_GET,
+    REG_BATTERY_VOLTAGE,
+    REG_PANEL_POWER,
+    VEDirectHexClient,
+    VEDirectHexError,
+    VEDirectTextParser,
+    decode_block,
+    hex_frame,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _block(*fields):
+    """Build a text block with a valid checksum."""
+    _body = b"".join(b"\r\n" + key + b"\t" + value for key, value in fields)
+    _body += b"\r\nChecksum\t"
+    return _body + bytes([(-sum(_body)) % 256])
+
+
+def test_parser_returns_valid_block():
+    """Test a valid block split across chunks is returned once complete."""
+    parser = VEDirectTextParser()
+    block = _block((b"PID", b"0xA060"), (b"V", b"12800"))
+
+    assert parser.feed(block[:10]) == []
+    blocks = parser.feed(block[10:])
+
+    assert len(blocks) == 1
+    assert blocks[0]["PID"] == "0xA060"
+    assert blocks[0]["V"] == "12800"
+    assert parser.invalid_blocks == 0
+
+
+def test_parser_discards_corrupt_block():
+    """Test a block with a wrong checksum is dropped."""
+    parser = VEDirectTextParser()
+    block = bytearray(_block((b"V", b"12800")))
+    block[5] ^= 0x01
+
+    assert parser.feed(bytes(block)) == []
+    assert parser.invalid_blocks == 1
+
+    assert parser.feed(_block((b"V", b"12700")))[0]["V"] == "12700"
+
+
+def test_parser_skips_hex_frames():
+    """Test HEX frames between text blocks do not break the checksum."""
+    parser = VEDirectTextParser()
+    data = _block((b"V", b"12800")) + b":A0102000543\n" + _block((b"V", b"12700"))
+
+    blocks = parser.feed(data)
+
+    assert [block["V"] for block in blocks] == ["12800", "12700"]
+
+
+def test_hex_frame_checksum():
+    """Test HEX frames are encoded as in the protocol document example."""
+    assert hex_frame(HEX_CMD_GET, bytes([0xF0, 0xED, 0x00])) == b":7F0ED0071\n"
+
+
+def test_parser_passes_hex_frames():
+    """Test HEX frames are handed to the callback without delimiters."""
+    frames = []
+    parser = VEDirectTextParser(on_hex_frame=frames.append)
+
+    parser.feed(_block((b"V", b"12800")) + b":7F0ED0071\n")
+
+    assert frames == [b"7F0ED0071"]
+
+
+def test_decode_block():
+    """Test a block is decoded to native values and labels."""
+    record = decode_block(
+        {"PID": "0xA060", "CS": "3", "OR": "0x00000005", "V": "12800", "LOAD": "ON"}
+    )
+
+    assert record.product_id == "SmartSolar MPPT 100|20 48V"
+    assert record.state_of_operation == "Bulk"
+    assert record.off_reason_flags == (
+        "No input power",
+        "Switched off (device mode register)",
+    )
+    assert record.battery_voltage == 12800
+    assert record.load_state is True
+    assert record.panel_power is None
+
+
+def _hex_client(**kwargs):
+    """Build a HEX client fed by a text parser, with the frames it wrote."""
+    written = []
+    async_frames = []
+    client = VEDirectHexClient(
+        written.append,
+        _LOGGER,
+        on_async=lambda register, value: async_frames.append((register, value)),
+        **kwargs,
+    )
+    return (
+        client,
+        VEDirectTextParser(on_hex_frame=client.handle_frame),
+        written,
+        async_frames,
+    )
+
+
+def _get_response(command, register, value):
+    """Build the HEX frame answering a register request."""
+    return hex_frame(command, register.to_bytes(2, "little") + b"\x00" + value)
+
+
+async def test_hex_client_pipelined_requests():
+    """Test interleaved replies resolve the request of their register."""
+    client, parser, written, async_frames = _hex_client()
+    block = _block((b"V", b"12800"))
+
+    voltage = asyncio.ensure_future(client.async_get(REG_BATTERY_VOLTAGE))
+    power = asyncio.ensure_future(client.async_get(REG_PANEL_POWER))
+    await asyncio.sleep(0)
+
+    assert written == [
+        hex_frame(HEX_CMD_GET, REG_BATTERY_VOLTAGE.to_bytes(2, "little") + b"\x00"),
+        hex_frame(HEX_CMD_GET, REG_PANEL_POWER.to_bytes(2, "little") + b"\x00"),
+    ]
+
+    # the reply of the second request comes first, inside a text block and
+    # after an unsolicited async frame
+    blocks = parser.feed(
+        block[:6]
+        + _get_response(HEX_RSP_ASYNC, REG_BATTERY_VOLTAGE, b"\x00\x05")
+        + _get_response(HEX_RSP_GET, REG_PANEL_POWER, b"\x10\x27\x00\x00")
+        + block[6:]
+        + _get_response(HEX_RSP_GET, REG_BATTERY_VOLTAGE, b"\x00\x05")
+    )
+
+    assert await power == b"\x10\x27\x00\x00"
+    assert await voltage == b"\x00\x05"
+    assert async_frames == [(REG_BATTERY_VOLTAGE, b"\x00\x05")]
+    assert [_block["V"] for _block in blocks] == ["12800"]
+    assert not client._pending
+
+
+async def test_hex_client_error_fails_oldest_request():
+    """Test an error response is not taken for the reply of a register."""
+    client, parser, _, _ = _hex_client()
+
+    voltage = asyncio.ensure_future(client.async_get(REG_BATTERY_VOLTAGE))
+    power = asyncio.ensure_future(client.async_get(REG_PANEL_POWER))
+    await asyncio.sleep(0)
+
+    parser.feed(hex_frame(HEX_RSP_ERROR, b"\x00\x00"))
+    parser.feed(_get_response(HEX_RSP_GET, REG_PANEL_POWER, b"\x01\x00\x00\x00"))
+
+    with pytest.raises(VEDirectHexError):
+        await voltage
+    assert await power == b"\x01\x00\x00\x00"
+
+
+async def test_hex_client_timeout_clears_pending():
+    """Test a request without reply times out and a late reply is ignored."""
+    client, parser, _, _ = _hex_client(timeout=0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await client.async_get(REG_BATTERY_VOLTAGE)
+    assert not client._pending
+
+    parser.feed(_get_response(HEX_RSP_GET, REG_BATTERY_VOLTAGE, b"\x00\x05"))
+
+    voltage = asyncio.ensure_future(client.async_get(REG_BATTERY_VOLTAGE))
+    await asyncio.sleep(0)
+    parser.feed(_get_response(HEX_RSP_GET, REG_BATTERY_VOLTAGE, b"\x10\x05"))
+
+    assert await voltage == b"\x10\x05"
@@ -0,0 +1,62 @@
+"""Test ADXL345 vibration statistics."""
+
+import numpy as np
+import pytest
+
+from custom_components.integration_fufopi.ring_buffer import SampleRingBuffer
+from custom_components.integration_fufopi.vibration import (
+    vibration_spectrum,
+    vibration_stats,
+)
+
+
+def test_vibration_stats_removes_gravity():
+    """Test a still sensor reports no vibration whatever its tilt."""
+    stats = vibration_stats([0.5] * 8, [0.0] * 8, [9.8] * 8)
+
+    assert stats.rms == 0.0
+    assert stats.crest_factor == 0.0
+
+
+def test_vibration_stats_sine():
+    """Test a sine vibration has a crest factor of sqrt(2)."""
+    sine = np.sin(np.linspace(0, 8 * np.pi, 400, endpoint=False))
+
+    stats = vibration_stats(np.zeros(400), sine, 9.8 + np.zeros(400))
+
+    assert stats.rms == pytest.approx(np.sqrt(0.5))
+    assert stats.peak == pytest.approx(1.0)
+    assert stats.crest_factor == pytest.approx(np.sqrt(2))
+
+
+def test_ring_buffer_keeps_newest_samples():
+    """Test the oldest samples are overwritten first."""
+    buffer = SampleRingBuffer(3)
+    for value in range(5):
+        buffer.append(value)
+
+    assert list(buffer.values()) == [2.0, 3.0, 4.0]
+    assert buffer.latest == 4.0
+    assert buffer.mean() == 3.0
+
+
+def test_vibration_spectrum_dominant_frequency():
+    """Test a sine is found in its bin and band."""
+    t = np.arange(1024) / 400.0
+    x = 9.81 + 2.0 * np.sin(2 * np.pi * 50.0 * t)
+    y = np.zeros_like(t)
+    z = np.zeros_like(t)
+
+    spectrum = vibration_spectrum(x, y, z, 400.0, 256, ((0, 20), (20, 60), (60, 200)))
+
+    assert spectrum.dominant_frequency == pytest.approx(50.0, abs=400.0 / 256)
+    assert spectrum.band_rms[1] == pytest.approx(2.0 / np.sqrt(2), rel=0.05)
+    assert spectrum.band_rms[0] < 0.05
+    assert spectrum.band_rms[2] < 0.05
+
+
+def test_vibration_spectrum_needs_a_full_block():
+    """Test no spectrum is returned before a block is buffered."""
+    assert (
+        vibration_spectrum([0.0] * 10, [0.0] * 10, [0.0] * 10, 400.0, 256, ()) is None
+    )